@@ -56,4 +56,11 @@ class CheckResult(BaseModel):
 
 
 class CheckResponse(List[CheckResult]):
-    pass
\ No newline at end of file
+    pass
+
+
+# Model for /capabilities endpoint
+class GeneratorCapabilities(BaseModel):
+    """Optional features supported by a task generator"""
+    batch: bool = False
+    max_batch_size: int = 1
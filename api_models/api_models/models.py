@@ -29,6 +29,21 @@ class SubmissionStatus(StrEnum):
     WA = "wa"
 
 
+class RejudgeStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    PAUSED = "paused"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class AuditAction(StrEnum):
+    CLAIM = "claim"
+    SUBMIT = "submit"
+    COLLABORATIVE_SCORE = "collaborative_score"
+    REJUDGE = "rejudge"
+
+
 class AuthData(BaseModel):
     key: str
     role: UserRole
@@ -76,6 +91,7 @@ class Task(BaseModel):
     type: str
     status: TaskStatus = TaskStatus.PENDING
     score: int
+    statement_version: Optional[str] = None
     statement: Optional[str] = None
     input: Optional[str] = None
     claimed_at: Optional[datetime] = None
@@ -131,6 +147,7 @@ class RoundTaskType(BaseModel):
     generator_secret: str
     score: int = 100
     time_to_solve: int
+    cache_verdicts: bool = False
 
 
 class Round(BaseModel):
@@ -180,6 +197,7 @@ class RoundTaskTypeCreateRequest(BaseModel):
     max_tasks_per_team: Optional[int] = None
     score: Optional[int] = 100
     time_to_solve: int
+    cache_verdicts: bool = False
 
 
 class RoundTaskTypeUpdateRequest(BaseModel):
@@ -191,6 +209,7 @@ class RoundTaskTypeUpdateRequest(BaseModel):
     max_tasks_per_team: Optional[int] = None
     score: Optional[int] = 100
     time_to_solve: int
+    cache_verdicts: Optional[bool] = None
 
 
 class TypeStats(BaseModel):
@@ -208,3 +227,43 @@ class Dashboard(BaseModel):
 class Leaderboard(BaseModel):
     round_id: int
     teams: List[TeamScore]
+
+
+class RejudgeJob(BaseModel):
+    id: int
+    round_id: int
+    status: RejudgeStatus
+    total: int
+    processed: int
+    changed: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class RouteTiming(BaseModel):
+    route: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    db_queries_avg: float
+    db_p95_ms: float
+    gen_p95_ms: float
+
+
+class AuditLogEntry(BaseModel):
+    id: int
+    created_at: datetime
+    action: AuditAction
+    round_id: int
+    team_id: int
+    task_id: int
+    status: Optional[TaskStatus] = None
+    score: Optional[int] = None
+
+
+class AuditLogPage(BaseModel):
+    entries: List[AuditLogEntry]
+    # Pass as `cursor` to get the following entries, the log is append-only so it can be polled
+    next_cursor: int
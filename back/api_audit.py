@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+
+from api_models import AuditLogPage, AuthData
+from back.audit import AuditService
+from back.challenge_service import ChallengeService
+from back.api_deps import authenticate_admin, get_audit_service, get_challenge_service, get_round_or_404
+from back.profiling import ProfiledRoute
+
+router = APIRouter(prefix="", tags=["Admin: Audit log"], route_class=ProfiledRoute)
+
+
+@router.get("/round/{round_id}/logs")
+def get_round_logs(
+    round_id: int,
+    cursor: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    team_id: int | None = None,
+    auth_data: AuthData = Depends(authenticate_admin),
+    challenge_service: ChallengeService = Depends(get_challenge_service),
+    audit_service: AuditService = Depends(get_audit_service),
+) -> AuditLogPage:
+    """Audit log of the round: claims, submissions, collaborative scores and re-judge status changes."""
+    get_round_or_404(round_id, challenge_service, auth_data, "GET")
+    return audit_service.list_round_logs(round_id, cursor, limit, team_id)
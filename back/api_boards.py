@@ -9,7 +9,9 @@ from back.api_deps import (
     get_round_or_404,
     get_boards_service,
 )
-router = APIRouter(prefix="", tags=["Leaderboard & Dashboard"])
+from back.profiling import ProfiledRoute
+
+router = APIRouter(prefix="", tags=["Leaderboard & Dashboard"], route_class=ProfiledRoute)
 
 
 @router.get("/dashboard")
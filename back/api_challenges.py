@@ -1,16 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 
 from api_models import (
-    Challenge, Round, RoundStatus, RoundCreateRequest, RoundTaskType, RoundTaskTypeCreateRequest,
-    ChallengeUpdateRequest, ChallengeCreateRequest, AuthData, DeleteResponse, UserRole
+    Challenge, Round, RoundStatus, RoundCreateRequest, RoundUpdateRequest, RoundTaskType, RoundTaskTypeCreateRequest,
+    RoundTaskTypeUpdateRequest, ChallengeUpdateRequest, ChallengeCreateRequest, AuthData, DeleteResponse, UserRole
 )
 from back.challenge_service import ChallengeService
 from back.api_deps import (
     authenticate_player, authenticate_admin, get_challenge_service,
-    ensure_challenge_is_not_deleted, get_challenge_or_404, get_round_or_404
+    ensure_challenge_is_not_deleted, get_challenge_or_404, get_round_or_404, conditional_response
 )
+from back.profiling import ProfiledRoute
 
-router = APIRouter(prefix="", tags=["Challenges & Rounds"]) 
+router = APIRouter(prefix="", tags=["Challenges & Rounds"], route_class=ProfiledRoute)
 
 
 # Admin: challenges
@@ -62,13 +63,16 @@ def update_challenge(
 @router.put("/rounds/{round_id}")
 def update_round(
     round_id: int,
-    round_data: RoundCreateRequest,
+    round_data: RoundUpdateRequest,
     challenge_service: ChallengeService = Depends(get_challenge_service),
     auth_data: AuthData = Depends(authenticate_admin)
 ) -> Round:
     get_round_or_404(round_id, challenge_service, auth_data, "PUT")
 
-    updated_game_round = challenge_service.update_round(round_id, round_data)
+    try:
+        updated_game_round = challenge_service.update_round(round_id, round_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if updated_game_round is None:
         raise HTTPException(status_code=404, detail="Round not found")
 
@@ -95,7 +99,10 @@ def create_round(
 ) -> Round:
     get_challenge_or_404(round_data.challenge_id, challenge_service, auth_data, "POST")
 
-    game_round = challenge_service.create_round(round_data=round_data)
+    try:
+        game_round = challenge_service.create_round(round_data=round_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return Round.model_validate(game_round, from_attributes=True)
 
@@ -104,7 +111,7 @@ def create_round(
 @router.put("/task-types/{task_type_id}")
 def update_round_task_type(
     task_type_id: int,
-    task_type_data: RoundTaskTypeCreateRequest,
+    task_type_data: RoundTaskTypeUpdateRequest,
     challenge_service: ChallengeService = Depends(get_challenge_service),
     auth_data: AuthData = Depends(authenticate_admin)
 ) -> RoundTaskType:
@@ -188,12 +195,14 @@ def get_rounds(
     return [Round.model_validate(r, from_attributes=True) for r in rounds]
 
 
-@router.get("/rounds/{round_id}")
+@router.get("/rounds/{round_id}", response_model=Round)
 def get_round(
     round_id: int | str,
+    response: Response,
+    if_none_match: str | None = Header(None),
     challenge_service: ChallengeService = Depends(get_challenge_service),
     auth_data: AuthData = Depends(authenticate_player)
-) -> Round:
+) -> Round | Response:
     if isinstance(round_id, str) and round_id.lower() == "current":
         if auth_data.round_id is None:
             raise HTTPException(status_code=404, detail="Current round not found")
@@ -204,7 +213,7 @@ def get_round(
 
     r = get_round_or_404(round_id, challenge_service, auth_data, "GET")
     r.task_types = challenge_service.get_round_task_types_by_round(round_id)
-    return Round.model_validate(r, from_attributes=True)
+    return conditional_response(Round.model_validate(r, from_attributes=True), if_none_match, response)
 
 
 @router.get("/task-types")
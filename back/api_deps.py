@@ -1,5 +1,9 @@
-from fastapi import Depends, HTTPException
+import hashlib
+from typing import Callable, TypeVar
+
+from fastapi import Depends, HTTPException, Response
 from fastapi.security import APIKeyHeader
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from api_models import *
@@ -12,6 +16,10 @@ from back.db_models import Challenge as DbChallenge, Round as DbRound, RoundTask
 from back.task_service import TaskService
 from back.team_service import TeamService
 from back.boards_service import BoardsService
+from back.rejudge_service import RejudgeService
+from back.task_read_model import TaskReadModel
+from back.audit import AuditService
+from back.idempotency import IdempotencyService, IdempotencyKeyInProgress
 # Services providers
 
 
@@ -23,6 +31,10 @@ def get_task_service(db: Session = Depends(get_db_session)) -> TaskService:
     return TaskService(db)
 
 
+def get_task_read_model(db: Session = Depends(get_db_session)) -> TaskReadModel:
+    return TaskReadModel(db)
+
+
 def get_team_service(db: Session = Depends(get_db_session)) -> TeamService:
     return TeamService(db)
 
@@ -31,6 +43,18 @@ def get_boards_service(db: Session = Depends(get_db_session)) -> BoardsService:
     return BoardsService(db)
 
 
+def get_rejudge_service(db: Session = Depends(get_db_session)) -> RejudgeService:
+    return RejudgeService(db)
+
+
+def get_audit_service(db: Session = Depends(get_db_session)) -> AuditService:
+    return AuditService(db)
+
+
+def get_idempotency_service(db: Session = Depends(get_db_session)) -> IdempotencyService:
+    return IdempotencyService(db)
+
+
 def get_auth_service(db: Session = Depends(get_db_session)) -> AuthService:
     return AuthService(db)
 
@@ -139,3 +163,42 @@ def get_task_or_404(
         raise HTTPException(status_code=403, detail="Access to this task is forbidden")
 
     return task
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def run_idempotent(service: IdempotencyService, team_id: int, key: str | None, request_fingerprint: str,
+                   response: Response, model: type[M], handler: Callable[[], M]) -> M:
+    """Run the handler once per Idempotency-Key: a retry with the same key gets the stored response
+    with an `Idempotent-Replayed: true` header. Failed requests are not stored and can be retried."""
+    if key is None:
+        return handler()
+    try:
+        stored = service.start(team_id, key, request_fingerprint)
+    except IdempotencyKeyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if stored is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+        return model.model_validate_json(stored)
+
+    try:
+        result = handler()
+    except BaseException:
+        service.release(team_id, key)
+        raise
+    service.complete(team_id, key, request_fingerprint, result.model_dump_json())
+    return result
+
+
+def conditional_response(body: M, if_none_match: str | None, response: Response,
+                         exclude: set[str] | None = None) -> M | Response:
+    """Tag the body with an ETag and answer 304 Not Modified when the client already has it.
+    Fields in `exclude` don't change once created, so they don't take part in the tag."""
+    etag = '"' + hashlib.sha256(body.model_dump_json(exclude=exclude).encode()).hexdigest()[:32] + '"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return body
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from api_models import AuthData, RouteTiming
+from back.api_deps import authenticate_admin
+from back.instrumentation import route_metrics
+from back.profiling import ProfiledRoute
+
+router = APIRouter(prefix="", tags=["Admin: Metrics"], route_class=ProfiledRoute)
+
+
+@router.get("/metrics/routes")
+def get_route_metrics(
+    auth_data: AuthData = Depends(authenticate_admin),
+) -> list[RouteTiming]:
+    """Rolling request timings per route of this server process."""
+    return route_metrics.summary()
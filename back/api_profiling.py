@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse, Response
+
+from api_models import AuthData
+from back.api_deps import authenticate_admin
+from back.profiling import ProfiledRoute, profile_store, stack_sampler
+
+router = APIRouter(prefix="", tags=["Admin: Profiling"], route_class=ProfiledRoute)
+
+
+@router.get("/profiles/stacks", response_class=PlainTextResponse)
+def get_sampled_stacks(
+    reset: bool = False,
+    auth_data: AuthData = Depends(authenticate_admin),
+) -> str:
+    """Folded stacks from the background sampler, ready for flamegraph.pl or speedscope."""
+    if not stack_sampler.running:
+        raise HTTPException(status_code=400, detail="Stack sampler is off, set CHALLENGE_PROFILE_SAMPLE_INTERVAL_MS")
+    return stack_sampler.folded(reset)
+
+
+@router.get("/profiles/{profile_id}", response_model=None)
+def get_profile(
+    profile_id: str,
+    format: str = "text",
+    auth_data: AuthData = Depends(authenticate_admin),
+) -> Response:
+    """cProfile report of a request sent with `X-Profile: 1`, as text or as a `.pstats` file."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "pstats":
+        return Response(
+            profile.as_pstats(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    return PlainTextResponse(profile.as_text())
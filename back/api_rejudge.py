@@ -0,0 +1,60 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+
+from api_models import AuthData, RejudgeJob
+from back.challenge_service import ChallengeService
+from back.rejudge_service import RejudgeService, run_rejudge_job
+from back.api_deps import (
+    authenticate_admin,
+    get_challenge_service,
+    get_rejudge_service,
+    get_round_or_404,
+)
+from back.profiling import ProfiledRoute
+
+router = APIRouter(prefix="", tags=["Admin: Re-judge"], route_class=ProfiledRoute)
+
+
+@router.post("/rounds/{round_id}/rejudge")
+def start_rejudge(
+    round_id: int,
+    background_tasks: BackgroundTasks,
+    auth_data: AuthData = Depends(authenticate_admin),
+    challenge_service: ChallengeService = Depends(get_challenge_service),
+    rejudge_service: RejudgeService = Depends(get_rejudge_service),
+) -> RejudgeJob:
+    get_round_or_404(round_id, challenge_service, auth_data, "POST")
+    try:
+        job = rejudge_service.create_job(round_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    background_tasks.add_task(run_rejudge_job, job.id)
+    return RejudgeJob.model_validate(job, from_attributes=True)
+
+
+@router.get("/rejudge-jobs/{job_id}")
+def get_rejudge_job(
+    job_id: int,
+    auth_data: AuthData = Depends(authenticate_admin),
+    rejudge_service: RejudgeService = Depends(get_rejudge_service),
+) -> RejudgeJob:
+    job = rejudge_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Re-judge job not found")
+    return RejudgeJob.model_validate(job, from_attributes=True)
+
+
+@router.post("/rejudge-jobs/{job_id}/resume")
+def resume_rejudge_job(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    auth_data: AuthData = Depends(authenticate_admin),
+    rejudge_service: RejudgeService = Depends(get_rejudge_service),
+) -> RejudgeJob:
+    if rejudge_service.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Re-judge job not found")
+    try:
+        job = rejudge_service.resume_job(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    background_tasks.add_task(run_rejudge_job, job.id)
+    return RejudgeJob.model_validate(job, from_attributes=True)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from api_models import GenRequest, GenResponse, CheckRequest, CheckResult, CheckStatus
+from api_models import GenRequest, GenResponse, CheckRequest, CheckResult, CheckStatus, GeneratorCapabilities
 
 # Internal task generators for tests
 router = APIRouter(prefix="/task_gen", tags=["TaskGen"])  # hidden from OpenAPI via include_in_schema in main
@@ -31,3 +31,18 @@ def a_plus_b_check(req: CheckRequest) -> list[CheckResult]:
         return [CheckResult(status=CheckStatus.ACCEPTED, score=1.0)]
     else:
         return [CheckResult(status=CheckStatus.WRONG_ANSWER, error="Wrong answer", score=0.0)]
+
+
+@router.get("/a_plus_b/capabilities")
+def a_plus_b_capabilities() -> GeneratorCapabilities:
+    return GeneratorCapabilities(batch=True, max_batch_size=100)
+
+
+@router.post("/a_plus_b/gen/batch")
+def a_plus_b_gen_batch(reqs: list[GenRequest]) -> list[GenResponse]:
+    return [a_plus_b_gen(req) for req in reqs]
+
+
+@router.post("/a_plus_b/check/batch")
+def a_plus_b_check_batch(reqs: list[CheckRequest]) -> list[list[CheckResult]]:
+    return [a_plus_b_check(req) for req in reqs]
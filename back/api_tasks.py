@@ -2,63 +2,100 @@ from typing import Sequence
 
 from datetime import datetime
 from api_models import TaskStatus
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
 from api_models import Task, SubmitAnswerRequest, Submission, AuthData
-from back.api_deps import authenticate_player, get_task_service, get_challenge_service, get_round_or_404, get_task_or_404
+from back.api_deps import authenticate_player, get_task_service, get_challenge_service, get_round_or_404, get_task_or_404, \
+    get_task_read_model, get_idempotency_service, run_idempotent, conditional_response
+from back.idempotency import IdempotencyService, fingerprint
 from back.task_service import TaskService
 from back.challenge_service import ChallengeService
+from back.task_read_model import TaskReadModel
 from back.db_models import Task as DbTask
+from back.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/tasks", tags=["Tasks"]) 
+router = APIRouter(prefix="/tasks", tags=["Tasks"], route_class=ProfiledRoute)
 
+# Set when the task is claimed and never changed
+TASK_PAYLOAD_FIELDS = {"statement", "input"}
+MAX_PAGE_SIZE = 500
 
-@router.get("/{task_id}")
+
+@router.get("/{task_id}", response_model=Task)
 def get_task(
     task_id: int,
+    response: Response,
+    payload: bool = True,
+    if_none_match: str | None = Header(None),
     auth_data: AuthData = Depends(authenticate_player),
-    task_service: TaskService = Depends(get_task_service)
-) -> Task:
-    return Task.model_validate(get_task_or_404(task_id, task_service, auth_data), from_attributes=True)
+    task_service: TaskService = Depends(get_task_service),
+    task_read_model: TaskReadModel = Depends(get_task_read_model)
+) -> Task | Response:
+    """`payload=false` leaves out the statement and input, which clients keep once fetched;
+    the ETag covers the rest, so an unchanged task is revalidated with 304."""
+    get_task_or_404(task_id, task_service, auth_data)
+    task = task_read_model.get_task(task_id, include_payload=payload)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return conditional_response(task, if_none_match, response, exclude=TASK_PAYLOAD_FIELDS)
 
 
 @router.post("/{task_id}/submission")
 def submit_task_answer(
     task_id: int,
     answer_data: SubmitAnswerRequest,
+    response: Response,
+    idempotency_key: str | None = Header(None),
     auth_data: AuthData = Depends(authenticate_player),
-    task_service: TaskService = Depends(get_task_service)
+    task_service: TaskService = Depends(get_task_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ) -> Submission:
     answer = answer_data.answer
-    try:
-        if auth_data.team_id is None:
-            raise HTTPException(status_code=400, detail="Team not found")
-        submission = task_service.submit_task_answer(task_id, auth_data.team_id, answer)
-        return Submission.model_validate(submission, from_attributes=True)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    if auth_data.team_id is None:
+        raise HTTPException(status_code=400, detail="Team not found")
+    team_id = auth_data.team_id
+
+    def submit() -> Submission:
+        try:
+            submission = task_service.submit_task_answer(task_id, team_id, answer)
+            return Submission.model_validate(submission, from_attributes=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(idempotency_service, team_id, idempotency_key,
+                          fingerprint("POST", f"/tasks/{task_id}/submission", answer), response, Submission, submit)
 
 
 @router.post("")
 def create_task(
+    response: Response,
     task_type: str | None = None,
+    idempotency_key: str | None = Header(None),
     auth_data: AuthData = Depends(authenticate_player),
     task_service: TaskService = Depends(get_task_service),
-    challenge_service: ChallengeService = Depends(get_challenge_service)
+    challenge_service: ChallengeService = Depends(get_challenge_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ) -> Task:
     if auth_data.round_id is None:
         raise HTTPException(status_code=400, detail="No current round available")
+    if auth_data.challenge_id is None or auth_data.team_id is None:
+        raise HTTPException(status_code=400, detail="Invalid team or challenge context")
     game_round = get_round_or_404(auth_data.round_id, challenge_service, auth_data)
-    try:
-        if auth_data.challenge_id is None or auth_data.team_id is None:
-            raise HTTPException(status_code=400, detail="Invalid team or challenge context")
-        if task_type is None:
-            task_type = task_service.get_random_task_type(game_round, auth_data.team_id).type
-        elif not game_round.claim_by_type:
-            raise HTTPException(status_code=400, detail="Round does not allow task creation by type")
-        return Task.model_validate(task_service.create_task(auth_data.challenge_id, auth_data.team_id, task_type), from_attributes=True)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    challenge_id, team_id = auth_data.challenge_id, auth_data.team_id
+
+    def claim() -> Task:
+        try:
+            claimed_type = task_type
+            if claimed_type is None:
+                claimed_type = task_service.get_random_task_type(game_round, team_id).type
+            elif not game_round.claim_by_type:
+                raise HTTPException(status_code=400, detail="Round does not allow task creation by type")
+            return Task.model_validate(task_service.create_task(challenge_id, team_id, claimed_type), from_attributes=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return run_idempotent(idempotency_service, team_id, idempotency_key,
+                          fingerprint("POST", "/tasks", task_type or ""), response, Task, claim)
 
 
 @router.get("")
@@ -67,17 +104,23 @@ def list_tasks(
     task_type: str | None = None,
     round_id: int | None = None,
     since: datetime | None = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    before_id: int | None = None,
+    payload: bool = True,
     auth_data: AuthData = Depends(authenticate_player),
-    task_service: TaskService = Depends(get_task_service)
+    task_read_model: TaskReadModel = Depends(get_task_read_model)
 ) -> list[Task]:
+    """Newest tasks first, `limit` at a time: the next page starts `before_id` the last task of the previous one."""
     if auth_data.team_id is None:
         raise HTTPException(status_code=400, detail="Team not found")
 
-    tasks = task_service.list_tasks_for_team(
+    return task_read_model.list_tasks_for_team(
         auth_data.team_id,
         status=status,
         task_type=task_type,
         round_id=round_id,
-        since=since
+        since=since,
+        limit=limit,
+        before_id=before_id,
+        include_payload=payload
     )
-    return [Task.model_validate(t, from_attributes=True) for t in tasks]
@@ -7,8 +7,9 @@ from back.api_deps import authenticate_player, authenticate_admin, get_team_serv
 from back.team_service import TeamService
 from back.challenge_service import ChallengeService
 from back.db_models import Team as DbTeam
+from back.profiling import ProfiledRoute
 
-router = APIRouter(prefix="", tags=["Team"]) 
+router = APIRouter(prefix="", tags=["Team"], route_class=ProfiledRoute)
 
 
 # Player: auth & team
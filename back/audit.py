@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api_models import AuditAction, AuditLogEntry, AuditLogPage, TaskStatus
+from back.db_models import AuditLog
+
+
+def record_audit(db: Session, action: AuditAction, round_id: int, team_id: int, task_id: int,
+                 status: TaskStatus | None = None, score: int | None = None) -> None:
+    """Add an audit entry to the caller's transaction, so that it is committed together with the change it
+    records. Nothing is left in process memory when a Lambda instance is frozen or recycled."""
+    db.add(AuditLog(
+        created_at=datetime.now(timezone.utc),
+        action=action,
+        round_id=round_id,
+        team_id=team_id,
+        task_id=task_id,
+        status=status,
+        score=score,
+    ))
+
+
+class AuditService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_round_logs(self, round_id: int, cursor: int = 0, limit: int = 100,
+                        team_id: int | None = None) -> AuditLogPage:
+        """Entries of the round in the order they were written, starting after the `cursor` entry id."""
+        condition = (AuditLog.round_id == round_id) & (AuditLog.id > cursor)
+        if team_id is not None:
+            condition &= AuditLog.team_id == team_id
+        stmt = select(AuditLog).where(condition).order_by(AuditLog.id).limit(limit)
+        entries = [AuditLogEntry.model_validate(row, from_attributes=True) for row in self.db.execute(stmt).scalars()]
+        return AuditLogPage(
+            entries=entries,
+            next_cursor=entries[-1].id if entries else cursor,
+        )
@@ -0,0 +1,234 @@
+import json
+import os
+import statistics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterator
+
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api_models import CheckResponse, CheckResult, CheckStatus, GenRequest, GenResponse, RoundStatus, \
+    SubmissionStatus, TaskStatus
+from back.api_deps import get_task_service
+from back.database import get_db_session
+from back.db_models import AdminKeys, Base, Challenge, Dashboard, Round, RoundTaskType, Submission, Task, \
+    TaskPayload, TaskStatement, Team
+from back.main import app
+from back.task_service import TaskGenClient, TaskService
+
+pytest.importorskip("pytest_benchmark")
+
+# Timings and the baseline depend on the machine, so the suite runs only on request, not in the regular test run
+ENABLED = os.getenv("CHALLENGE_BENCH", "") == "1"
+
+# Scale from docs/3-Backend.md: 6 task types x 1000 tasks x 20 teams x 2 answers, override via env for quick runs
+TEAMS = int(os.getenv("CHALLENGE_BENCH_TEAMS", "20"))
+TASK_TYPES = int(os.getenv("CHALLENGE_BENCH_TASK_TYPES", "6"))
+TASKS_PER_TYPE = int(os.getenv("CHALLENGE_BENCH_TASKS_PER_TYPE", "1000"))
+ANSWERS_PER_TASK = int(os.getenv("CHALLENGE_BENCH_ANSWERS_PER_TASK", "2"))
+ROUNDS = int(os.getenv("CHALLENGE_BENCH_ROUNDS", "200"))
+# A benchmark fails if its p95 is slower than the baseline p95 times this factor
+TOLERANCE = float(os.getenv("CHALLENGE_BENCH_TOLERANCE", "1.5"))
+UPDATE_BASELINE = os.getenv("CHALLENGE_BENCH_UPDATE_BASELINE", "") == "1"
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# Latency target from docs/3-Backend.md
+P95_LIMIT_MS = 1000.0
+
+ADMIN_KEY = "bench-admin"
+STUB_ANSWER = "3"
+
+
+def team_key(index: int) -> str:
+    return f"bench-team-{index}"
+
+
+class StubTaskGenClient(TaskGenClient):
+    """In-process generator, so that benchmarks measure the backend only."""
+
+    def generate_task(self, generator_url: str, generator_secret: str, gen_request: GenRequest) -> GenResponse:
+        return GenResponse(statement_version="v1", statement="Output a + b.", input="1 2", checker_hint=STUB_ANSWER)
+
+    def check_answer(self, generator_url: str, answer: str, checker_hint: str, input_text: str,
+                     task_id: str | None = None) -> CheckResponse:
+        if answer.strip() == checker_hint:
+            return CheckResponse([CheckResult(status=CheckStatus.ACCEPTED, score=1.0)])
+        return CheckResponse([CheckResult(status=CheckStatus.WRONG_ANSWER, error="Wrong answer")])
+
+
+def seed(engine: Engine) -> None:
+    """Fill the database with one published round at the configured scale, using bulk inserts."""
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        db.add(AdminKeys(api_key=ADMIN_KEY, owner="Benchmark"))
+        challenge = Challenge(title="Benchmark", description="Benchmark challenge")
+        db.add(challenge)
+        db.flush()
+        game_round = Round(
+            challenge_id=challenge.id,
+            index=1,
+            status=RoundStatus.PUBLISHED,
+            start_time=now - timedelta(hours=1),
+            end_time=now + timedelta(hours=2000),
+            claim_by_type=True,
+            allow_resubmit=True,
+            score_decay="no"
+        )
+        db.add(game_round)
+        db.flush()
+        challenge.current_round_id = game_round.id
+        db.commit()
+        round_id, challenge_id = game_round.id, challenge.id
+
+    types = [
+        {"id": t + 1, "type": f"type{t + 1}", "round_id": round_id, "generator_url": f"http://stub/type{t + 1}",
+         "generator_secret": "", "generator_settings": "", "score": 100, "time_to_solve": 100_000,
+         "max_tasks_per_team": TASKS_PER_TYPE + 100_000}
+        for t in range(TASK_TYPES)
+    ]
+    teams = [
+        {"id": i + 1, "api_key": team_key(i + 1), "name": f"Team {i + 1}", "members": "", "captain_contact": "",
+         "challenge_id": challenge_id, "total_score": 0}
+        for i in range(TEAMS)
+    ]
+    statements = [
+        {"round_task_type_id": t["id"], "statement_version": "v1", "statement": "Output a + b."} for t in types
+    ]
+
+    tasks: list[dict[str, Any]] = []
+    payloads: list[dict[str, Any]] = []
+    submissions: list[dict[str, Any]] = []
+    dashboard: list[dict[str, Any]] = []
+    statuses = [TaskStatus.PENDING, TaskStatus.AC, TaskStatus.WA]
+    for team in teams:
+        for task_type in types:
+            counters = {status: 0 for status in statuses}
+            for n in range(TASKS_PER_TYPE):
+                task_id = len(tasks) + 1
+                status = statuses[n % len(statuses)]
+                counters[status] += 1
+                tasks.append({
+                    "id": task_id, "title": f"{task_type['type']} Task", "status": status,
+                    "statement_version": "v1", "score": 100, "claimed_at": now, "challenge_id": challenge_id,
+                    "team_id": team["id"], "round_id": round_id, "round_task_type_id": task_type["id"]
+                })
+                payloads.append({"task_id": task_id, "input": "1 2", "checker_hint": STUB_ANSWER})
+                if status == TaskStatus.PENDING:
+                    continue
+                for a in range(ANSWERS_PER_TASK):
+                    accepted = status == TaskStatus.AC and a == ANSWERS_PER_TASK - 1
+                    submissions.append({
+                        "task_id": task_id, "submitted_at": now, "answer": STUB_ANSWER if accepted else "0",
+                        "status": SubmissionStatus.AC if accepted else SubmissionStatus.WA,
+                        "score": 100 if accepted else None
+                    })
+            dashboard.append({
+                "round_id": round_id, "team_id": team["id"], "round_task_type_id": task_type["id"],
+                "type": task_type["type"], "pending": counters[TaskStatus.PENDING], "ac": counters[TaskStatus.AC],
+                "wa": counters[TaskStatus.WA], "remaining": 100_000
+            })
+
+    with engine.begin() as conn:
+        for model, rows in [(RoundTaskType, types), (Team, teams), (TaskStatement, statements), (Task, tasks),
+                            (TaskPayload, payloads), (Submission, submissions), (Dashboard, dashboard)]:
+            if rows:
+                conn.execute(insert(model), rows)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if ENABLED:
+        return
+    skip = pytest.mark.skip(reason="Benchmarks run with CHALLENGE_BENCH=1")
+    for item in items:
+        if Path(str(item.fspath)).parent == Path(__file__).parent:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def bench_engine() -> Iterator[Engine]:
+    """Seeded SQLite in memory, or a local Postgres if CHALLENGE_BENCH_DATABASE_URL is set."""
+    database_url = os.getenv("CHALLENGE_BENCH_DATABASE_URL")
+    if database_url:
+        engine = create_engine(database_url)
+    else:
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    seed(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client(bench_engine: Engine) -> Iterator[TestClient]:
+    session_factory = sessionmaker(bind=bench_engine, autoflush=False, autocommit=False)
+
+    def get_bench_db_session() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get_bench_task_service(db: Session = Depends(get_db_session)) -> TaskService:
+        task_service = TaskService(db)
+        task_service.task_gen_client = StubTaskGenClient()
+        return task_service
+
+    app.dependency_overrides[get_db_session] = get_bench_db_session
+    app.dependency_overrides[get_task_service] = get_bench_task_service
+    # The app-wide SlowAPI limit would throttle the benchmark client
+    limiter = getattr(app.state, "limiter", None)
+    limiter_enabled = limiter.enabled if limiter is not None else False
+    if limiter is not None:
+        limiter.enabled = False
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        if limiter is not None:
+            limiter.enabled = limiter_enabled
+        app.dependency_overrides.clear()
+
+
+def percentiles(data: list[float]) -> dict[str, float]:
+    """p50/p95/p99 in milliseconds from raw round times in seconds."""
+    cuts = statistics.quantiles(data, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+@pytest.fixture(scope="session")
+def baseline() -> Iterator[dict[str, dict[str, float]]]:
+    data: dict[str, dict[str, float]] = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    yield data
+    if UPDATE_BASELINE:
+        BASELINE_PATH.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture()
+def measure(benchmark: Any, baseline: dict[str, dict[str, float]]) -> Callable[[str, Callable[[], Any]], None]:
+    """Run `func` for ROUNDS rounds, then check its percentiles against the latency target and the baseline."""
+
+    def run(name: str, func: Callable[[], Any]) -> None:
+        benchmark.pedantic(func, rounds=ROUNDS, iterations=1, warmup_rounds=5)
+        result = percentiles(list(benchmark.stats.stats.data))
+        benchmark.extra_info.update(result)
+
+        assert result["p95"] < P95_LIMIT_MS, f"{name}: p95 {result['p95']:.1f} ms exceeds {P95_LIMIT_MS} ms"
+        if UPDATE_BASELINE:
+            baseline[name] = {k: round(v, 3) for k, v in result.items()}
+        elif name in baseline:
+            allowed = baseline[name]["p95"] * TOLERANCE
+            assert result["p95"] <= allowed, \
+                f"{name}: p95 regressed to {result['p95']:.2f} ms (baseline {baseline[name]['p95']:.2f} ms)"
+
+    return run
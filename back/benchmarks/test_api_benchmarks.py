@@ -0,0 +1,65 @@
+from itertools import count
+from typing import Any, Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from back.benchmarks.conftest import ADMIN_KEY, STUB_ANSWER, TASK_TYPES, TASKS_PER_TYPE, TEAMS, team_key
+
+Measure = Callable[[str, Callable[[], Any]], None]
+
+
+def get_ok(client: TestClient, url: str, api_key: str) -> None:
+    response = client.get(url, headers={"X-API-Key": api_key})
+    assert response.status_code == 200, response.text
+
+
+def test_auth(client: TestClient, measure: Measure) -> None:
+    measure("auth", lambda: get_ok(client, "/auth", team_key(1)))
+
+
+def test_auth_admin(client: TestClient, measure: Measure) -> None:
+    measure("auth_admin", lambda: get_ok(client, "/auth", ADMIN_KEY))
+
+
+def test_claim(client: TestClient, measure: Measure) -> None:
+    teams = count()
+
+    def claim() -> None:
+        # Round-robin over the seeded teams; an error response fails the benchmark instead of being timed
+        response = client.post("/tasks", headers={"X-API-Key": team_key(next(teams) % TEAMS + 1)})
+        assert response.status_code == 200, response.text
+
+    measure("claim", claim)
+
+
+def test_submit(client: TestClient, measure: Measure) -> None:
+    # Seeded tasks of team 1 come first and every third one is pending
+    pending_task_ids = iter(range(1, TASK_TYPES * TASKS_PER_TYPE + 1, 3))
+
+    def submit() -> None:
+        response = client.post(
+            f"/tasks/{next(pending_task_ids)}/submission",
+            headers={"X-API-Key": team_key(1)},
+            json={"answer": STUB_ANSWER}
+        )
+        assert response.status_code == 200, response.text
+
+    measure("submit", submit)
+
+
+def test_dashboard(client: TestClient, measure: Measure) -> None:
+    measure("dashboard", lambda: get_ok(client, "/dashboard", team_key(2)))
+
+
+@pytest.mark.skip(reason="GET /leaderboard is not yet implemented")
+def test_leaderboard(client: TestClient, measure: Measure) -> None:
+    measure("leaderboard", lambda: get_ok(client, "/leaderboard", team_key(2)))
+
+
+def test_task_list(client: TestClient, measure: Measure) -> None:
+    measure("task_list", lambda: get_ok(client, "/tasks", team_key(3)))
+
+
+def test_task_list_filtered(client: TestClient, measure: Measure) -> None:
+    measure("task_list_filtered", lambda: get_ok(client, "/tasks?status=wa&task_type=type2", team_key(3)))
@@ -1,6 +1,6 @@
 from typing import Dict
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from api_models import Dashboard as ApiDashboard, TypeStats as ApiTypeStats, TaskStatus as ApiTaskStatus
@@ -64,6 +64,23 @@ class BoardsService:
                 row.ac += 1
         # WA->WA or AC->AC (and AC sticky preventing AC->WA) => no changes
 
+    def shift_counters(self, round_id: int, team_id: int, round_task_type_id: int,
+                       pending: int = 0, ac: int = 0, wa: int = 0) -> None:
+        # Adjust counters with a single UPDATE, without loading the row (used by bulk re-judging)
+        self.db.execute(
+            update(Dashboard)
+            .where(
+                (Dashboard.round_id == round_id)
+                & (Dashboard.team_id == team_id)
+                & (Dashboard.round_task_type_id == round_task_type_id)
+            )
+            .values(
+                pending=Dashboard.pending + pending,
+                ac=Dashboard.ac + ac,
+                wa=Dashboard.wa + wa,
+            )
+        )
+
     def get_dashboard(self, team_id: int, round_id: int) -> ApiDashboard:
         # Load dashboard stats for the team in the round
         dashboard_rows = list(
@@ -5,8 +5,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from api_models import ChallengeUpdateRequest
-from api_models import RoundCreateRequest, RoundTaskTypeCreateRequest
+from api_models import RoundCreateRequest, RoundUpdateRequest, RoundTaskTypeCreateRequest, RoundTaskTypeUpdateRequest
 from back.db_models import Challenge, Round, RoundTaskType
+from back.scoring import ensure_decay_policy
 
 
 class ChallengeService:
@@ -56,6 +57,7 @@ class ChallengeService:
 
     # Rounds
     def create_round(self, round_data: RoundCreateRequest) -> Round:
+        ensure_decay_policy(round_data.score_decay)
         game_round = Round(
             challenge_id=round_data.challenge_id,
             index=round_data.index,
@@ -82,13 +84,17 @@ class ChallengeService:
         stmt = select(Round).where(Round.id == round_id)
         return self.db.execute(stmt).scalar_one_or_none()
 
-    def update_round(self, round_id: int, round_data: RoundCreateRequest) -> Round | None:
+    def update_round(self, round_id: int, round_data: RoundUpdateRequest) -> Round | None:
+        if round_data.score_decay is not None:
+            ensure_decay_policy(round_data.score_decay)
         stmt = select(Round).where(Round.id == round_id)
         game_round = self.db.execute(stmt).scalar_one_or_none()
 
         if game_round is None:
             return None
 
+        if round_data.index is not None:
+            game_round.index = round_data.index
         if round_data.start_time is not None:
             game_round.start_time = round_data.start_time
         if round_data.end_time is not None:
@@ -121,7 +127,8 @@ class ChallengeService:
             generator_settings=task_type_data.generator_settings,
             generator_secret=task_type_data.generator_secret,
             max_tasks_per_team=task_type_data.max_tasks_per_team,
-            time_to_solve=task_type_data.time_to_solve
+            time_to_solve=task_type_data.time_to_solve,
+            cache_verdicts=task_type_data.cache_verdicts
         )
 
         self.db.add(round_task_type)
@@ -138,7 +145,8 @@ class ChallengeService:
         stmt = select(RoundTaskType).where(RoundTaskType.round_id == round_id)
         return self.db.execute(stmt).scalars().all()
 
-    def update_round_task_type(self, task_type_id: int, task_type_data: RoundTaskTypeCreateRequest) -> RoundTaskType | None:
+    def update_round_task_type(self, task_type_id: int,
+                               task_type_data: RoundTaskTypeUpdateRequest) -> RoundTaskType | None:
         stmt = select(RoundTaskType).where(RoundTaskType.id == task_type_id)
         round_task_type = self.db.execute(stmt).scalar_one_or_none()
 
@@ -157,6 +165,8 @@ class ChallengeService:
             round_task_type.max_tasks_per_team = task_type_data.max_tasks_per_team
         if task_type_data.time_to_solve is not None:
             round_task_type.time_to_solve = task_type_data.time_to_solve
+        if task_type_data.cache_verdicts is not None:
+            round_task_type.cache_verdicts = task_type_data.cache_verdicts
 
         self.db.commit()
         self.db.refresh(round_task_type)
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+import argparse
 import json
 import boto3
 import os
@@ -7,7 +8,7 @@ from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 from typing import Generator
 from sqlalchemy.engine import Engine
-from back.db_models import Base, AdminKeys, Team, Challenge, Task, Round, RoundTaskType
+from back.db_models import Base, AdminKeys, Team, Challenge, Task, Round, RoundTaskType, TaskStatement
 from api_models import RoundStatus, TaskStatus
 from datetime import datetime, timedelta, timezone
 
@@ -41,10 +42,19 @@ def get_db_engine() -> Engine:
     Returns a database engine.
     - Uses in-memory SQLite
     - Falls back to PostgreSQL (AWS Secrets Manager) if in prod environment.
+    - Uses CHALLENGE_DATABASE_URL if set, e.g. a local Postgres or an SQLite file for load testing
+      (in-memory SQLite shares one connection between all requests, so it breaks under concurrent load).
+      The database is used as is, fill it once with `python -m back.database`.
     Control via env:
       STAGE=prod
+      CHALLENGE_DATABASE_URL=sqlite:///load.db
     """
     stage = (os.environ.get("STAGE") or "").lower()
+    database_url = os.environ.get("CHALLENGE_DATABASE_URL")
+
+    if stage != "prod" and database_url:
+        print("Using database from CHALLENGE_DATABASE_URL")
+        return create_engine(database_url)
 
     use_sqlite = stage != "prod"
 
@@ -194,8 +204,7 @@ def create_test_data(engine: Engine | None = None) -> None:
             input="1 2",
             statement_version="1.0",
             claimed_at=now,
-            score=100,
-            statement="Given two integers a and b, find their sum a + b."
+            score=100
         )
         task1 = Task(
             title="PENDING Task",
@@ -207,8 +216,7 @@ def create_test_data(engine: Engine | None = None) -> None:
             input="This is some strange task input",
             statement_version="1.0",
             claimed_at=now - timedelta(minutes=5),
-            score=0,
-            statement="You can't solve this task. It has no generator"
+            score=0
         )
         task2 = Task(
             title="AC Task",
@@ -220,8 +228,7 @@ def create_test_data(engine: Engine | None = None) -> None:
             input="This is some strange task input",
             statement_version="1.0",
             claimed_at=now - timedelta(minutes=10),
-            score=200,
-            statement="You can't solve this task. It has no generator"
+            score=200
         )
         task3 = Task(
             title="WA Task",
@@ -233,9 +240,19 @@ def create_test_data(engine: Engine | None = None) -> None:
             input="This is some strange task input",
             statement_version="1.0",
             claimed_at=now - timedelta(minutes=20),
-            score=0,
+            score=0
+        )
+        statement1 = TaskStatement(
+            round_task_type_id=round_task_type1.id,
+            statement_version="1.0",
+            statement="Given two integers a and b, find their sum a + b."
+        )
+        statement2 = TaskStatement(
+            round_task_type_id=round_task_type2.id,
+            statement_version="1.0",
             statement="You can't solve this task. It has no generator"
         )
+        session.add_all([statement1, statement2])
         session.add_all([task0, task1, task2, task3])
 
         challenge1.current_round_id = round1.id
@@ -245,7 +262,8 @@ def create_test_data(engine: Engine | None = None) -> None:
         print("Test data created successfully!")
 
 
-SessionLocal = sessionmaker(bind=get_db_engine(), autoflush=False, autocommit=False)
+engine = get_db_engine()
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
 def get_db_session() -> Generator[Session, None, None]:
@@ -254,3 +272,32 @@ def get_db_session() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def setup_test_database(database_url: str, reset: bool = False) -> None:
+    """Create the tables of a database for load testing and fill them with the test data.
+    Refuses a database that already has data, unless `reset` drops all tables first."""
+    engine = create_engine(database_url)
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.query(AdminKeys).first() is not None:
+            raise SystemExit(f"{engine.url!r} already has data, pass --reset to drop it")
+    create_test_data(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fill the CHALLENGE_DATABASE_URL database with test data.")
+    parser.add_argument("--database-url", default=os.environ.get("CHALLENGE_DATABASE_URL"),
+                        help="Database to fill (default: CHALLENGE_DATABASE_URL)")
+    parser.add_argument("--reset", action="store_true", help="Drop all tables of the database first")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("Set CHALLENGE_DATABASE_URL or pass --database-url")
+    setup_test_database(args.database_url, args.reset)
+    print(f"Test data created in {args.database_url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
-from sqlalchemy import DateTime, ForeignKey, Enum, Index
+from sqlalchemy import DateTime, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, relationship
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
-from api_models import RoundStatus, TaskStatus, SubmissionStatus
+from api_models import RoundStatus, TaskStatus, SubmissionStatus, RejudgeStatus, AuditAction
 
 
 class Base(DeclarativeBase):
@@ -110,6 +110,9 @@ class RoundTaskType(Base):
     generator_secret: Mapped[str] = mapped_column(nullable=False)
     score: Mapped[int] = mapped_column(default=100, nullable=False)
     time_to_solve: Mapped[int] = mapped_column(nullable=False)
+    # Return the stored verdict for a repeated answer instead of calling the checker.
+    # Only for generators whose verdict depends on the answer alone (not right_time).
+    cache_verdicts: Mapped[bool] = mapped_column(default=False, nullable=False)
 
     # Foreign key references
     round_id: Mapped[int] = mapped_column(
@@ -136,9 +139,6 @@ class Task(Base):
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING)
     statement_version: Mapped[str] = mapped_column(nullable=True)
     score: Mapped[int] = mapped_column(nullable=True)
-    input: Mapped[str] = mapped_column(nullable=True)
-    checker_hint: Mapped[str] = mapped_column(nullable=True)
-    statement: Mapped[str] = mapped_column(nullable=True)
     claimed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Foreign key references
@@ -174,6 +174,22 @@ class Task(Base):
         cascade="all, delete-orphan",
         passive_deletes=True
     )
+    # Statement text is shared by all tasks of the type with the same statement version
+    statement_entry: Mapped["TaskStatement | None"] = relationship(
+        "TaskStatement",
+        primaryjoin="and_(foreign(Task.round_task_type_id) == remote(TaskStatement.round_task_type_id), "
+                    "foreign(Task.statement_version) == remote(TaskStatement.statement_version))",
+        uselist=False,
+        viewonly=True
+    )
+    # Large generated texts live in a separate table and are loaded only when accessed
+    payload: Mapped["TaskPayload | None"] = relationship(
+        "TaskPayload",
+        back_populates="task",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
 
     # Computed property for backward compatibility
     @property
@@ -181,14 +197,77 @@ class Task(Base):
         # Return the type from the related RoundTaskType
         return self.round_task_type.type
 
+    def _ensure_payload(self) -> "TaskPayload":
+        if self.payload is None:
+            self.payload = TaskPayload()
+        return self.payload
+
+    @property
+    def input(self) -> str | None:
+        return self.payload.input if self.payload is not None else None
+
+    @input.setter
+    def input(self, value: str | None) -> None:
+        self._ensure_payload().input = value
+
+    @property
+    def checker_hint(self) -> str | None:
+        return self.payload.checker_hint if self.payload is not None else None
+
+    @checker_hint.setter
+    def checker_hint(self, value: str | None) -> None:
+        self._ensure_payload().checker_hint = value
+
+    @property
+    def statement(self) -> str | None:
+        return self.statement_entry.statement if self.statement_entry is not None else None
+
+
+class TaskPayload(Base):
+    __tablename__ = "task_payloads"
+
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    input: Mapped[str | None] = mapped_column(nullable=True)
+    checker_hint: Mapped[str | None] = mapped_column(nullable=True)
+
+    # Relationships
+    task = relationship("Task", back_populates="payload")
+
+
+class TaskStatement(Base):
+    __tablename__ = "task_statements"
+    __table_args__ = (
+        UniqueConstraint("round_task_type_id", "statement_version", name="uq_task_statement_type_version"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    statement_version: Mapped[str] = mapped_column(nullable=False)
+    statement: Mapped[str] = mapped_column(nullable=False)
+
+    # Foreign keys
+    round_task_type_id: Mapped[int] = mapped_column(
+        ForeignKey("round_task_types.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Relationships
+    round_task_type = relationship("RoundTaskType")
+
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        Index("ix_submissions_task_answer_hash", "task_id", "answer_hash"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     status: Mapped[SubmissionStatus] = mapped_column(Enum(SubmissionStatus), nullable=False)
     submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     answer: Mapped[str] = mapped_column(nullable=True)
+    answer_hash: Mapped[str | None] = mapped_column(nullable=True)
     explanation: Mapped[str] = mapped_column(nullable=True)
     score: Mapped[int] = mapped_column(nullable=True)
 
@@ -240,3 +319,62 @@ class Dashboard(Base):
     round = relationship("Round")
     team = relationship("Team")
     round_task_type = relationship("RoundTaskType")
+
+
+class RejudgeJob(Base):
+    __tablename__ = "rejudge_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    status: Mapped[RejudgeStatus] = mapped_column(
+        Enum(RejudgeStatus), nullable=False, default=RejudgeStatus.PENDING
+    )
+    total: Mapped[int] = mapped_column(nullable=False, default=0)
+    processed: Mapped[int] = mapped_column(nullable=False, default=0)
+    changed: Mapped[int] = mapped_column(nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(nullable=True)
+    # Keyset cursor: (task_id, submission_id) of the last processed submission, so a job can be resumed
+    last_task_id: Mapped[int] = mapped_column(nullable=False, default=0)
+    last_submission_id: Mapped[int] = mapped_column(nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Foreign keys
+    round_id: Mapped[int] = mapped_column(
+        ForeignKey("rounds.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # Relationships
+    round = relationship("Round")
+
+
+class AuditLog(Base):
+    """Append-only: rows are inserted by back.audit in the transaction of the change and never updated."""
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_round_id_id", "round_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    action: Mapped[AuditAction] = mapped_column(Enum(AuditAction), nullable=False)
+    # No foreign keys, so the log outlives deleted rounds, teams and tasks
+    round_id: Mapped[int] = mapped_column(nullable=False)
+    team_id: Mapped[int] = mapped_column(nullable=False)
+    task_id: Mapped[int] = mapped_column(nullable=False)
+    status: Mapped[TaskStatus | None] = mapped_column(Enum(TaskStatus), nullable=True)
+    score: Mapped[int | None] = mapped_column(nullable=True)
+
+
+class IdempotencyKey(Base):
+    """Response of a claim or submit request by its Idempotency-Key, so that retries don't repeat the request."""
+    __tablename__ = "idempotency_keys"
+
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    key: Mapped[str] = mapped_column(primary_key=True)
+    # Hash of method, path and body: the same key must not be reused for another request
+    fingerprint: Mapped[str] = mapped_column(nullable=False)
+    # JSON of the response, None while the first request is in progress
+    response: Mapped[str | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from back.db_models import IdempotencyKey
+from back.task_service import GENERATOR_TIMEOUT
+
+# Seconds a key is remembered
+TTL = int(os.getenv("CHALLENGE_IDEMPOTENCY_TTL", str(24 * 3600)))
+# Seconds a reserved key stays in progress. A request that died without completing or releasing it
+# (Lambda timeout, killed worker) leaves the reservation behind, a retry takes it over after the lease
+LEASE = int(os.getenv("CHALLENGE_IDEMPOTENCY_LEASE", str(GENERATOR_TIMEOUT + 30)))
+# Completed responses cached in process memory, so that retries usually don't hit the table
+LRU_SIZE = int(os.getenv("CHALLENGE_IDEMPOTENCY_LRU_SIZE", "1024"))
+
+
+class IdempotencyKeyInProgress(ValueError):
+    pass
+
+
+class _ResponseCache:
+    def __init__(self, size: int = LRU_SIZE):
+        self._items: OrderedDict[tuple[int, str], tuple[str, str, datetime]] = OrderedDict()
+        self._size = size
+        self._lock = threading.Lock()
+
+    def get(self, team_id: int, key: str) -> tuple[str, str, datetime] | None:
+        with self._lock:
+            item = self._items.get((team_id, key))
+            if item is not None:
+                self._items.move_to_end((team_id, key))
+            return item
+
+    def put(self, team_id: int, key: str, fingerprint: str, response: str, created_at: datetime) -> None:
+        with self._lock:
+            self._items[(team_id, key)] = (fingerprint, response, created_at)
+            self._items.move_to_end((team_id, key))
+            while len(self._items) > self._size:
+                self._items.popitem(last=False)
+
+
+_recent_responses = _ResponseCache()
+
+
+def fingerprint(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class IdempotencyService:
+    """Stores responses of claim and submit requests by (team, Idempotency-Key) for TTL seconds."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def start(self, team_id: int, key: str, request_fingerprint: str) -> str | None:
+        """Return the stored response JSON of a completed request with this key,
+        or reserve the key for a new request and return None."""
+        now = datetime.now(timezone.utc)
+        cached = _recent_responses.get(team_id, key)
+        if cached is not None and now - _as_utc(cached[2]) < timedelta(seconds=TTL):
+            return self._check_fingerprint(cached[0], request_fingerprint, cached[1])
+
+        # Expired keys of the team are dropped here, so the table stays small without a separate cleanup job
+        self.db.execute(delete(IdempotencyKey).where(
+            (IdempotencyKey.team_id == team_id) & (IdempotencyKey.created_at < now - timedelta(seconds=TTL))
+        ), execution_options={"synchronize_session": False})
+        try:
+            with self.db.begin_nested():
+                self.db.add(IdempotencyKey(team_id=team_id, key=key, fingerprint=request_fingerprint,
+                                           created_at=now))
+        except IntegrityError:
+            self.db.commit()
+            stored = self.db.execute(
+                select(IdempotencyKey).where((IdempotencyKey.team_id == team_id) & (IdempotencyKey.key == key))
+            ).scalar_one()
+            if stored.response is None:
+                self._check_fingerprint(stored.fingerprint, request_fingerprint, None)
+                if now - _as_utc(stored.created_at) < timedelta(seconds=LEASE) or not self._take_over(stored, now):
+                    raise IdempotencyKeyInProgress("A request with this Idempotency-Key is still in progress")
+                return None
+            _recent_responses.put(team_id, key, stored.fingerprint, stored.response, stored.created_at)
+            return self._check_fingerprint(stored.fingerprint, request_fingerprint, stored.response)
+        # Commit the reservation, so that concurrent retries see it
+        self.db.commit()
+        return None
+
+    def _take_over(self, stored: IdempotencyKey, now: datetime) -> bool:
+        """Renew the expired lease of an abandoned reservation. Of concurrent retries only one succeeds,
+        the one whose update still finds the old created_at."""
+        taken = self.db.execute(
+            update(IdempotencyKey)
+            .where((IdempotencyKey.team_id == stored.team_id) & (IdempotencyKey.key == stored.key)
+                   & IdempotencyKey.response.is_(None) & (IdempotencyKey.created_at == stored.created_at))
+            .values(created_at=now)
+            .returning(IdempotencyKey.key),
+            execution_options={"synchronize_session": False},
+        ).first()
+        self.db.commit()
+        return taken is not None
+
+    def complete(self, team_id: int, key: str, request_fingerprint: str, response: str) -> None:
+        self.db.execute(
+            update(IdempotencyKey)
+            .where((IdempotencyKey.team_id == team_id) & (IdempotencyKey.key == key))
+            .values(response=response)
+        )
+        self.db.commit()
+        _recent_responses.put(team_id, key, request_fingerprint, response, datetime.now(timezone.utc))
+
+    def release(self, team_id: int, key: str) -> None:
+        """Forget a reserved key after a failed request, so that it can be retried."""
+        self.db.rollback()
+        self.db.execute(delete(IdempotencyKey).where(
+            (IdempotencyKey.team_id == team_id) & (IdempotencyKey.key == key) & (IdempotencyKey.response.is_(None))
+        ))
+        self.db.commit()
+
+    @staticmethod
+    def _check_fingerprint(stored: str, requested: str, response: str | None) -> str | None:
+        if stored != requested:
+            raise ValueError("Idempotency-Key was already used for a different request")
+        return response
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api_models import RouteTiming
+
+logger = logging.getLogger("back.requests")
+
+# Number of latest requests per route used for the rolling percentiles
+WINDOW_SIZE = int(os.getenv("CHALLENGE_METRICS_WINDOW", "1000"))
+
+
+@dataclass
+class RequestStats:
+    db_count: int = 0
+    db_time: float = 0.0
+    gen_count: int = 0
+    gen_time: float = 0.0
+
+
+# Stats of the request being handled. Sync endpoints run in a thread pool with a copy of the context,
+# which still refers to the same RequestStats object, so their queries are counted too.
+_current_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count SQL statements and their time for the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any,
+                              executemany: bool) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any,
+                             executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.db_count += 1
+            stats.db_time += elapsed
+
+
+@contextmanager
+def track_generator_call() -> Iterator[None]:
+    """Count an outbound task generator call and its time for the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.gen_count += 1
+            stats.gen_time += time.perf_counter() - started
+
+
+class RouteMetrics:
+    """Rolling window of the latest request timings per route, shared by all requests of the process."""
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self._timings: dict[str, deque[tuple[float, RequestStats]]] = defaultdict(lambda: deque(maxlen=window_size))
+        self._lock = threading.Lock()
+
+    def record(self, route: str, total_time: float, stats: RequestStats) -> None:
+        with self._lock:
+            self._timings[route].append((total_time, stats))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._timings.clear()
+
+    def summary(self) -> list[RouteTiming]:
+        with self._lock:
+            snapshot = {route: list(timings) for route, timings in self._timings.items()}
+        result = []
+        for route, timings in sorted(snapshot.items()):
+            total_ms = [t * 1000 for t, _ in timings]
+            db_ms = [s.db_time * 1000 for _, s in timings]
+            gen_ms = [s.gen_time * 1000 for _, s in timings]
+            result.append(RouteTiming(
+                route=route,
+                count=len(timings),
+                p50_ms=_percentile(total_ms, 50),
+                p95_ms=_percentile(total_ms, 95),
+                p99_ms=_percentile(total_ms, 99),
+                db_queries_avg=statistics.fmean(s.db_count for _, s in timings),
+                db_p95_ms=_percentile(db_ms, 95),
+                gen_p95_ms=_percentile(gen_ms, 95),
+            ))
+        return result
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+route_metrics = RouteMetrics()
+
+
+class TimingMiddleware:
+    """Adds a Server-Timing header and a structured log line with wall, SQL and generator time to every request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total = time.perf_counter() - started
+                server_timing = (
+                    f"app;dur={total * 1000:.1f}, "
+                    f'db;dur={stats.db_time * 1000:.1f};desc="{stats.db_count} queries", '
+                    f'gen;dur={stats.gen_time * 1000:.1f};desc="{stats.gen_count} calls"'
+                )
+                message.setdefault("headers", []).append((b"server-timing", server_timing.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = time.perf_counter() - started
+            _current_stats.reset(token)
+            # Route template keeps the number of tracked routes bounded, unmatched paths share one bucket
+            route = scope.get("route")
+            route_path = f"{scope['method']} {getattr(route, 'path', '<unmatched>')}"
+            route_metrics.record(route_path, total, stats)
+            logger.info(json.dumps({
+                "route": route_path,
+                "path": scope["path"],
+                "status": status_code,
+                "total_ms": round(total * 1000, 2),
+                "db_queries": stats.db_count,
+                "db_ms": round(stats.db_time * 1000, 2),
+                "gen_calls": stats.gen_count,
+                "gen_ms": round(stats.gen_time * 1000, 2),
+            }))
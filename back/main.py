@@ -2,6 +2,7 @@ import os
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import RedirectResponse
 from mangum import Mangum
 try:
@@ -12,17 +13,32 @@ try:
     SLOWAPI_AVAILABLE: bool = True
 except Exception:
     SLOWAPI_AVAILABLE = False
+try:
+    from brotli_asgi import BrotliMiddleware  # type: ignore[import-not-found, unused-ignore]
+    BROTLI_AVAILABLE: bool = True
+except Exception:
+    BROTLI_AVAILABLE = False
 # Routers split by domain
 from back.api_teams import router as team_router
 from back.api_challenges import router as challenges_router
 from back.api_tasks import router as tasks_router
 from back.api_boards import router as boards_router
+from back.api_rejudge import router as rejudge_router
+from back.api_audit import router as audit_router
 from back.api_task_gen import router as task_gen_router
+from back.responses import DefaultResponse
+from back.api_metrics import router as metrics_router
+from back.database import engine
+from back.instrumentation import TimingMiddleware, instrument_engine
+from back.api_profiling import router as profiling_router
+from back.profiling import ProfilingMiddleware, stack_sampler
+from back.rate_limit import TeamRateLimitMiddleware, create_bucket_store
 
 
 app = FastAPI(title="Teamwork Challenge API",
               description="API for managing teamwork challenges and tasks",
               version="1.0.0",
+              default_response_class=DefaultResponse,
               debug=True)
 
 # Global rate limiting using SlowAPI (optional)
@@ -42,11 +58,36 @@ if SLOWAPI_AVAILABLE:
     app.add_exception_handler(RateLimitExceeded, _rate_limit_wrapper)
     app.add_middleware(SlowAPIMiddleware)
 
+# Compress responses larger than the threshold (task inputs and lists), brotli if available, gzip otherwise
+_compress_min_size = int(os.getenv("CHALLENGE_COMPRESS_MIN_SIZE", "1000"))
+if BROTLI_AVAILABLE:
+    app.add_middleware(BrotliMiddleware, minimum_size=_compress_min_size, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=_compress_min_size)
+
+# Admin-only on-demand profiling of single requests, and the optional background stack sampler
+app.add_middleware(ProfilingMiddleware)
+stack_sampler.start()
+
+# Per-team token buckets, e.g. CHALLENGE_TEAM_RATE_LIMIT=30/minute; outside of everything that touches the DB
+_team_rate = os.getenv("CHALLENGE_TEAM_RATE_LIMIT")
+if _team_rate:
+    app.add_middleware(TeamRateLimitMiddleware, rate=_team_rate, ip_rate=os.getenv("CHALLENGE_IP_RATE_LIMIT"),
+                       store=create_bucket_store(os.getenv("CHALLENGE_RATE_LIMIT_REDIS_URL")))
+
+# Outermost, so that the timing covers compression and rate limiting too
+instrument_engine(engine)
+app.add_middleware(TimingMiddleware)
+
 # Include split routers
 app.include_router(team_router)
 app.include_router(challenges_router)
 app.include_router(tasks_router)
 app.include_router(boards_router)
+app.include_router(rejudge_router)
+app.include_router(audit_router)
+app.include_router(metrics_router)
+app.include_router(profiling_router)
 
 
 # Hide task generators from OpenAPI
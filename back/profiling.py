@@ -0,0 +1,208 @@
+import cProfile
+import functools
+import inspect
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api_models import UserRole
+from back.auth_service import AuthService
+from back.database import SessionLocal
+
+# Number of latest request profiles kept in memory
+PROFILES_KEPT = int(os.getenv("CHALLENGE_PROFILES_KEPT", "20"))
+# Interval of the background stack sampler, 0 disables it
+SAMPLE_INTERVAL_MS = float(os.getenv("CHALLENGE_PROFILE_SAMPLE_INTERVAL_MS", "0"))
+
+# Profiler of the request being handled, set only for requests profiled on demand
+_current_profiler: ContextVar[cProfile.Profile | None] = ContextVar("request_profiler", default=None)
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    route: str
+    created_at: float
+    duration_ms: float
+    stats: pstats.Stats
+
+    def as_text(self, lines: int = 50) -> str:
+        stream = io.StringIO()
+        stream.write(f"{self.route} {self.duration_ms:.1f} ms\n")
+        self.stats.stream = stream  # type: ignore[attr-defined]
+        self.stats.sort_stats("cumulative").print_stats(lines)
+        return stream.getvalue()
+
+    def as_pstats(self) -> bytes:
+        """Same format as `cProfile -o`, for snakeviz or `python -m pstats`."""
+        return marshal.dumps(self.stats.stats)  # type: ignore[attr-defined]
+
+
+class ProfileStore:
+    def __init__(self, size: int = PROFILES_KEPT):
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+        self._size = size
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self._size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore()
+
+
+def profiled(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Run the endpoint under the request's profiler, if any. cProfile only sees the thread it is enabled in,
+    so it has to be enabled here rather than in the middleware: sync endpoints run in the thread pool."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _current_profiler.get()
+            if profiler is None:
+                return await endpoint(*args, **kwargs)
+            profiler.enable()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profiler.disable()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _current_profiler.get()
+        if profiler is None:
+            return endpoint(*args, **kwargs)
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class of all API routers, so that any endpoint can be profiled on demand."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+
+def is_admin_key(api_key: str) -> bool:
+    with SessionLocal() as db:
+        auth_data = AuthService(db).get_auth_data(api_key)
+    return auth_data is not None and auth_data.role == UserRole.ADMIN
+
+
+class ProfilingMiddleware:
+    """Profiles a single request sent by an admin with an `X-Profile: 1` header or a `profile=1` query parameter.
+    The profile is stored in memory and its ID is returned in the `X-Profile-Id` header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not await self._profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        profile_id = uuid.uuid4().hex
+        token = _current_profiler.set(profiler)
+        started = time.perf_counter()
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start" and profiler.getstats():
+                # The endpoint has returned by now, so the profile is complete
+                route = scope.get("route")
+                profile_store.add(RequestProfile(
+                    id=profile_id,
+                    route=f"{scope['method']} {getattr(route, 'path', scope['path'])}",
+                    created_at=time.time(),
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    stats=pstats.Stats(profiler),
+                ))
+                message.setdefault("headers", []).append((b"x-profile-id", profile_id.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profiler.reset(token)
+
+    @staticmethod
+    async def _profile_requested(scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        query = parse_qs(scope.get("query_string", b"").decode())
+        if headers.get("x-profile") != "1" and query.get("profile") != ["1"]:
+            return False
+        api_key = headers.get("x-api-key")
+        return api_key is not None and await run_in_threadpool(is_admin_key, api_key)
+
+
+class StackSampler:
+    """Low-overhead statistical profiler: a daemon thread records the stacks of all other threads every
+    `interval_ms` and aggregates them as folded stacks, the input format of flamegraph.pl and speedscope."""
+
+    def __init__(self, interval_ms: float = SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self._stacks: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            samples = [_fold(frame) for thread_id, frame in sys._current_frames().items() if thread_id != own_id]
+            with self._lock:
+                self._stacks.update(samples)
+
+    def folded(self, reset: bool = False) -> str:
+        """Stacks sampled since start or the last reset, one `frame;frame;frame count` line per stack."""
+        with self._lock:
+            stacks = self._stacks.most_common()
+            if reset:
+                self._stacks.clear()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+def _fold(frame: Any) -> str:
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+stack_sampler = StackSampler()
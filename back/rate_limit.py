@@ -0,0 +1,170 @@
+import logging
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import redis  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    REDIS_AVAILABLE: bool = True
+except Exception:
+    REDIS_AVAILABLE = False
+
+# Cost of a request in tokens by route class: claim and submit call the generators and write to the DB
+ROUTE_COSTS = {"claim": 2, "submit": 2, "read": 1}
+
+_CLAIM_PATH = re.compile(r"^/tasks/?$")
+_SUBMIT_PATH = re.compile(r"^/tasks/\d+/submission/?$")
+# The per-IP limit, unless set, is this many times the per-key one: several teams may share an address (NAT)
+IP_RATE_FACTOR = 10
+# In-memory buckets are dropped once full again, when there are more of them than this
+_MAX_MEMORY_BUCKETS = 10_000
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: float
+    per_second: float
+
+
+def parse_rate(rate: str) -> Rate:
+    """Parse "30/minute" into a bucket of 30 tokens that refills in a minute."""
+    count, _, period = rate.partition("/")
+    if period not in _PERIODS:
+        raise ValueError(f"Invalid rate limit: {rate}")
+    return Rate(capacity=float(count), per_second=float(count) / _PERIODS[period])
+
+
+def route_class(method: str, path: str) -> str:
+    if method == "POST" and _CLAIM_PATH.match(path):
+        return "claim"
+    if method == "POST" and _SUBMIT_PATH.match(path):
+        return "submit"
+    return "read"
+
+
+class BucketStore(Protocol):
+    def take(self, key: str, cost: float, rate: Rate) -> float:
+        """Take `cost` tokens from the bucket. Returns 0 if allowed, otherwise seconds until enough tokens."""
+        ...
+
+
+class InMemoryBucketStore:
+    """Buckets of this process. With several workers each of them limits separately."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: Rate) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rate.capacity, now))
+            tokens = min(rate.capacity, tokens + (now - updated_at) * rate.per_second)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate.per_second
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > _MAX_MEMORY_BUCKETS:
+                self._prune(now, rate)
+        return wait
+
+    def _prune(self, now: float, rate: Rate) -> None:
+        full_after = rate.capacity / rate.per_second
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < full_after}
+
+
+class RedisBucketStore:
+    """Buckets shared by all workers, updated atomically by a Lua script."""
+
+    _SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_second = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * per_second)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / per_second
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / per_second) + 1)
+return tostring(wait)
+"""
+
+    def __init__(self, url: str):
+        client = redis.Redis.from_url(url)
+        self._take = client.register_script(self._SCRIPT)
+
+    def take(self, key: str, cost: float, rate: Rate) -> float:
+        result = self._take(keys=[f"rate:{key}"], args=[rate.capacity, rate.per_second, cost, time.time()])
+        return float(result)
+
+
+def create_bucket_store(redis_url: str | None) -> BucketStore:
+    if redis_url:
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("CHALLENGE_RATE_LIMIT_REDIS_URL is set, but the redis package is not installed")
+        return RedisBucketStore(redis_url)
+    return InMemoryBucketStore()
+
+
+class TeamRateLimitMiddleware:
+    """Token buckets per API key (client IP for requests without one) and route class.
+    Runs before routing, so throttled requests never reach the database.
+
+    The key is not validated at this point, so every request also takes tokens from a bucket of its
+    client IP: a client that sends a new key with every request gets a fresh key bucket each time,
+    but not a fresh IP bucket."""
+
+    def __init__(self, app: ASGIApp, rate: str, store: BucketStore, ip_rate: str | None = None):
+        self.app = app
+        self.rate = parse_rate(rate)
+        self.ip_rate = parse_rate(ip_rate) if ip_rate else Rate(capacity=self.rate.capacity * IP_RATE_FACTOR,
+                                                                 per_second=self.rate.per_second * IP_RATE_FACTOR)
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        key = headers.get("x-api-key") or ip
+        cls = route_class(scope["method"], scope["path"])
+        try:
+            wait = self.store.take(f"ip:{ip}:{cls}", ROUTE_COSTS[cls], self.ip_rate)
+            if wait == 0:
+                wait = self.store.take(f"{key}:{cls}", ROUTE_COSTS[cls], self.rate)
+        except Exception as e:
+            # A broken shared store must not take the API down
+            logging.warning("Rate limit store is not available: %s", e)
+            wait = 0.0
+
+        if wait > 0:
+            response = JSONResponse(
+                {"detail": f"Rate limit exceeded for {cls} requests, retry in {math.ceil(wait)} s"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
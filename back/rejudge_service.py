@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import select, func, update, and_, or_
+from sqlalchemy.orm import Session
+
+from api_models import AuditAction, CheckRequest, CheckResponse, CheckStatus, RejudgeStatus, SubmissionStatus, \
+    TaskStatus as ApiTaskStatus
+from back.audit import record_audit
+from back.boards_service import BoardsService
+from back.database import SessionLocal
+from back.db_models import RejudgeJob, Round, RoundTaskType, Submission, Task, TaskPayload, Team
+from back.scoring import as_utc, score_batch
+from back.task_service import TaskGenClient
+
+
+class RateLimiter:
+    """Spaces out calls from several threads so that at most `calls_per_second` start each second."""
+
+    def __init__(self, calls_per_second: float):
+        self._interval = 1.0 / calls_per_second if calls_per_second > 0 else 0.0
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(self._next_call, now)
+            self._next_call = call_at + self._interval
+        if call_at > now:
+            time.sleep(call_at - now)
+
+
+@dataclass
+class _TaskTally:
+    """Re-judge results of one task, kept until all of its submissions are checked."""
+    old_best: int = 0
+    new_best: int = 0
+    accepted: bool = False
+    count: int = 0
+    last_submission_id: int = 0
+    changes: list[dict[str, Any]] = field(default_factory=list)
+
+
+class RejudgeService:
+    def __init__(self, db: Session, task_gen_client: TaskGenClient | None = None):
+        self.db = db
+        self.task_gen_client = task_gen_client or TaskGenClient()
+        self.page_size = int(os.getenv("CHALLENGE_REJUDGE_PAGE_SIZE", "500"))
+        self.batch_size = int(os.getenv("CHALLENGE_REJUDGE_BATCH_SIZE", "50"))
+        self.max_workers = int(os.getenv("CHALLENGE_REJUDGE_WORKERS", "4"))
+        self.calls_per_second = float(os.getenv("CHALLENGE_REJUDGE_CALLS_PER_SECOND", "10"))
+        # Seconds a single run may take before the job is paused (0 = no limit). Lambda invocations are time-boxed.
+        self.time_budget = float(os.getenv("CHALLENGE_REJUDGE_TIME_BUDGET", "0"))
+
+    def get_job(self, job_id: int) -> RejudgeJob | None:
+        return self.db.execute(select(RejudgeJob).where(RejudgeJob.id == job_id)).scalar_one_or_none()
+
+    def create_job(self, round_id: int) -> RejudgeJob:
+        active = self.db.execute(
+            select(RejudgeJob.id).where(
+                (RejudgeJob.round_id == round_id)
+                & RejudgeJob.status.in_([RejudgeStatus.PENDING, RejudgeStatus.RUNNING])
+            )
+        ).first()
+        if active is not None:
+            raise ValueError(f"Re-judge job {active.id} is already in progress for this round")
+
+        total = self.db.execute(
+            select(func.count(Submission.id))
+            .join(Task, Task.id == Submission.task_id)
+            .where(Task.round_id == round_id)
+        ).scalar_one()
+        job = RejudgeJob(round_id=round_id, status=RejudgeStatus.PENDING, total=total)
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def resume_job(self, job_id: int) -> RejudgeJob:
+        job = self.get_job(job_id)
+        if job is None:
+            raise ValueError("Re-judge job not found")
+        if job.status not in (RejudgeStatus.PAUSED, RejudgeStatus.FAILED):
+            raise ValueError(f"Only paused or failed jobs can be resumed, job is {job.status}")
+        job.status = RejudgeStatus.PENDING
+        job.error = None
+        self.db.commit()
+        return job
+
+    def run_job(self, job_id: int) -> None:
+        """Re-check the round's submissions page by page, starting from the job cursor.
+        Memory use is bounded by the page size, whatever the number of submissions in the round.
+        Changes are committed per finished task, so a paused or failed job can be resumed from its cursor."""
+        job = self.get_job(job_id)
+        if job is None or job.status != RejudgeStatus.PENDING:
+            return
+        job.status = RejudgeStatus.RUNNING
+        self.db.commit()
+
+        started = time.monotonic()
+        task_types = {
+            rtt.id: rtt for rtt in self.db.execute(
+                select(RoundTaskType).where(RoundTaskType.round_id == job.round_id)
+            ).scalars().all()
+        }
+        decay = self.db.execute(select(Round.score_decay).where(Round.id == job.round_id)).scalar_one()
+        limiter = RateLimiter(self.calls_per_second)
+        tallies: dict[int, _TaskTally] = {}
+        cursor = (job.last_task_id, job.last_submission_id)
+        draining = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    # Once the time budget is spent, only the rest of the current task is fetched before pausing
+                    rows = self._next_page(job.round_id, cursor, only_current_task=draining)
+                    if not rows:
+                        self._finish_tasks(job, tallies, list(tallies))
+                        if draining:
+                            job.status = RejudgeStatus.PAUSED
+                        else:
+                            job.status = RejudgeStatus.DONE
+                            job.finished_at = datetime.now(timezone.utc)
+                        self.db.commit()
+                        return
+
+                    verdicts = self._check_page(rows, task_types, executor, limiter)
+                    self._tally_verdicts(rows, verdicts, tallies, decay, task_types)
+                    cursor = (rows[-1].task_id, rows[-1].id)
+
+                    # Submissions are ordered by task, so only the last task of the page may continue on the next one
+                    self._finish_tasks(job, tallies, [t for t in tallies if t != cursor[0]])
+                    self.db.commit()
+
+                    if self.time_budget and time.monotonic() - started > self.time_budget:
+                        draining = True
+        except Exception as e:
+            logging.exception("Re-judge job %s failed", job_id)
+            self.db.rollback()
+            job.status = RejudgeStatus.FAILED
+            job.error = str(e)
+            self.db.commit()
+
+    def _next_page(self, round_id: int, cursor: tuple[int, int], only_current_task: bool = False) -> Sequence[Any]:
+        last_task_id, last_submission_id = cursor
+        stmt = (
+            select(
+                Submission.id, Submission.task_id, Submission.answer, Submission.status, Submission.score,
+                Submission.submitted_at, TaskPayload.input, TaskPayload.checker_hint,
+                Task.score.label("task_score"), Task.claimed_at, Task.round_task_type_id
+            )
+            .join(Task, Task.id == Submission.task_id)
+            .outerjoin(TaskPayload, TaskPayload.task_id == Task.id)
+            .where(Task.round_id == round_id)
+            .where(or_(
+                Submission.task_id > last_task_id,
+                and_(Submission.task_id == last_task_id, Submission.id > last_submission_id)
+            ))
+            .order_by(Submission.task_id, Submission.id)
+            .limit(self.page_size)
+        )
+        if only_current_task:
+            stmt = stmt.where(Submission.task_id == last_task_id)
+        return self.db.execute(stmt).all()
+
+    def _check_page(self, rows: Sequence[Any], task_types: dict[int, RoundTaskType],
+                    executor: ThreadPoolExecutor, limiter: RateLimiter) -> dict[int, CheckResponse]:
+        """Send the page to the generators in concurrent batches. Returns check results by submission id."""
+        by_type: dict[int, list[Any]] = defaultdict(list)
+        for row in rows:
+            by_type[row.round_task_type_id].append(row)
+
+        def check_batch(rtt: RoundTaskType, batch: list[Any]) -> list[CheckResponse]:
+            limiter.wait()
+            return self.task_gen_client.check_answers(
+                rtt.generator_url,
+                rtt.generator_secret,
+                [
+                    CheckRequest(input=r.input or "", checker_hint=r.checker_hint or "",
+                                 answer=r.answer or "", task_id=str(r.task_id))
+                    for r in batch
+                ]
+            )
+
+        futures = []
+        for rtt_id, type_rows in by_type.items():
+            for i in range(0, len(type_rows), self.batch_size):
+                batch = type_rows[i:i + self.batch_size]
+                futures.append((batch, executor.submit(check_batch, task_types[rtt_id], batch)))
+
+        verdicts: dict[int, CheckResponse] = {}
+        for batch, future in futures:
+            for row, response in zip(batch, future.result()):
+                verdicts[row.id] = response
+        return verdicts
+
+    def _tally_verdicts(self, rows: Sequence[Any], verdicts: dict[int, CheckResponse],
+                        tallies: dict[int, _TaskTally], decay: str, task_types: dict[int, RoundTaskType]) -> None:
+        """Accumulate per-task best scores and the submission rows whose verdict changed."""
+        results = [verdicts[row.id][0] for row in rows]
+        # Scores of the whole page are computed at once, the same way as for a single submission
+        page_scores = score_batch(
+            decay,
+            [row.task_score or 0 for row in rows],
+            [result.score for result in results],
+            [(as_utc(row.submitted_at) - as_utc(row.claimed_at)).total_seconds() for row in rows],
+            [task_types[row.round_task_type_id].time_to_solve for row in rows],
+        )
+        for row, result, page_score in zip(rows, results, page_scores.tolist()):
+            accepted = result.status == CheckStatus.ACCEPTED
+            status = SubmissionStatus.AC if accepted else SubmissionStatus.WA
+            score = page_score if accepted else None
+
+            tally = tallies.setdefault(row.task_id, _TaskTally())
+            tally.count += 1
+            tally.last_submission_id = row.id
+            if row.status == SubmissionStatus.AC:
+                tally.old_best = max(tally.old_best, row.score or 0)
+            if accepted:
+                tally.accepted = True
+                tally.new_best = max(tally.new_best, score or 0)
+            if status != row.status or score != row.score:
+                tally.changes.append({"id": row.id, "status": status, "score": score,
+                                      "explanation": None if accepted else result.error})
+
+    def _finish_tasks(self, job: RejudgeJob, tallies: dict[int, _TaskTally], task_ids: list[int]) -> None:
+        """Write submission, task status, team score, dashboard and audit log changes of fully re-judged tasks."""
+        if not task_ids:
+            return
+        tasks = self.db.execute(
+            select(Task.id, Task.status, Task.team_id, Task.round_task_type_id).where(Task.id.in_(task_ids))
+        ).all()
+
+        submission_changes = []
+        status_changes = []
+        team_deltas: dict[int, int] = defaultdict(int)
+        counter_deltas: dict[tuple[int, int], dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for task in tasks:
+            tally = tallies[task.id]
+            submission_changes.extend(tally.changes)
+            team_deltas[task.team_id] += tally.new_best - tally.old_best
+            new_status = ApiTaskStatus.AC if tally.accepted else ApiTaskStatus.WA
+            if new_status != task.status:
+                status_changes.append({"id": task.id, "status": new_status})
+                record_audit(self.db, AuditAction.REJUDGE, job.round_id, task.team_id, task.id, new_status)
+                counters = counter_deltas[(task.team_id, task.round_task_type_id)]
+                counters[str(task.status)] -= 1
+                counters[str(new_status)] += 1
+
+        if submission_changes:
+            self.db.execute(update(Submission), submission_changes)
+        if status_changes:
+            self.db.execute(update(Task), status_changes)
+        for team_id, delta in team_deltas.items():
+            if delta != 0:
+                self.db.execute(
+                    update(Team).where(Team.id == team_id).values(total_score=Team.total_score + delta)
+                )
+        boards = BoardsService(self.db)
+        for (team_id, rtt_id), counters in counter_deltas.items():
+            boards.shift_counters(job.round_id, team_id, rtt_id, **counters)
+
+        last_task_id = max(task_ids)
+        job.last_task_id = last_task_id
+        job.last_submission_id = tallies[last_task_id].last_submission_id
+        job.processed += sum(tallies[t].count for t in task_ids)
+        job.changed += len(submission_changes)
+        for task_id in task_ids:
+            del tallies[task_id]
+
+
+def run_rejudge_job(job_id: int) -> None:
+    """Entry point for background execution: the request session is closed by then, so open a new one."""
+    db = SessionLocal()
+    try:
+        RejudgeService(db).run_job(job_id)
+    finally:
+        db.close()
@@ -0,0 +1,108 @@
+"""Benchmark of JSON serialization time and payload size for GET /tasks and GET /rounds.
+
+Usage: python -m back.response_benchmark [--tasks 20] [--rounds 50] [--input-size 4000] [--repeat 200]
+"""
+import argparse
+import gzip
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+try:
+    import brotli  # type: ignore[import-not-found, unused-ignore]
+    BROTLI_AVAILABLE: bool = True
+except Exception:
+    BROTLI_AVAILABLE = False
+
+from api_models import TaskStatus, RoundStatus, SubmissionStatus
+from back.database import SessionLocal
+from back.db_models import Task, Round, Submission
+from back.main import app
+from back.responses import ORJSONResponse, ORJSON_AVAILABLE
+
+
+def seed(tasks: int, rounds: int, input_size: int) -> None:
+    """Add tasks with large inputs for team 1 and extra rounds for challenge 1 to the test database."""
+    now = datetime.now()
+    with SessionLocal() as db:
+        for i in range(tasks):
+            task = Task(
+                title=f"Benchmark Task {i}",
+                status=TaskStatus.WA,
+                challenge_id=1,
+                team_id=1,
+                round_id=1,
+                round_task_type_id=1,
+                statement_version="1.0",
+                score=100,
+                input=" ".join(str(n % 1000) for n in range(input_size // 4)),
+                checker_hint="",
+                claimed_at=now,
+            )
+            task.submissions = [Submission(status=SubmissionStatus.WA, answer="42", score=None) for _ in range(2)]
+            db.add(task)
+        for i in range(rounds):
+            db.add(Round(
+                challenge_id=1,
+                index=100 + i,
+                status=RoundStatus.PUBLISHED,
+                start_time=now,
+                end_time=now + timedelta(hours=1),
+            ))
+        db.commit()
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """Average call time in milliseconds."""
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def bench_endpoint(client: TestClient, endpoint: str, repeat: int) -> None:
+    response = client.get(endpoint, headers={"Accept-Encoding": "identity"})
+    response.raise_for_status()
+    content = jsonable_encoder(response.json())
+    raw = response.content
+
+    print(f"\n{endpoint}")
+    print(f"  render json:    {measure(lambda: JSONResponse(content), repeat):8.3f} ms")
+    if ORJSON_AVAILABLE:
+        print(f"  render orjson:  {measure(lambda: ORJSONResponse(content), repeat):8.3f} ms")
+    print(f"  size raw:       {len(raw):8d} B")
+    print(f"  size gzip:      {len(gzip.compress(raw, compresslevel=9)):8d} B"
+          f"   ({measure(lambda: gzip.compress(raw, compresslevel=9), repeat):.3f} ms)")
+    if BROTLI_AVAILABLE:
+        print(f"  size brotli:    {len(brotli.compress(raw, quality=4)):8d} B"
+              f"   ({measure(lambda: brotli.compress(raw, quality=4), repeat):.3f} ms)")
+
+    for encoding in ["identity", "gzip"]:
+        request_time = measure(lambda: client.get(endpoint, headers={"Accept-Encoding": encoding}), repeat)
+        print(f"  GET ({encoding}):{' ' * (9 - len(encoding))}{request_time:8.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks to add for team 1 (GET /tasks returns 20)")
+    parser.add_argument("--rounds", type=int, default=50, help="Rounds to add to challenge 1")
+    parser.add_argument("--input-size", type=int, default=4000, help="Approximate task input size in bytes")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    seed(args.tasks, args.rounds, args.input_size)
+    print(f"orjson: {ORJSON_AVAILABLE}, brotli: {BROTLI_AVAILABLE}")
+
+    client = TestClient(app)
+    client.headers["X-API-Key"] = "team1"
+    bench_endpoint(client, "/tasks", args.repeat)
+    client.headers["X-API-Key"] = "admin1"
+    bench_endpoint(client, "/rounds?challenge_id=1", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
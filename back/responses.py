@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+try:
+    import orjson
+    ORJSON_AVAILABLE: bool = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, which is several times faster than the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+DefaultResponse: type[JSONResponse] = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+
+# Share of the task score that is left at the deadline
+DECAY_FLOOR = float(os.getenv("CHALLENGE_SCORE_DECAY_FLOOR", "0.5"))
+# Number of equal time steps of the "step" policy
+DECAY_STEPS = int(os.getenv("CHALLENGE_SCORE_DECAY_STEPS", "4"))
+
+# A decay policy maps the elapsed share of the time to solve (0 at claim, 1 at the deadline) to a score factor
+DecayPolicy = Callable[[FloatArray], FloatArray]
+
+DECAY_POLICIES: dict[str, DecayPolicy] = {}
+
+
+def decay_policy(*names: str) -> Callable[[DecayPolicy], DecayPolicy]:
+    """Register a decay policy under the given `Round.score_decay` names."""
+    def register(policy: DecayPolicy) -> DecayPolicy:
+        for name in names:
+            DECAY_POLICIES[name] = policy
+        return policy
+    return register
+
+
+@decay_policy("no", "none")
+def _no_decay(elapsed: FloatArray) -> FloatArray:
+    return np.ones_like(elapsed)
+
+
+@decay_policy("linear")
+def _linear_decay(elapsed: FloatArray) -> FloatArray:
+    return 1.0 - (1.0 - DECAY_FLOOR) * elapsed
+
+
+@decay_policy("exponential")
+def _exponential_decay(elapsed: FloatArray) -> FloatArray:
+    return np.power(DECAY_FLOOR, elapsed)
+
+
+@decay_policy("step")
+def _step_decay(elapsed: FloatArray) -> FloatArray:
+    steps = max(1, DECAY_STEPS)
+    return 1.0 - (1.0 - DECAY_FLOOR) * np.floor(elapsed * steps) / steps
+
+
+def ensure_decay_policy(name: str) -> DecayPolicy:
+    policy = DECAY_POLICIES.get(name)
+    if policy is None:
+        raise ValueError(f"Unknown score decay '{name}', expected one of: {', '.join(DECAY_POLICIES)}")
+    return policy
+
+
+def score_batch(decay: str, task_scores: npt.ArrayLike, check_scores: npt.ArrayLike,
+                elapsed_seconds: npt.ArrayLike, time_to_solve_minutes: npt.ArrayLike) -> npt.NDArray[np.int64]:
+    """Scores of accepted submissions, computed for whole arrays at once.
+    The single submission path goes through here too, so both always agree."""
+    policy = ensure_decay_policy(decay)
+    limit = np.maximum(np.asarray(time_to_solve_minutes, dtype=np.float64) * 60.0, 1.0)
+    elapsed = np.clip(np.asarray(elapsed_seconds, dtype=np.float64) / limit, 0.0, 1.0)
+    scores = np.asarray(task_scores, dtype=np.float64) * np.asarray(check_scores, dtype=np.float64) * policy(elapsed)
+    return np.trunc(scores).astype(np.int64)
+
+
+def submission_score(decay: str, task_score: int, check_score: float, claimed_at: datetime,
+                     submitted_at: datetime, time_to_solve_minutes: int) -> int:
+    elapsed = (as_utc(submitted_at) - as_utc(claimed_at)).total_seconds()
+    return int(score_batch(decay, [task_score], [check_score], [elapsed], [time_to_solve_minutes])[0])
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes, which are stored in UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import select, null, ColumnElement
+from sqlalchemy.orm import Session
+
+from api_models import Task as ApiTask, Submission as ApiSubmission, SubmissionStatus, TaskStatus as ApiTaskStatus
+from back.db_models import Task, TaskPayload, TaskStatement, RoundTaskType, Submission
+
+
+class TaskReadModel:
+    """Builds API task responses straight from SQL rows: one query for tasks and one for their submissions,
+    whatever the number of tasks."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_tasks_for_team(self, team_id: int,
+                            status: ApiTaskStatus | None = None,
+                            task_type: str | None = None,
+                            round_id: int | None = None,
+                            since: datetime | None = None,
+                            limit: int = 20,
+                            before_id: int | None = None,
+                            include_payload: bool = True) -> list[ApiTask]:
+        """Newest tasks first. Pages continue with `before_id` set to the id of the last task of a page."""
+        condition = (Task.team_id == team_id)
+        if status is not None:
+            condition = condition & (Task.status == status)
+        if task_type is not None:
+            condition = condition & (RoundTaskType.type == task_type)
+        if round_id is not None:
+            condition = condition & (Task.round_id == round_id)
+        if since is not None:
+            condition = condition & (Task.claimed_at >= since)
+        if before_id is not None:
+            condition = condition & (Task.id < before_id)
+        return self._build(self._select_tasks(condition, limit, include_payload))
+
+    def get_task(self, task_id: int, include_payload: bool = True) -> ApiTask | None:
+        tasks = self._build(self._select_tasks(Task.id == task_id, 1, include_payload))
+        return tasks[0] if tasks else None
+
+    def _select_tasks(self, condition: ColumnElement[bool], limit: int,
+                      include_payload: bool = True) -> Sequence[Any]:
+        stmt = (
+            select(Task.id, Task.title, RoundTaskType.type, Task.status, Task.score, Task.statement_version,
+                   Task.claimed_at)
+            .join(RoundTaskType, RoundTaskType.id == Task.round_task_type_id)
+        )
+        if include_payload:
+            full_stmt = (
+                stmt.add_columns(TaskStatement.statement, TaskPayload.input)
+                .outerjoin(TaskPayload, TaskPayload.task_id == Task.id)
+                .outerjoin(TaskStatement, (TaskStatement.round_task_type_id == Task.round_task_type_id)
+                           & (TaskStatement.statement_version == Task.statement_version))
+            )
+        else:
+            # Statement and input are the large columns, so their tables are not joined at all
+            full_stmt = stmt.add_columns(null().label("statement"), null().label("input"))
+        return self.db.execute(
+            full_stmt.where(condition).order_by(Task.id.desc()).limit(limit)
+        ).all()
+
+    def _build(self, rows: Sequence[Any]) -> list[ApiTask]:
+        submissions = self._submissions_by_task([row.id for row in rows])
+        tasks = []
+        for row in rows:
+            task_submissions = submissions.get(row.id, [])
+            accepted = [s.submitted_at for s in task_submissions if s.status == SubmissionStatus.AC]
+            tasks.append(ApiTask(
+                id=row.id,
+                title=row.title,
+                type=row.type,
+                status=row.status,
+                score=row.score,
+                statement_version=row.statement_version,
+                statement=row.statement,
+                input=row.input,
+                claimed_at=row.claimed_at,
+                submissions=task_submissions,
+                last_attempt_at=max((s.submitted_at for s in task_submissions), default=None),
+                solved_at=min(accepted, default=None),
+            ))
+        return tasks
+
+    def _submissions_by_task(self, task_ids: list[int]) -> dict[int, list[ApiSubmission]]:
+        if not task_ids:
+            return {}
+        stmt = (
+            select(
+                Submission.id, Submission.status, Submission.submitted_at, Submission.task_id,
+                Submission.answer, Submission.explanation, Submission.score
+            )
+            .where(Submission.task_id.in_(task_ids))
+            .order_by(Submission.task_id, Submission.id)
+        )
+        submissions: dict[int, list[ApiSubmission]] = defaultdict(list)
+        for row in self.db.execute(stmt):
+            submissions[row.task_id].append(ApiSubmission.model_validate(row, from_attributes=True))
+        return submissions
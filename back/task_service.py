@@ -1,25 +1,42 @@
 from __future__ import annotations
 
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone, timedelta
 import requests
+import hashlib
 import json
 import random
 import logging
-from typing import Optional
+import time
+from typing import Optional, TypeVar
 from pydantic import TypeAdapter
 from urllib.parse import urlparse
 
 from api_models import (
     GenRequest, GenResponse, TaskProgress, CheckRequest, CheckResult, CheckStatus, CheckResponse,
+    GeneratorCapabilities, AuditAction,
 )
 from api_models import Submission as ApiSubmission, SubmissionStatus, TaskStatus as ApiTaskStatus
-from back.db_models import Team, Task, Round, RoundTaskType, Submission
+from back.db_models import Team, Task, Round, RoundTaskType, Submission, TaskStatement
+from back.audit import record_audit
 from back.boards_service import BoardsService
+from back.instrumentation import track_generator_call
+from back.scoring import submission_score
+
+T = TypeVar("T")
+
+# Seconds to wait for a generator to generate or check, the generator Lambdas time out after 30 s
+GENERATOR_TIMEOUT = 30
+# Seconds to trust the capabilities of a generator before asking it again
+CAPABILITIES_TTL = 300
 
 
 class TaskGenClient:
+    # Capabilities by generator URL with the monotonic time they expire at, shared by all clients in the process
+    _capabilities: dict[str, tuple[GeneratorCapabilities, float]] = {}
+
     def _is_generator_available(self, generator_url: str) -> bool:
         try:
             parsed = urlparse(generator_url)
@@ -37,11 +54,13 @@ class TaskGenClient:
                 checker_hint="",
             )
         try:
-            response = requests.post(
-                f"{generator_url}/gen",
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(gen_request.model_dump())
-            )
+            with track_generator_call():
+                response = requests.post(
+                    f"{generator_url}/gen",
+                    headers={"Content-Type": "application/json"},
+                    data=json.dumps(gen_request.model_dump()),
+                    timeout=GENERATOR_TIMEOUT
+                )
             response.raise_for_status()
             return GenResponse.model_validate(response.json())
         except Exception as e:
@@ -63,11 +82,13 @@ class TaskGenClient:
             ])
 
         try:
-            response = requests.post(
-                f"{generator_url}/check",
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(check_request.model_dump())
-            )
+            with track_generator_call():
+                response = requests.post(
+                    f"{generator_url}/check",
+                    headers={"Content-Type": "application/json"},
+                    data=json.dumps(check_request.model_dump()),
+                    timeout=GENERATOR_TIMEOUT
+                )
             response.raise_for_status()
 
             adapter = TypeAdapter(list[CheckResult])
@@ -82,29 +103,98 @@ class TaskGenClient:
         except Exception as e:
             raise RuntimeError(f"Error checking answer: {str(e)}")
 
+    def get_capabilities(self, generator_url: str, generator_secret: str = "") -> GeneratorCapabilities:
+        """Ask the generator which optional features it supports. Generators without /capabilities support none.
+        Answers are cached for CAPABILITIES_TTL, failed requests are not, so a generator that is briefly down
+        doesn't lose batching until the process restarts."""
+        cached = self._capabilities.get(generator_url)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        capabilities = GeneratorCapabilities()
+        if not self._is_generator_available(generator_url):
+            return capabilities
+        try:
+            with track_generator_call():
+                response = requests.get(
+                    f"{generator_url}/capabilities",
+                    headers={"X-API-Key": generator_secret},
+                    timeout=10
+                )
+            if response.status_code != 404:
+                # Anything but "no such endpoint" may be transient
+                response.raise_for_status()
+                capabilities = GeneratorCapabilities.model_validate(response.json())
+        except (requests.RequestException, ValueError) as e:
+            logging.info("Capabilities of %s are not available: %s", generator_url, e)
+            return capabilities
+
+        self._capabilities[generator_url] = (capabilities, time.monotonic() + CAPABILITIES_TTL)
+        return capabilities
+
+    def get_statements(self, generator_url: str, generator_secret: str = "") -> dict[str, str]:
+        """Fetch all statements of the generator by version. Returns an empty dict if they are not available."""
+        if not self._is_generator_available(generator_url):
+            return {}
+        try:
+            with track_generator_call():
+                response = requests.get(
+                    f"{generator_url}/statements",
+                    headers={"X-API-Key": generator_secret},
+                    timeout=10
+                )
+            response.raise_for_status()
+            return TypeAdapter(dict[str, str]).validate_python(response.json())
+        except (requests.RequestException, ValueError) as e:
+            logging.warning("Statements of %s are not available: %s", generator_url, e)
+            return {}
+
+    def check_answers(self, generator_url: str, generator_secret: str,
+                      check_requests: list[CheckRequest]) -> list[CheckResponse]:
+        """Check several answers, using /check/batch when the generator supports it.
+        Responses are in the same order as requests."""
+        capabilities = self.get_capabilities(generator_url, generator_secret)
+        if not capabilities.batch or len(check_requests) <= 1:
+            return [
+                self.check_answer(generator_url, r.answer, r.checker_hint, r.input, r.task_id)
+                for r in check_requests
+            ]
+
+        adapter = TypeAdapter(list[list[CheckResult]])
+        check_responses: list[CheckResponse] = []
+        try:
+            for chunk in _chunks(check_requests, capabilities.max_batch_size):
+                with track_generator_call():
+                    response = requests.post(
+                        f"{generator_url}/check/batch",
+                        headers={"Content-Type": "application/json", "X-API-Key": generator_secret},
+                        data=json.dumps([r.model_dump() for r in chunk]),
+                        timeout=GENERATOR_TIMEOUT
+                    )
+                response.raise_for_status()
+                parsed = adapter.validate_python(response.json())
+                if len(parsed) != len(chunk) or any(len(results) == 0 for results in parsed):
+                    raise RuntimeError("Not every answer got check results from task generator")
+                check_responses.extend(CheckResponse(results) for results in parsed)
+        except Exception as e:
+            raise RuntimeError(f"Error checking answers: {str(e)}")
+        return check_responses
+
+
+def _chunks(items: list[T], size: int) -> list[list[T]]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def answer_hash(answer: str) -> str:
+    return hashlib.sha256(answer.encode()).hexdigest()
+
 
 class TaskService:
     def __init__(self, db: Session):
         self.db = db
         self.task_gen_client = TaskGenClient()
 
-    def list_tasks_for_team(self, team_id: int,
-                             status: ApiTaskStatus | None = None,
-                             task_type: str | None = None,
-                             round_id: int | None = None,
-                             since: datetime | None = None) -> list[Task]:
-        condition = (Task.team_id == team_id)
-        if status is not None:
-            condition = condition & (Task.status == status)
-        if task_type is not None:
-            condition = condition & Task.round_task_type.has(RoundTaskType.type == task_type)
-        if round_id is not None:
-            condition = condition & (Task.round_id == round_id)
-        if since is not None:
-            condition = condition & (Task.claimed_at >= since)
-        stmt = select(Task).where(condition).order_by(Task.claimed_at.desc()).limit(20)
-        return list(self.db.execute(stmt).scalars().all())
-
     def get_task(self, task_id: int) -> Task | None:
         stmt = select(Task).where(Task.id == task_id)
         return self.db.execute(stmt).scalar_one_or_none()
@@ -130,12 +220,12 @@ class TaskService:
 
         self.db.add(task)
 
-        existing_tasks = self.get_existing_tasks(team_id, game_round.id, task_type)
+        existing_tasks_count = self.count_existing_tasks(team_id, game_round.id, task_type)
 
         current_time = datetime.now()
 
         task_progress = TaskProgress(
-            task_index=len(existing_tasks),
+            task_index=existing_tasks_count,
             task_count=round_task_type.max_tasks_per_team or 0,
             elapsed_time=int((current_time - game_round.start_time).total_seconds() / 60),
             total_time=int((game_round.end_time - game_round.start_time).total_seconds() / 60)
@@ -148,7 +238,7 @@ class TaskService:
         task.score = round_task_type.score
         task.input = gen_response.input
         task.checker_hint = gen_response.checker_hint
-        task.statement = gen_response.statement
+        self.ensure_statement(round_task_type, gen_response.statement_version, gen_response.statement)
 
         # Flush to persist the task and generated fields before dashboard update
         self.db.flush()
@@ -156,11 +246,39 @@ class TaskService:
         # Update dashboard counters for a newly created task
         BoardsService(self.db).add_task_to_dashboard(task, round_task_type)
 
+        record_audit(self.db, AuditAction.CLAIM, task.round_id, team_id, task.id, task.status)
+
         self.db.commit()
         self.db.refresh(task)
 
         return task
 
+    def ensure_statement(self, round_task_type: RoundTaskType, statement_version: str, statement: str) -> None:
+        """Store the statement once per task type and version, tasks reference it by statement_version."""
+        exists = self.db.execute(
+            select(TaskStatement.id).where(
+                (TaskStatement.round_task_type_id == round_task_type.id)
+                & (TaskStatement.statement_version == statement_version)
+            )
+        ).first()
+        if exists is not None:
+            return
+
+        if not statement:
+            statement = self.task_gen_client.get_statements(
+                round_task_type.generator_url, round_task_type.generator_secret
+            ).get(statement_version, "")
+        try:
+            # Savepoint: a concurrent claim may insert the same statement first
+            with self.db.begin_nested():
+                self.db.add(TaskStatement(
+                    round_task_type_id=round_task_type.id,
+                    statement_version=statement_version,
+                    statement=statement
+                ))
+        except IntegrityError:
+            pass
+
     def ensure_valid_round(self, challenge_id: int) -> Round:
         stmt = select(Round).where(Round.challenge_id == challenge_id)
         game_round = self.db.execute(stmt).scalar_one_or_none()
@@ -204,18 +322,27 @@ class TaskService:
 
         return team
 
-    def get_existing_tasks(self, team_id: int, round_id: int, task_type: str | None = None) -> list[Task]:
+    def count_existing_tasks(self, team_id: int, round_id: int, task_type: str | None = None) -> int:
         condition = (Task.team_id == team_id) & (Task.round_id == round_id)
         if task_type is not None:
             condition &= Task.round_task_type.has(RoundTaskType.type == task_type)
-        stmt = select(Task).where(condition)
-        return list(self.db.execute(stmt).scalars().all())
+        stmt = select(func.count(Task.id)).where(condition)
+        return self.db.execute(stmt).scalar_one()
+
+    def count_existing_tasks_by_type(self, team_id: int, round_id: int) -> dict[int, int]:
+        """Number of tasks taken by the team in the round, by round task type id."""
+        stmt = (
+            select(Task.round_task_type_id, func.count(Task.id))
+            .where((Task.team_id == team_id) & (Task.round_id == round_id))
+            .group_by(Task.round_task_type_id)
+        )
+        return {rtt_id: count for rtt_id, count in self.db.execute(stmt)}
 
     def ensure_task_limit(self, team_id: int, round_id: int, task_type: str, round_task_type: RoundTaskType) -> None:
         if round_task_type.max_tasks_per_team is not None:
-            existing_tasks = self.get_existing_tasks(team_id, round_id, task_type)
+            existing_tasks_count = self.count_existing_tasks(team_id, round_id, task_type)
 
-            if len(existing_tasks) >= round_task_type.max_tasks_per_team:
+            if existing_tasks_count >= round_task_type.max_tasks_per_team:
                 raise ValueError(f"Maximum number of tasks of type '{task_type}' already taken")
 
     def generate_task_content(self, task: Task, team: Team, game_round: Round, round_task_type: RoundTaskType,
@@ -242,7 +369,8 @@ class TaskService:
         return self.task_gen_client.check_answer(generator_url, answer, checker_hint, input_text)
 
     def update_team_score(
-            self, task: Task, team_id: int, check_result: CheckResult, new_status: ApiTaskStatus
+            self, task: Task, team_id: int, check_result: CheckResult, new_status: ApiTaskStatus,
+            submitted_at: datetime
     ) -> Optional[int]:
         """Calculate and update the team's score for a new submission.
         Returns the final score for the submission, or None if not accepted.
@@ -251,7 +379,8 @@ class TaskService:
             return None
 
         team = self.db.execute(select(Team).where(Team.id == team_id)).scalar_one()
-        score = int(float(task.score or 0) * check_result.score)
+        score = submission_score(task.round.score_decay, task.score or 0, check_result.score, task.claimed_at,
+                                 submitted_at, task.round_task_type.time_to_solve)
 
         # Only add the difference compared to the best previously accepted score
         prev_best = (
@@ -278,7 +407,7 @@ class TaskService:
         new_status = ApiTaskStatus.AC if prev_status == ApiTaskStatus.AC else desired_status
 
         # Update score if accepted
-        score = self.update_team_score(task, team_id, check_result, new_status)
+        score = self.update_team_score(task, team_id, check_result, new_status, submitted_at)
 
         # Persist submission
         db_submission = Submission(
@@ -286,6 +415,7 @@ class TaskService:
             submitted_at=submitted_at,
             task_id=task_id,
             answer=answer,
+            answer_hash=answer_hash(answer),
             explanation=None if new_status == ApiTaskStatus.AC else check_result.error,
             score=score
         )
@@ -298,6 +428,8 @@ class TaskService:
         # Update dashboard counters according to transition rules
         BoardsService(self.db).update_dashboard(task, prev_status, new_status)
 
+        record_audit(self.db, AuditAction.SUBMIT, task.round_id, team_id, task_id, new_status, score)
+
         self.db.commit()
 
         # Convert to Pydantic
@@ -325,9 +457,26 @@ class TaskService:
 
         return task
 
+    def find_cached_verdict(self, task_id: int, answer: str) -> ApiSubmission | None:
+        """The latest submission of the same answer to the task, returned instead of checking it again."""
+        stmt = (
+            select(Submission)
+            .where((Submission.task_id == task_id) & (Submission.answer_hash == answer_hash(answer)))
+            .order_by(Submission.id.desc())
+            .limit(1)
+        )
+        submission = self.db.execute(stmt).scalar_one_or_none()
+        # Guard against hash collisions
+        if submission is None or submission.answer != answer:
+            return None
+        return ApiSubmission.model_validate(submission, from_attributes=True)
+
     def submit_task_answer(self, task_id: int, team_id: int, answer: str) -> ApiSubmission:
         task = self.ensure_valid_task(task_id, team_id)
         self.ensure_valid_round(task.challenge_id)
+        # A task leaves PENDING with its first submission, so no submissions need to be counted
+        if not task.round.allow_resubmit and task.status != ApiTaskStatus.PENDING:
+            raise ValueError("Resubmissions are not allowed in this round")
         round_task_type = task.round_task_type
 
         # Check if the submission is within the time limit (handle naive vs aware datetimes)
@@ -341,9 +490,14 @@ class TaskService:
         if current_time > deadline:
             raise ValueError(f"Time limit exceeded. The task had to be solved within {round_task_type.time_to_solve} minutes.")
 
+        if round_task_type.cache_verdicts:
+            cached = self.find_cached_verdict(task_id, answer)
+            if cached is not None:
+                return cached
+
         checker_hint = task.checker_hint or ""
 
-        check_response = self.check_answer(answer, checker_hint, round_task_type.generator_url, task.input)
+        check_response = self.check_answer(answer, checker_hint, round_task_type.generator_url, task.input or "")
 
         submissions: list[ApiSubmission] = []
 
@@ -365,6 +519,8 @@ class TaskService:
                             if collab_team:
                                 score_update = int(float(collab_task.score or 0) * collab_score.score)
                                 collab_team.total_score += score_update
+                                record_audit(self.db, AuditAction.COLLABORATIVE_SCORE, collab_task.round_id,
+                                             collab_team.id, collab_task.id, collab_task.status, score_update)
                                 self.db.commit()
                     except (ValueError, TypeError) as e:
                         # Log error but continue processing
@@ -381,10 +537,10 @@ class TaskService:
         if not task_types:
             raise ValueError("No task types available for this round")
 
-        existing_tasks = self.get_existing_tasks(team_id, game_round.id)
+        taken_tasks_counts = self.count_existing_tasks_by_type(team_id, game_round.id)
 
         def get_probability(task_type: RoundTaskType) -> float:
-            taken_tasks_count = len([t for t in existing_tasks if t.type == task_type.type])
+            taken_tasks_count = taken_tasks_counts.get(task_type.id, 0)
             max_per_team = task_type.max_tasks_per_team or 0
             return max(0.0, float(max_per_team - taken_tasks_count))
 
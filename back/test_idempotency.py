@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from back import idempotency
+from back.db_models import Base, IdempotencyKey
+from back.idempotency import IdempotencyKeyInProgress, IdempotencyService
+
+TEAM_ID = 1
+KEY = "claim-1"
+FINGERPRINT = "POST /tasks"
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def abandon_reservation(engine: Engine, age: timedelta) -> None:
+    """Reserve the key like a request that died before complete() or release()."""
+    with Session(engine) as db:
+        assert IdempotencyService(db).start(TEAM_ID, KEY, FINGERPRINT) is None
+        db.execute(update(IdempotencyKey).values(created_at=datetime.now(timezone.utc) - age))
+        db.commit()
+
+
+def start(engine: Engine, request_fingerprint: str = FINGERPRINT) -> str | None:
+    # Each request has its own session
+    with Session(engine) as db:
+        return IdempotencyService(db).start(TEAM_ID, KEY, request_fingerprint)
+
+
+def test_reservation_in_lease_is_in_progress(engine: Engine) -> None:
+    abandon_reservation(engine, timedelta(seconds=1))
+    with pytest.raises(IdempotencyKeyInProgress):
+        start(engine)
+
+
+def test_abandoned_reservation_is_taken_over(engine: Engine) -> None:
+    abandon_reservation(engine, timedelta(seconds=idempotency.LEASE + 1))
+    with pytest.raises(ValueError, match="different request"):
+        start(engine, "POST /tasks/1/submission")
+    # The retry takes the reservation over and runs the request, the next retry waits for it again
+    assert start(engine) is None
+    with pytest.raises(IdempotencyKeyInProgress):
+        start(engine)
+    with Session(engine) as db:
+        IdempotencyService(db).complete(TEAM_ID, KEY, FINGERPRINT, '{"id": 1}')
+    assert start(engine) == '{"id": 1}'
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from api_models import AuditAction, CheckRequest, CheckResponse, CheckResult, CheckStatus, RejudgeStatus, \
+    RoundStatus, SubmissionStatus, TaskStatus
+from back.db_models import AuditLog, Base, Challenge, Dashboard, Round, RoundTaskType, Submission, Task, \
+    TaskPayload, Team
+from back.rejudge_service import RejudgeService
+from back.task_service import TaskGenClient
+
+# The fixed checker accepts this answer only
+CORRECT_ANSWER = "4"
+
+
+class FixedTaskGenClient(TaskGenClient):
+    """Checker after a fix: answers that were accepted before may be wrong now, and the other way round."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.checked: list[tuple[str | None, str]] = []
+
+    def check_answers(self, generator_url: str, generator_secret: str,
+                      check_requests: list[CheckRequest]) -> list[CheckResponse]:
+        responses = []
+        for request in check_requests:
+            self.checked.append((request.task_id, request.answer))
+            if request.answer.strip() == CORRECT_ANSWER:
+                responses.append(CheckResponse([CheckResult(status=CheckStatus.ACCEPTED, score=1.0)]))
+            else:
+                responses.append(CheckResponse([CheckResult(status=CheckStatus.WRONG_ANSWER, error="Wrong answer")]))
+        return responses
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def round_id(engine: Engine) -> int:
+    """Round with three judged tasks: team 1 has an accepted task that is wrong now (1) and one that stays
+    accepted (3), team 2 has a rejected task whose second answer is correct now (2)."""
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        challenge = Challenge(title="Rejudge", description="Rejudge challenge")
+        db.add(challenge)
+        db.flush()
+        game_round = Round(challenge_id=challenge.id, index=1, status=RoundStatus.PUBLISHED,
+                           start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1), score_decay="no")
+        db.add(game_round)
+        db.flush()
+        task_type = RoundTaskType(round_id=game_round.id, type="a_plus_b", generator_url="http://stub",
+                                  generator_secret="", score=100, time_to_solve=60)
+        team1 = Team(api_key="team1", name="Team 1", members="", captain_contact="", challenge_id=challenge.id,
+                     total_score=200)
+        team2 = Team(api_key="team2", name="Team 2", members="", captain_contact="", challenge_id=challenge.id,
+                     total_score=0)
+        db.add_all([task_type, team1, team2])
+        db.flush()
+
+        def add_task(team: Team, status: TaskStatus, answers: list[tuple[str, SubmissionStatus]]) -> None:
+            task = Task(title="a_plus_b Task", status=status, score=100, claimed_at=now - timedelta(minutes=10),
+                        challenge_id=challenge.id, team_id=team.id, round_id=game_round.id,
+                        round_task_type_id=task_type.id)
+            db.add(task)
+            db.flush()
+            db.add(TaskPayload(task_id=task.id, input="2 2", checker_hint=CORRECT_ANSWER))
+            for answer, submission_status in answers:
+                db.add(Submission(task_id=task.id, answer=answer, status=submission_status,
+                                  score=100 if submission_status == SubmissionStatus.AC else None,
+                                  submitted_at=now - timedelta(minutes=5)))
+
+        add_task(team1, TaskStatus.AC, [("3", SubmissionStatus.AC)])
+        add_task(team2, TaskStatus.WA, [("1", SubmissionStatus.WA), (CORRECT_ANSWER, SubmissionStatus.WA)])
+        add_task(team1, TaskStatus.AC, [(CORRECT_ANSWER, SubmissionStatus.AC)])
+        db.add_all([
+            Dashboard(round_id=game_round.id, team_id=team1.id, round_task_type_id=task_type.id, type="a_plus_b",
+                      pending=0, ac=2, wa=0, remaining=10),
+            Dashboard(round_id=game_round.id, team_id=team2.id, round_task_type_id=task_type.id, type="a_plus_b",
+                      pending=0, ac=0, wa=1, remaining=10),
+        ])
+        db.commit()
+        return game_round.id
+
+
+def assert_rejudged(engine: Engine) -> None:
+    with Session(engine) as db:
+        submissions = db.execute(select(Submission).order_by(Submission.id)).scalars().all()
+        assert [(s.task_id, s.status, s.score) for s in submissions] == [
+            (1, SubmissionStatus.WA, None),
+            (2, SubmissionStatus.WA, None),
+            (2, SubmissionStatus.AC, 100),
+            (3, SubmissionStatus.AC, 100),
+        ]
+        assert submissions[0].explanation == "Wrong answer"
+        tasks = db.execute(select(Task.id, Task.status).order_by(Task.id)).all()
+        assert [tuple(task) for task in tasks] == [(1, TaskStatus.WA), (2, TaskStatus.AC), (3, TaskStatus.AC)]
+        totals = db.execute(select(Team.id, Team.total_score).order_by(Team.id)).all()
+        assert [tuple(total) for total in totals] == [(1, 100), (2, 100)]
+        dashboard = db.execute(select(Dashboard.team_id, Dashboard.ac, Dashboard.wa).order_by(Dashboard.team_id)).all()
+        assert [tuple(row) for row in dashboard] == [(1, 1, 1), (2, 1, 0)]
+        # Status changes are audited in the transaction that makes them
+        audit = db.execute(select(AuditLog.action, AuditLog.team_id, AuditLog.task_id, AuditLog.status)
+                           .order_by(AuditLog.id)).all()
+        assert [tuple(entry) for entry in audit] == [(AuditAction.REJUDGE, 1, 1, TaskStatus.WA),
+                                                     (AuditAction.REJUDGE, 2, 2, TaskStatus.AC)]
+
+
+def test_rejudge_applies_changed_verdicts(engine: Engine, round_id: int) -> None:
+    checker = FixedTaskGenClient()
+    with Session(engine) as db:
+        service = RejudgeService(db, checker)
+        job_id = service.create_job(round_id).id
+        service.run_job(job_id)
+        job = service.get_job(job_id)
+        assert job is not None
+        assert (job.status, job.total, job.processed, job.changed) == (RejudgeStatus.DONE, 4, 4, 2)
+
+    assert_rejudged(engine)
+    assert len(checker.checked) == 4
+
+
+def test_paused_job_resumes_from_cursor(engine: Engine, round_id: int) -> None:
+    checker = FixedTaskGenClient()
+    with Session(engine) as db:
+        service = RejudgeService(db, checker)
+        # One submission per page and no time left after the first one: the job pauses after task 1
+        service.page_size = 1
+        service.time_budget = 1e-9
+        job_id = service.create_job(round_id).id
+        service.run_job(job_id)
+
+        job = service.get_job(job_id)
+        assert job is not None
+        assert (job.status, job.processed, job.last_task_id) == (RejudgeStatus.PAUSED, 1, 1)
+        first_submission_id = db.execute(select(Submission.id).where(Submission.task_id == 1)).scalar_one()
+        assert job.last_submission_id == first_submission_id
+        assert db.execute(select(Task.status).where(Task.id == 1)).scalar_one() == TaskStatus.WA
+
+        job = service.resume_job(job_id)
+        assert (job.status, job.error) == (RejudgeStatus.PENDING, None)
+        service.time_budget = 0
+        service.run_job(job_id)
+        job = service.get_job(job_id)
+        assert job is not None
+        assert (job.status, job.processed, job.changed) == (RejudgeStatus.DONE, 4, 2)
+
+    assert_rejudged(engine)
+    # Every submission is checked once, the resumed run starts after the cursor
+    assert checker.checked == [("1", "3"), ("2", "1"), ("2", CORRECT_ANSWER), ("3", CORRECT_ANSWER)]
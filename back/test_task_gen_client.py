@@ -0,0 +1,78 @@
+from typing import Any, Iterator
+
+import pytest
+import requests
+
+from back import task_service
+from back.task_service import TaskGenClient
+
+GENERATOR_URL = "http://generator.test/a_plus_b"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data: Any = None):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self) -> Any:
+        return self._data
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+
+@pytest.fixture(autouse=True)
+def clear_capabilities() -> Iterator[None]:
+    TaskGenClient._capabilities.clear()
+    yield
+    TaskGenClient._capabilities.clear()
+
+
+def fake_get(monkeypatch: pytest.MonkeyPatch, *responses: FakeResponse | Exception) -> list[str]:
+    calls: list[str] = []
+    pending = list(responses)
+
+    def get(url: str, **kwargs: Any) -> FakeResponse:
+        calls.append(url)
+        response = pending.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(requests, "get", get)
+    return calls
+
+
+def test_failed_capabilities_are_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = fake_get(monkeypatch, requests.ConnectionError("down"), FakeResponse(503),
+                     FakeResponse(200, {"batch": True, "max_batch_size": 50}))
+    client = TaskGenClient()
+
+    assert not client.get_capabilities(GENERATOR_URL).batch
+    assert not client.get_capabilities(GENERATOR_URL).batch
+    assert client.get_capabilities(GENERATOR_URL).max_batch_size == 50
+    # Cached once the generator answered
+    assert client.get_capabilities(GENERATOR_URL).batch
+    assert len(calls) == 3
+
+
+def test_missing_capabilities_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = fake_get(monkeypatch, FakeResponse(404))
+    client = TaskGenClient()
+
+    # A generator without /capabilities supports no batches, which is an answer, not a failure
+    assert not client.get_capabilities(GENERATOR_URL).batch
+    assert not client.get_capabilities(GENERATOR_URL).batch
+    assert len(calls) == 1
+
+
+def test_capabilities_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(task_service, "CAPABILITIES_TTL", 0)
+    calls = fake_get(monkeypatch, FakeResponse(404), FakeResponse(200, {"batch": True, "max_batch_size": 100}))
+    client = TaskGenClient()
+
+    assert not client.get_capabilities(GENERATOR_URL).batch
+    # A generator that gained batch endpoints is picked up once the cached answer expires
+    assert client.get_capabilities(GENERATOR_URL).batch
+    assert len(calls) == 2
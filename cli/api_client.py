@@ -1,19 +1,39 @@
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+import uuid
+from typing import Optional, Dict, Any, Iterator
 
 import requests
+from urllib3.util.request import ACCEPT_ENCODING
 
-from api_models import Task, RoundTaskType, RoundTaskTypeCreateRequest, Team, Challenge, Round, RoundList, Submission, \
-    TaskList, Dashboard, Leaderboard, RoundCreateRequest, RoundUpdateRequest, RoundStatus, DeleteResponse
+from api_models import Task, RoundTaskType, RoundTaskTypeCreateRequest, RoundTaskTypeUpdateRequest, Team, Challenge, \
+    Round, RoundList, Submission, TaskList, Dashboard, Leaderboard, RoundCreateRequest, RoundUpdateRequest, \
+    RoundStatus, DeleteResponse, RejudgeJob
+from cli.cache import LocalCache
 from cli.config_manager import ConfigManager
 
 
+# Seconds to wait for a response; claim and submit wait for the task generator
+REQUEST_TIMEOUT = 60
+# Attempts of claim and submit requests, which are safe to retry thanks to Idempotency-Key
+IDEMPOTENT_ATTEMPTS = 4
+# Tasks per page when listing all tasks, the server allows up to 500
+TASK_PAGE_SIZE = 200
+# Responses worth retrying: throttled, key still in progress, gateway errors
+RETRY_STATUS_CODES = {409, 429, 502, 503, 504}
+
+
 class ApiClient:
     """Client for interacting with the Teamwork Challenge API."""
 
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, cache: LocalCache | None = None):
         """Initialize the API client."""
         self.config_manager = config_manager
+        self.cache = cache or LocalCache()
+        # Keeps connections alive between requests of one CLI run
+        self._session = requests.Session()
 
         # Store headers as instance variable to avoid rebuilding for every request
         self._headers = self._build_headers()
@@ -32,7 +52,8 @@ class ApiClient:
 
     def _build_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
-        headers = {"Content-Type": "application/json"}
+        # Advertise only the encodings urllib3 can decode here (br needs the optional brotli package)
+        headers = {"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
         api_key = self.config_manager.get_api_key()
         if api_key:
             headers["X-API-Key"] = api_key
@@ -42,19 +63,72 @@ class ApiClient:
         """Check if the user is logged in by verifying if an API key is set."""
         return self.config_manager.get_api_key() is not None
 
-    def _make_request(self, method: str, endpoint: str, data: Dict[str, Any] | None = None) -> Any:
-        """Make a request to the API."""
+    def _make_request(self, method: str, endpoint: str, data: Dict[str, Any] | None = None,
+                      idempotent: bool = False, retry_throttled: bool = True) -> Any:
+        """Make a request to the API. Idempotent requests get an Idempotency-Key and are retried
+        on timeouts and transient errors, the server runs them once per key."""
+        return self._send(method, endpoint, data, idempotent, retry_throttled=retry_throttled).json()
+
+    def _make_cached_request(self, endpoint: str) -> Any:
+        """GET revalidated against the local cache: an unchanged response comes back as 304 without a body."""
+        scope = self._cache_scope()
+        cached = self.cache.get_response(scope, endpoint)
+        response = self._send("GET", endpoint, extra_headers={"If-None-Match": cached[0]} if cached else None)
+        if response.status_code == 304 and cached is not None:
+            return json.loads(cached[1])
+        etag = response.headers.get("ETag")
+        if etag is not None:
+            self.cache.put_response(scope, endpoint, etag, response.text)
+        return response.json()
+
+    def _cache_scope(self) -> str:
+        # Cached data belongs to one team on one server
+        owner = f"{self.config_manager.get_base_url()} {self.config_manager.get_api_key()}"
+        return hashlib.sha256(owner.encode()).hexdigest()[:16]
+
+    def _send(self, method: str, endpoint: str, data: Dict[str, Any] | None = None, idempotent: bool = False,
+              extra_headers: Dict[str, str] | None = None, retry_throttled: bool = True) -> requests.Response:
+        """Send a request, retrying idempotent ones with the same Idempotency-Key.
+        Without `retry_throttled` a 429 is raised at once, for callers that pace their requests themselves."""
         base_url = self.config_manager.get_base_url()
         url = f"{base_url}{endpoint}"
+        headers = {**self._headers, **extra_headers} if extra_headers else self._headers
+        attempts = 1
+        if idempotent:
+            headers = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+            attempts = IDEMPOTENT_ATTEMPTS
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            logging.info("Make request: %s %s. Data: %s", method, url, data)
+            try:
+                response = self._session.request(method, url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                logging.info("Request failed, retrying: %s", e)
+                time.sleep(self._retry_delay(attempt, None))
+                continue
+            throttled = response.status_code == 429
+            if response.status_code in RETRY_STATUS_CODES and not last_attempt and (retry_throttled or not throttled):
+                logging.info("Received response %s, retrying", response.status_code)
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+            break
 
-        logging.info("Make request: %s %s. Data: %s", method, url, data)
-        response = requests.request(method, url, headers=self._headers, json=data)
         res = response.text
         logging.info("Received response: %s %s", response.status_code, res)
         if 400 <= response.status_code <= 500:
-            raise requests.HTTPError(f"{res} (status code: {response.status_code})")
+            raise requests.HTTPError(f"{res} (status code: {response.status_code})", response=response)
         response.raise_for_status()
-        return response.json()
+        return response
+
+    @staticmethod
+    def _retry_delay(attempt: int, response: requests.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), 10.0)
+        return 0.5 * 2.0 ** attempt
 
     # Team-related methods
     def auth(self) -> str:
@@ -93,7 +167,7 @@ class ApiClient:
     # Round-related methods
     def get_round_info(self, round_id: Optional[int] = None) -> Round:
         endpoint = f"/rounds/{round_id}" if round_id else "/rounds/current"
-        data = self._make_request("GET", endpoint)
+        data = self._make_cached_request(endpoint)
         return Round.model_validate(data)
 
     def list_rounds(self, challenge_id: Optional[int] = None) -> RoundList:
@@ -110,51 +184,11 @@ class ApiClient:
         return RoundList.model_validate({"rounds": data})
 
     def publish_round(self, round_id: int) -> Round:
-        # First, get the round info to get the challenge_id and other required fields
-        round_info = self.get_round_info(round_id)
-        # Create an update request with all required fields
-        update_data = RoundUpdateRequest(
-            status=RoundStatus.PUBLISHED,
-            index=round_info.index,
-            start_time=round_info.start_time,
-            end_time=round_info.end_time,
-            claim_by_type=round_info.claim_by_type,
-            allow_resubmit=round_info.allow_resubmit,
-            score_decay=round_info.score_decay
-        )
-        return self.update_round(round_id, update_data)
+        return self.update_round(round_id, RoundUpdateRequest(status=RoundStatus.PUBLISHED))
 
     def update_round(self, round_id: int, update_data: RoundUpdateRequest) -> Round:
-        # First, get the round info to get the challenge_id and other required fields
-        round_info = self.get_round_info(round_id)
-
-        # Create a dictionary with all the required fields from the existing round
-        # Convert datetime objects to ISO format strings
-        data_dict = {
-            "challenge_id": round_info.challenge_id,
-            "index": round_info.index,
-            "start_time": (
-                round_info.start_time.isoformat()
-                if hasattr(round_info.start_time, "isoformat")
-                else round_info.start_time
-            ),
-            "end_time": (
-                round_info.end_time.isoformat()
-                if hasattr(round_info.end_time, "isoformat")
-                else round_info.end_time
-            ),
-            "claim_by_type": round_info.claim_by_type,
-            "allow_resubmit": round_info.allow_resubmit,
-            "score_decay": round_info.score_decay,
-            "status": round_info.status
-        }
-
-        # Update with the new values
-        update_dict = update_data.model_dump(mode="json", exclude_none=True)
-        data_dict.update(update_dict)
-
-        # Make the request with all required fields
-        data = self._make_request("PUT", f"/rounds/{round_id}", data_dict)
+        # The server updates only the fields that are sent
+        data = self._make_request("PUT", f"/rounds/{round_id}", update_data.model_dump(mode="json", exclude_none=True))
         return Round.model_validate(data)
 
     def create_round(self, round_data: RoundCreateRequest) -> Round:
@@ -164,6 +198,15 @@ class ApiClient:
     def delete_round(self, round_id: int) -> DeleteResponse:
         return DeleteResponse.model_validate(self._make_request("DELETE", f"/rounds/{round_id}"))
 
+    def start_rejudge(self, round_id: int) -> RejudgeJob:
+        return RejudgeJob.model_validate(self._make_request("POST", f"/rounds/{round_id}/rejudge"))
+
+    def get_rejudge_job(self, job_id: int) -> RejudgeJob:
+        return RejudgeJob.model_validate(self._make_request("GET", f"/rejudge-jobs/{job_id}"))
+
+    def resume_rejudge_job(self, job_id: int) -> RejudgeJob:
+        return RejudgeJob.model_validate(self._make_request("POST", f"/rejudge-jobs/{job_id}/resume"))
+
     # Task Type-related methods
     def get_round_task_types(self, round_id: int) -> list[RoundTaskType]:
         data = self._make_request("GET", f"/task-types?round_id={round_id}")
@@ -183,7 +226,7 @@ class ApiClient:
         return RoundTaskType.model_validate(data)
 
     def update_round_task_type(self, task_type_id: int,
-                               task_type_data: RoundTaskTypeCreateRequest) -> RoundTaskType:
+                               task_type_data: RoundTaskTypeUpdateRequest) -> RoundTaskType:
         data = self._make_request(
             "PUT",
             f"/task-types/{task_type_id}",
@@ -195,23 +238,58 @@ class ApiClient:
         return RoundTaskType.model_validate(self._make_request("DELETE", f"/task-types/{task_type_id}"))
 
     # Task-related methods
-    def claim_task(self, task_type: Optional[str] = None) -> Task:
+    def claim_task(self, task_type: Optional[str] = None, retry_throttled: bool = True) -> Task:
         query = "" if task_type is None else f"?task_type={task_type}"
-        response = self._make_request("POST", f"/tasks{query}")
-        return Task.model_validate(response)
+        response = self._send("POST", f"/tasks{query}", idempotent=True, retry_throttled=retry_throttled)
+        self._cache_task(response)
+        return Task.model_validate(response.json())
 
     def get_task_info(self, task_id: str) -> Task:
-        data = self._make_request("GET", f"/tasks/{task_id}")
-        return Task.model_validate(data)
+        """Get a task. Its statement and input are read from the local cache when possible,
+        and the rest is revalidated with the server."""
+        scope = self._cache_scope()
+        payload = self.cache.get_task_payload(scope, int(task_id))
+        if payload is not None:
+            statement_version, task_input = payload
+            data = self._make_cached_request(f"/tasks/{task_id}?payload=false")
+            data["input"] = task_input
+            if statement_version is None:
+                return Task.model_validate(data)
+            data["statement"] = self.cache.get_statement(scope, data["type"], statement_version)
+            if data["statement"] is not None:
+                return Task.model_validate(data)
+
+        # Not cached, or the statement is missing from the cache (cleared, or a failed cache write):
+        # fetch the full task with its payload
+        response = self._send("GET", f"/tasks/{task_id}")
+        self._cache_task(response)
+        return Task.model_validate(response.json())
 
     def get_task_input(self, task_id: str) -> str:
-        """Get task input. Fetches a task and returns its input field."""
-        data = self._make_request("GET", f"/tasks/{task_id}")
-        # The response is a Task-like dict; extract 'input' if present
-        return str(data.get("input", ""))
-
-    def submit_task_answer(self, task_id: str, answer: str) -> Submission:
-        data = self._make_request("POST", f"/tasks/{task_id}/submission", {"answer": answer})
+        """Get task input. It never changes, so once fetched it is read from the local cache, also offline."""
+        payload = self.cache.get_task_payload(self._cache_scope(), int(task_id))
+        if payload is not None:
+            return payload[1] or ""
+        response = self._send("GET", f"/tasks/{task_id}")
+        self._cache_task(response)
+        return str(response.json().get("input") or "")
+
+    def _cache_task(self, response: requests.Response) -> None:
+        """Keep the statement and input of a full task response, and the rest as the response
+        to revalidate with `payload=false` (the server leaves the payload out of the ETag)."""
+        scope = self._cache_scope()
+        data = response.json()
+        self.cache.put_task_payload(scope, data["id"], data.get("statement_version"), data.get("input"))
+        if data.get("statement_version") is not None and data.get("statement") is not None:
+            self.cache.put_statement(scope, data["type"], data["statement_version"], data["statement"])
+        etag = response.headers.get("ETag")
+        if etag is not None:
+            self.cache.put_response(scope, f"/tasks/{data['id']}?payload=false", etag,
+                                    json.dumps({**data, "statement": None, "input": None}))
+
+    def submit_task_answer(self, task_id: str, answer: str, retry_throttled: bool = True) -> Submission:
+        data = self._make_request("POST", f"/tasks/{task_id}/submission", {"answer": answer}, idempotent=True,
+                                  retry_throttled=retry_throttled)
         return Submission.model_validate(data)
 
     def get_submission_info(self, submit_id: str) -> Submission:
@@ -224,6 +302,31 @@ class ApiClient:
                    round_id: Optional[int] = None,
                    since: Optional[str] = None) -> TaskList:
         """List tasks with optional filters."""
+        query = self._task_filters(status, task_type, round_id, since)
+        data = self._make_request("GET", f"/tasks/{query}")
+        return TaskList.model_validate({"tasks": data})
+
+    def iter_tasks(self,
+                   status: Optional[str] = None,
+                   task_type: Optional[str] = None,
+                   round_id: Optional[int] = None,
+                   since: Optional[str] = None,
+                   page_size: int = TASK_PAGE_SIZE) -> Iterator[Task]:
+        """All tasks matching the filters, newest first, fetched a page at a time without statements and inputs.
+        Only one page is held in memory."""
+        query = self._task_filters(status, task_type, round_id, since, limit=str(page_size), payload="false")
+        before_id: int | None = None
+        while True:
+            page = self._make_request("GET", f"/tasks/{query}" + (f"&before_id={before_id}" if before_id else ""))
+            for data in page:
+                yield Task.model_validate(data)
+            if len(page) < page_size:
+                return
+            before_id = page[-1]["id"]
+
+    @staticmethod
+    def _task_filters(status: Optional[str], task_type: Optional[str], round_id: Optional[int],
+                      since: Optional[str], **extra: str) -> str:
         params = []
         if status:
             params.append(f"status={status}")
@@ -233,9 +336,8 @@ class ApiClient:
             params.append(f"round_id={round_id}")
         if since:
             params.append(f"since={since}")
-        query = ("?" + "&".join(params)) if params else ""
-        data = self._make_request("GET", f"/tasks/{query}")
-        return TaskList.model_validate({"tasks": data})
+        params.extend(f"{name}={value}" for name, value in extra.items())
+        return ("?" + "&".join(params)) if params else ""
 
     # Board-related methods
     def get_dashboard(self, round_id: Optional[int] = None) -> Dashboard:
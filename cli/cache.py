@@ -0,0 +1,95 @@
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_PATH = Path.home() / ".challenge" / "cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    scope TEXT NOT NULL, endpoint TEXT NOT NULL, etag TEXT NOT NULL, body TEXT NOT NULL,
+    PRIMARY KEY (scope, endpoint)
+);
+CREATE TABLE IF NOT EXISTS task_payloads (
+    scope TEXT NOT NULL, task_id INTEGER NOT NULL, statement_version TEXT, input TEXT,
+    PRIMARY KEY (scope, task_id)
+);
+CREATE TABLE IF NOT EXISTS statements (
+    scope TEXT NOT NULL, task_type TEXT NOT NULL, statement_version TEXT NOT NULL, statement TEXT NOT NULL,
+    PRIMARY KEY (scope, task_type, statement_version)
+);
+"""
+
+
+class LocalCache:
+    """SQLite cache of API data under ~/.challenge, separated by `scope` (server and API key).
+
+    Task inputs and statements never change once a task is claimed, so they are served from disk,
+    also offline. Other responses are kept with their ETag and revalidated with If-None-Match.
+    Cache failures are logged and treated as misses, the CLI works the same without the cache."""
+
+    def __init__(self, path: Path | None = None):
+        # Resolved on first use, so that CHALLENGE_CACHE_PATH can be set after import
+        self._path = path
+        self._connection: sqlite3.Connection | None = None
+        # One connection is shared by the threads of `task run`
+        self._lock = threading.RLock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            path = self._path or Path(os.environ.get("CHALLENGE_CACHE_PATH") or DEFAULT_CACHE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def get_response(self, scope: str, endpoint: str) -> tuple[str, str] | None:
+        """(ETag, body) of a cached response."""
+        row = self._fetch("SELECT etag, body FROM responses WHERE scope = ? AND endpoint = ?", scope, endpoint)
+        return None if row is None else (row[0], row[1])
+
+    def put_response(self, scope: str, endpoint: str, etag: str, body: str) -> None:
+        self._store("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", scope, endpoint, etag, body)
+
+    def get_task_payload(self, scope: str, task_id: int) -> tuple[str | None, str | None] | None:
+        """(statement version, input) of a task."""
+        row = self._fetch("SELECT statement_version, input FROM task_payloads WHERE scope = ? AND task_id = ?",
+                          scope, task_id)
+        return None if row is None else (row[0], row[1])
+
+    def put_task_payload(self, scope: str, task_id: int, statement_version: str | None, task_input: str | None) -> None:
+        self._store("INSERT OR REPLACE INTO task_payloads VALUES (?, ?, ?, ?)",
+                    scope, task_id, statement_version, task_input)
+
+    def get_statement(self, scope: str, task_type: str, statement_version: str) -> str | None:
+        row = self._fetch(
+            "SELECT statement FROM statements WHERE scope = ? AND task_type = ? AND statement_version = ?",
+            scope, task_type, statement_version
+        )
+        return None if row is None else str(row[0])
+
+    def put_statement(self, scope: str, task_type: str, statement_version: str, statement: str) -> None:
+        self._store("INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?)",
+                    scope, task_type, statement_version, statement)
+
+    def clear(self) -> None:
+        for table in ("responses", "task_payloads", "statements"):
+            self._store(f"DELETE FROM {table}")
+
+    def _fetch(self, sql: str, *params: object) -> tuple[Any, ...] | None:
+        try:
+            with self._lock:
+                row: tuple[Any, ...] | None = self._db().execute(sql, params).fetchone()
+            return row
+        except (sqlite3.Error, OSError) as e:
+            logging.info("Cache read failed: %s", e)
+            return None
+
+    def _store(self, sql: str, *params: object) -> None:
+        try:
+            with self._lock, self._db() as db:
+                db.execute(sql, params)
+        except (sqlite3.Error, OSError) as e:
+            logging.info("Cache write failed: %s", e)
@@ -2,13 +2,14 @@
 from typing import Optional
 
 import typer
-from rich.markdown import Markdown
 
 from cli.app_deps import api_client, console, ensure_logged_in, json_output_option
 from cli.formatter import print_as_json
+from cli.lazy_group import LazyTyperGroup
 from api_models import ChallengeUpdateRequest, Challenge
 
-app = typer.Typer(help="Teamwork Challenge CLI", pretty_exceptions_short=True, pretty_exceptions_show_locals=False)
+app = typer.Typer(cls=LazyTyperGroup, help="Teamwork Challenge CLI", pretty_exceptions_short=True,
+                  pretty_exceptions_show_locals=False)
 
 
 # Authentication commands
@@ -34,6 +35,13 @@ def logout() -> None:
     console.print("[green]Successfully logged out[/green]")
 
 
+@app.command("clear-cache")
+def clear_cache() -> None:
+    """Remove locally cached tasks, statements and rounds."""
+    api_client.cache.clear()
+    console.print("[green]Local cache cleared[/green]")
+
+
 @app.command("show")
 def show(
     challenge_id: Optional[int] = typer.Option(None, "--challenge-id", "-c", help="Challenge ID"),
@@ -124,4 +132,6 @@ def print_challenge(challenge: Challenge) -> None:
     console.print(f"Name: {challenge.title}")
     console.print(f"Current Round: {challenge.current_round_id}")
     console.print()
+    # Importing rich.markdown takes a noticeable part of the CLI startup, so only when needed
+    from rich.markdown import Markdown
     console.print(Markdown(challenge.description))
\ No newline at end of file
@@ -1,8 +1,10 @@
-from typing import Any
+from typing import Any, Iterable, Sequence
 
 from pydantic import BaseModel
 from rich.console import Console
+import csv
 import json
+import sys
 
 from rich.table import Table
 
@@ -14,6 +16,23 @@ def print_as_json(obj: Any) -> None:
     Console().print(json.dumps(d, indent=2))
 
 
+def print_ndjson(rows: Iterable[BaseModel]) -> None:
+    """One JSON object per line, written as rows arrive."""
+    for row in rows:
+        sys.stdout.write(row.model_dump_json() + "\n")
+        sys.stdout.flush()
+
+
+def print_csv(rows: Iterable[BaseModel], columns: Sequence[str]) -> None:
+    """CSV with a header row, written as rows arrive. Values are taken from the model fields named in `columns`."""
+    writer = csv.writer(sys.stdout)
+    writer.writerow(columns)
+    for row in rows:
+        data = row.model_dump(mode="json", include=set(columns))
+        writer.writerow(["" if data.get(column) is None else data[column] for column in columns])
+        sys.stdout.flush()
+
+
 def as_table(obj: Any) -> Table:
     table = Table(title=type(obj).__name__)
     table.add_column("Field", justify="left", style="cyan", no_wrap=True)
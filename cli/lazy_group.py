@@ -0,0 +1,29 @@
+import importlib
+from typing import Any
+
+import typer
+from typer.core import TyperGroup
+
+
+class LazyTyperGroup(TyperGroup):
+    """Command group that imports a sub-app module only when its command is run,
+    so that `challenge task submit` doesn't pay for importing every other sub-app."""
+
+    # Command name -> "module:attribute" of the Typer sub-app
+    sub_apps: dict[str, str] = {}
+
+    @classmethod
+    def register(cls, name: str, import_path: str) -> None:
+        cls.sub_apps[name] = import_path
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return [*super().list_commands(ctx), *(name for name in self.sub_apps if name not in self.commands)]
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Any:
+        if cmd_name not in self.commands and cmd_name in self.sub_apps:
+            module_name, attribute = self.sub_apps[cmd_name].split(":")
+            sub_app = getattr(importlib.import_module(module_name), attribute)
+            group = typer.main.get_group(sub_app)
+            group.name = cmd_name
+            self.add_command(group, cmd_name)
+        return super().get_command(ctx, cmd_name)
@@ -0,0 +1,255 @@
+"""Load driver that simulates competing teams: each team claims a task, polls it, submits an answer and repeats.
+
+Example (backend on 8918, generators from tasks/main.py on 8000):
+
+    python -m cli.load_driver --admin-key admin1 --teams 20 --duration 60 \\
+        --round 1 --generator-url http://127.0.0.1:8000 --type-mix a_plus_b=3,right_time=1 --output load.json
+"""
+import asyncio
+import bisect
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from api_models import RoundTaskTypeCreateRequest, SubmitAnswerRequest, TeamCreateRequest, TeamsImportRequest, \
+    TeamsImportResponse
+
+# Upper bounds of latency histogram buckets, ms
+HISTOGRAM_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+console = Console(width=120)
+load_app = typer.Typer(help="Simulate competing teams against a local backend")
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    throttled: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for latency in latencies:
+            histogram[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency)] += 1
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "p50_ms": cuts[49] if cuts else None,
+            "p95_ms": cuts[94] if cuts else None,
+            "p99_ms": cuts[98] if cuts else None,
+            "max_ms": latencies[-1] if latencies else None,
+            "histogram": {
+                f"<={bound}" if i < len(HISTOGRAM_BUCKETS_MS) else f">{HISTOGRAM_BUCKETS_MS[-1]}": histogram[i]
+                for i, bound in enumerate(HISTOGRAM_BUCKETS_MS + [0])
+            },
+        }
+
+
+class LoadDriver:
+    def __init__(self, client: httpx.AsyncClient, duration: float, think_time: float, polls: int,
+                 type_mix: dict[str, int], answer: str):
+        self.client = client
+        self.duration = duration
+        self.think_time = think_time
+        self.polls = polls
+        self.type_mix = type_mix
+        self.answer = answer
+        self.stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+
+    async def request(self, name: str, api_key: str, method: str, url: str,
+                      json_data: Optional[dict[str, Any]] = None) -> Optional[Any]:
+        """Send a request the way ApiClient does and record its latency. Returns the JSON body on success."""
+        headers = {"Content-Type": "application/json", "X-API-Key": api_key}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, json=json_data)
+        except httpx.HTTPError:
+            self.stats[name].latencies_ms.append((time.perf_counter() - started) * 1000)
+            self.stats[name].errors += 1
+            return None
+        self.stats[name].latencies_ms.append((time.perf_counter() - started) * 1000)
+        if response.status_code == 429:
+            self.stats[name].throttled += 1
+            return None
+        if response.status_code >= 400:
+            self.stats[name].errors += 1
+            return None
+        return response.json()
+
+    async def think(self) -> None:
+        if self.think_time > 0:
+            await asyncio.sleep(random.expovariate(1 / self.think_time))
+
+    def pick_task_type(self) -> Optional[str]:
+        if not self.type_mix:
+            return None
+        return random.choices(list(self.type_mix), weights=list(self.type_mix.values()), k=1)[0]
+
+    async def run_team(self, api_key: str, deadline: float) -> None:
+        iteration = 0
+        while time.monotonic() < deadline:
+            iteration += 1
+            task_type = self.pick_task_type()
+            params = f"?task_type={task_type}" if task_type else ""
+            task = await self.request("claim", api_key, "POST", f"/tasks{params}")
+            if task is not None:
+                for _ in range(self.polls):
+                    await self.think()
+                    await self.request("poll", api_key, "GET", f"/tasks/{task['id']}")
+                await self.think()
+                await self.request("submit", api_key, "POST", f"/tasks/{task['id']}/submission",
+                                   SubmitAnswerRequest(answer=self.answer).model_dump())
+            if iteration % 5 == 0:
+                await self.request("list", api_key, "GET", "/tasks")
+                await self.request("dashboard", api_key, "GET", "/dashboard")
+            await self.think()
+
+    async def run(self, team_keys: list[str]) -> float:
+        started = time.monotonic()
+        deadline = started + self.duration
+        await asyncio.gather(*(self.run_team(key, deadline) for key in team_keys))
+        return time.monotonic() - started
+
+
+def parse_type_mix(type_mix: str) -> dict[str, int]:
+    """Parse "a_plus_b=3,right_time=1" into weights by task type. A type without a weight gets 1."""
+    weights: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in type_mix.split(","))):
+        name, _, weight = item.partition("=")
+        weights[name] = int(weight) if weight else 1
+    return weights
+
+
+async def setup(client: httpx.AsyncClient, admin_key: str, challenge_id: int, teams: int,
+                round_id: Optional[int], generator_url: Optional[str], generator_secret: str,
+                task_types: list[str]) -> list[str]:
+    """Create load-test teams and, optionally, task types pointing at local generators. Returns team API keys."""
+    headers = {"X-API-Key": admin_key}
+    if round_id is not None and generator_url:
+        for task_type in task_types:
+            request = RoundTaskTypeCreateRequest(
+                round_id=round_id,
+                type=task_type,
+                generator_url=f"{generator_url.rstrip('/')}/{task_type}",
+                generator_secret=generator_secret,
+                max_tasks_per_team=1_000_000,
+                time_to_solve=24 * 60,
+            )
+            response = await client.post("/task-types", headers=headers, json=request.model_dump(mode="json"))
+            response.raise_for_status()
+
+    suffix = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    request_data = TeamsImportRequest(
+        challenge_id=challenge_id,
+        teams=[TeamCreateRequest(name=f"load-{suffix}-{i}", members="load driver", captain_contact="")
+               for i in range(teams)],
+    )
+    response = await client.post("/teams", headers=headers, json=request_data.model_dump(mode="json"))
+    response.raise_for_status()
+    return [team.api_key for team in TeamsImportResponse.model_validate(response.json()).teams]
+
+
+def print_report(report: dict[str, Any]) -> None:
+    table = Table(title=f"Load: {report['teams']} teams, {report['elapsed_s']:.1f} s, {report['rps']:.1f} req/s")
+    for column in ["Endpoint", "Requests", "Errors", "429", "p50 ms", "p95 ms", "p99 ms", "Max ms"]:
+        table.add_column(column, justify="left" if column == "Endpoint" else "right")
+
+    def ms(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+
+    for name, summary in report["endpoints"].items():
+        table.add_row(name, str(summary["requests"]), str(summary["errors"]), str(summary["throttled"]),
+                      ms(summary["p50_ms"]), ms(summary["p95_ms"]), ms(summary["p99_ms"]), ms(summary["max_ms"]))
+    console.print(table)
+
+    histogram = Table(title="Latency histogram (requests per bucket, ms)")
+    histogram.add_column("Endpoint")
+    buckets = list(next(iter(report["endpoints"].values()))["histogram"]) if report["endpoints"] else []
+    for bucket in buckets:
+        histogram.add_column(bucket, justify="right")
+    for name, summary in report["endpoints"].items():
+        histogram.add_row(name, *(str(count) for count in summary["histogram"].values()))
+    console.print(histogram)
+
+
+@load_app.command()
+def run(
+    base_url: str = typer.Option("http://127.0.0.1:8918", "--base-url", help="Backend URL"),
+    teams: int = typer.Option(20, "--teams", "-n", help="Number of simulated teams"),
+    duration: float = typer.Option(60.0, "--duration", "-d", help="Test duration, seconds"),
+    think_time: float = typer.Option(0.5, "--think-time", help="Mean pause between a team's requests, seconds"),
+    polls: int = typer.Option(2, "--polls", help="GET /tasks/{id} calls between claim and submit"),
+    type_mix: str = typer.Option("", "--type-mix", help="Claim weights by type, e.g. a_plus_b=3,right_time=1"),
+    answer: str = typer.Option("0", "--answer", help="Answer submitted for every task"),
+    team_keys: str = typer.Option("", "--team-keys", help="Comma-separated API keys of existing teams"),
+    admin_key: Optional[str] = typer.Option(None, "--admin-key", help="Admin API key to create load-test teams"),
+    challenge_id: int = typer.Option(1, "--challenge", "-c", help="Challenge for created teams"),
+    round_id: Optional[int] = typer.Option(None, "--round", "-r", help="Round for task types created for --type-mix"),
+    generator_url: Optional[str] = typer.Option(None, "--generator-url",
+                                                help="Base URL of tasks/main.py to create task types for --type-mix"),
+    generator_secret: str = typer.Option("", "--generator-secret", help="Secret of the local generators"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Random seed for reproducible think times and mix"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write the report as JSON"),
+) -> None:
+    """Run claim/poll/submit loops for N teams and report latency, errors and 429s per endpoint."""
+    if seed is not None:
+        random.seed(seed)
+    mix = parse_type_mix(type_mix)
+
+    async def main() -> dict[str, Any]:
+        limits = httpx.Limits(max_connections=teams * 2, max_keepalive_connections=teams * 2)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+            keys = [key for key in team_keys.split(",") if key]
+            if not keys:
+                if admin_key is None:
+                    console.print("[red]Either --team-keys or --admin-key must be provided[/red]")
+                    raise typer.Exit(1)
+                keys = await setup(client, admin_key, challenge_id, teams, round_id, generator_url,
+                                   generator_secret, list(mix))
+            driver = LoadDriver(client, duration, think_time, polls, mix, answer)
+            started_at = datetime.now(timezone.utc)
+            elapsed = await driver.run(keys)
+
+        endpoints = {name: stats.summary() for name, stats in sorted(driver.stats.items())}
+        total_requests = sum(stats.requests for stats in driver.stats.values())
+        return {
+            "started_at": started_at.isoformat(),
+            "base_url": base_url,
+            "teams": len(keys),
+            "duration_s": duration,
+            "think_time_s": think_time,
+            "type_mix": mix,
+            "elapsed_s": elapsed,
+            "requests": total_requests,
+            "rps": total_requests / elapsed if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+    report = asyncio.run(main())
+    print_report(report)
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2))
+        console.print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    load_app()
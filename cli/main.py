@@ -1,18 +1,15 @@
 #!/usr/bin/env python3
-from cli.board_app import board_app
-from cli.round_app import round_app
-from cli.task_app import task_app
-from cli.task_type_app import task_type_app
-from cli.team_app import team_app
 from cli.challenge_app import app
+from cli.lazy_group import LazyTyperGroup
 
 __all__ = ["app"]
 
-app.add_typer(team_app, name="team")
-app.add_typer(round_app, name="round")
-app.add_typer(task_app, name="task")
-app.add_typer(task_type_app, name="task-type")
-app.add_typer(board_app, name="board")
+# Sub-apps are imported on first use, see LazyTyperGroup
+LazyTyperGroup.register("team", "cli.team_app:team_app")
+LazyTyperGroup.register("round", "cli.round_app:round_app")
+LazyTyperGroup.register("task", "cli.task_app:task_app")
+LazyTyperGroup.register("task-type", "cli.task_type_app:task_type_app")
+LazyTyperGroup.register("board", "cli.board_app:board_app")
 
 if __name__ == "__main__":
     app()
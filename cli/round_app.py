@@ -2,7 +2,7 @@ import typer
 from typing import Optional
 from rich.table import Table
 from datetime import datetime
-from api_models import Round, RoundCreateRequest, RoundStatus, RoundUpdateRequest
+from api_models import Round, RoundCreateRequest, RoundStatus, RoundUpdateRequest, RejudgeJob
 from cli.formatter import print_as_json
 from cli.app_deps import api_client, json_output_option, console, ensure_logged_in
 
@@ -18,6 +18,14 @@ def display_round_details(round_info: Round) -> None:
     console.print(f"Score Decay: {round_info.score_decay}")
 
 
+def display_rejudge_job(job: RejudgeJob) -> None:
+    console.print(f"[bold]Re-judge job {job.id} (Round {job.round_id}):[/bold] {job.status}")
+    console.print(f"Processed: {job.processed}/{job.total}")
+    console.print(f"Changed verdicts: {job.changed}")
+    if job.error:
+        console.print(f"[red]Error: {job.error}[/red]")
+
+
 # Round commands
 @round_app.command("show")
 def round_show(
@@ -62,7 +70,7 @@ def round_create(
     end_time: str = typer.Option(..., "--end-time", help="End time (ISO format)"),
     claim_by_type: bool = typer.Option(False, "--claim-by-type", help="Allow claiming tasks by type"),
     allow_resubmit: bool = typer.Option(False, "--allow-resubmit", help="Allow resubmitting answers"),
-    score_decay: str = typer.Option("no", "--score-decay", help="Score decay type"),
+    score_decay: str = typer.Option("no", "--score-decay", help="Score decay (no, linear, exponential, step)"),
     status: str = typer.Option("draft", "--status", "-s", help="Round status (draft, published)"),
     json: bool = json_output_option
 ) -> None:
@@ -139,7 +147,7 @@ def round_update(
     end_time: Optional[str] = typer.Option(None, "--end-time", help="End time (ISO format)"),
     claim_by_type: Optional[str] = typer.Option(None, "--claim-by-type", help="Allow claiming tasks by type"),
     allow_resubmit: Optional[str] = typer.Option(None, "--allow-resubmit", help="Allow resubmitting answers"),
-    score_decay: Optional[str] = typer.Option(None, "--score-decay", help="Score decay type"),
+    score_decay: Optional[str] = typer.Option(None, "--score-decay", help="Score decay (no, linear, exponential, step)"),
     json: bool = json_output_option
 ) -> None:
     """Update round information."""
@@ -201,3 +209,45 @@ def round_delete(
     console.print(f"[bold green]Round {round_id} deleted successfully![/bold green]")
 
     return None
+
+
+@round_app.command("rejudge")
+def round_rejudge(
+    round_id: Optional[int] = typer.Option(None, "--round", "-r", help="Round ID"),
+    resume: Optional[int] = typer.Option(None, "--resume", help="Resume a paused or failed re-judge job by ID"),
+    json: bool = json_output_option
+) -> None:
+    """Re-check all submissions of a round and recompute scores."""
+    ensure_logged_in()
+
+    if resume is not None:
+        job = api_client.resume_rejudge_job(resume)
+    elif round_id is not None:
+        job = api_client.start_rejudge(round_id)
+    else:
+        console.print("[red]Either --round or --resume must be provided[/red]")
+        raise typer.Exit(1)
+
+    if json:
+        return print_as_json(job)
+
+    display_rejudge_job(job)
+    console.print(f"Track progress with: challenge round rejudge-status {job.id}")
+    return None
+
+
+@round_app.command("rejudge-status")
+def round_rejudge_status(
+    job_id: int = typer.Argument(..., help="Re-judge job ID"),
+    json: bool = json_output_option
+) -> None:
+    """Show progress of a re-judge job."""
+    ensure_logged_in()
+
+    job = api_client.get_rejudge_job(job_id)
+
+    if json:
+        return print_as_json(job)
+
+    display_rejudge_job(job)
+    return None
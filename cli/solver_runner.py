@@ -0,0 +1,217 @@
+import logging
+import os
+import shlex
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional, TypeVar
+
+import requests
+
+from api_models import SubmissionStatus, Task
+from cli.api_client import ApiClient
+
+T = TypeVar("T")
+
+# Limits of the pause between requests that the runner adapts to 429 responses
+MAX_BACKOFF = 30.0
+MIN_BACKOFF = 0.05
+
+
+@dataclass
+class RunStats:
+    claimed: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    solver_failed: int = 0
+    submit_failed: int = 0
+    throttled: int = 0
+    stop_reason: str = ""
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict[str, int | str]:
+        return {
+            "claimed": self.claimed, "accepted": self.accepted, "rejected": self.rejected,
+            "solver_failed": self.solver_failed, "submit_failed": self.submit_failed, "throttled": self.throttled,
+            "stop_reason": self.stop_reason,
+        }
+
+
+class AdaptiveBackoff:
+    """Pause shared by all workers: doubled on every 429 (or set by Retry-After) and shrunk on success,
+    so that the runner settles just under the team's rate limit."""
+
+    def __init__(self) -> None:
+        self._delay = 0.0
+        self._next_request = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            request_at = max(self._next_request, now)
+            self._next_request = request_at + self._delay
+        if request_at > now:
+            time.sleep(request_at - now)
+
+    def throttled(self, retry_after: Optional[float]) -> None:
+        with self._lock:
+            self._delay = min(MAX_BACKOFF, max(MIN_BACKOFF, self._delay * 2, retry_after or 0.0))
+            self._next_request = time.monotonic() + self._delay
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._delay = 0.0 if self._delay < MIN_BACKOFF else self._delay * 0.8
+
+
+class SolverRunner:
+    """Claims tasks, pipes each input to a solver command and submits its output, keeping `parallel`
+    tasks in flight. Stops when `count` tasks are claimed, when the dashboard has no tasks left,
+    when the server refuses to give out more tasks or rejects the API key. A submission rejected
+    for its task only (too late, a resubmission) is counted and the runner moves on."""
+
+    def __init__(self, api_client: ApiClient, solver: str, task_type: Optional[str] = None, parallel: int = 1,
+                 count: Optional[int] = None, solver_timeout: float = 60.0,
+                 on_result: Callable[[Task, str], None] | None = None):
+        self.api_client = api_client
+        self.solver = shlex.split(solver)
+        self.task_type = task_type
+        self.parallel = max(1, parallel)
+        self.count = count
+        self.solver_timeout = solver_timeout
+        self.on_result = on_result or (lambda task, result: None)
+        self.stats = RunStats()
+        self.backoff = AdaptiveBackoff()
+        self._budget = 0
+        self._budget_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self) -> RunStats:
+        self._budget = self._remaining_tasks()
+        if self._budget <= 0:
+            self.stats.stop_reason = "no tasks remaining"
+            return self.stats
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            for _ in range(self.parallel):
+                executor.submit(self._work)
+        if not self.stats.stop_reason:
+            self.stats.stop_reason = "done"
+        return self.stats
+
+    def _remaining_tasks(self) -> int:
+        stats = self.api_client.get_dashboard().stats
+        if self.task_type is not None:
+            remaining = stats[self.task_type].remaining if self.task_type in stats else 0
+        else:
+            remaining = sum(type_stats.remaining for type_stats in stats.values())
+        return remaining if self.count is None else min(remaining, self.count)
+
+    def _take_from_budget(self) -> bool:
+        with self._budget_lock:
+            if self._budget <= 0:
+                return False
+            self._budget -= 1
+            return True
+
+    def _work(self) -> None:
+        try:
+            while not self._stop.is_set() and self._take_from_budget():
+                try:
+                    task = self._call(lambda: self.api_client.claim_task(self.task_type, retry_throttled=False))
+                except requests.HTTPError as e:
+                    # Out of tasks, round over or a rejected key: nothing to gain from more attempts
+                    self._halt(_describe(e))
+                    return
+                if task is None:
+                    return
+                self.stats.add(claimed=1)
+
+                answer = self._solve(task)
+                if answer is None:
+                    self.stats.add(solver_failed=1)
+                    self.on_result(task, "solver failed")
+                    continue
+
+                try:
+                    submission = self._call(
+                        lambda: self.api_client.submit_task_answer(str(task.id), answer, retry_throttled=False)
+                    )
+                except requests.HTTPError as e:
+                    if e.response is not None and e.response.status_code in (401, 403):
+                        self._halt(_describe(e))
+                        return
+                    # Only this task is affected, e.g. the solver took longer than the time to solve
+                    self.stats.add(submit_failed=1)
+                    self.on_result(task, f"submit failed: {_describe(e)}")
+                    continue
+                if submission is None:
+                    return
+                accepted = submission.status == SubmissionStatus.AC
+                self.stats.add(accepted=int(accepted), rejected=int(not accepted))
+                self.on_result(task, str(submission.status))
+        except Exception as e:
+            logging.exception("Solver runner worker failed")
+            self._halt(f"error: {e}")
+
+    def _call(self, request: Callable[[], T]) -> Optional[T]:
+        """Run a claim or submit, waiting out 429 responses. Returns None when the runner is stopped,
+        other HTTP errors are raised. The client doesn't retry 429s of these requests itself,
+        so the shared backoff sees every one of them."""
+        while not self._stop.is_set():
+            self.backoff.wait()
+            try:
+                result = request()
+            except requests.HTTPError as e:
+                response = e.response
+                if response is None or response.status_code != 429:
+                    raise
+                self.stats.add(throttled=1)
+                retry_after = response.headers.get("Retry-After")
+                self.backoff.throttled(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                continue
+            self.backoff.succeeded()
+            return result
+        return None
+
+    def _solve(self, task: Task) -> Optional[str]:
+        # The input is passed and the answer read in one piece: solvers print a single answer,
+        # and buffering keeps stdout and stderr of parallel solvers apart
+        env = {
+            **os.environ,
+            "CHALLENGE_TASK_ID": str(task.id),
+            "CHALLENGE_TASK_TYPE": task.type,
+            "CHALLENGE_STATEMENT_VERSION": task.statement_version or "",
+        }
+        try:
+            result = subprocess.run(self.solver, input=task.input or "", capture_output=True, text=True,
+                                    timeout=self.solver_timeout, env=env)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logging.warning("Solver failed on task %s: %s", task.id, e)
+            return None
+        if result.returncode != 0:
+            logging.warning("Solver exited with %s on task %s: %s", result.returncode, task.id, result.stderr)
+            return None
+        return result.stdout
+
+    def _halt(self, reason: str) -> None:
+        if not self._stop.is_set():
+            self.stats.stop_reason = reason
+            self._stop.set()
+
+
+def _describe(error: requests.HTTPError) -> str:
+    response = error.response
+    if response is None:
+        return str(error)
+    try:
+        detail = response.json().get("detail", response.text)
+    except ValueError:
+        detail = response.text
+    return f"{response.status_code} {str(detail)[:200]}"
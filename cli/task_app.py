@@ -1,12 +1,15 @@
 import typer
 from pathlib import Path
 from cli.app_deps import api_client, json_output_option, console, ensure_logged_in
-from cli.formatter import print_as_json
+from cli.formatter import print_as_json, print_csv, print_ndjson
 from typing import Optional
 from rich.table import Table
+from api_models import Task
 
 task_app = typer.Typer(help="Task management commands")
 
+TASK_CSV_COLUMNS = ["id", "type", "status", "score", "claimed_at", "last_attempt_at", "solved_at"]
+
 
 @task_app.command("claim")
 def claim(
@@ -135,6 +138,45 @@ def task_submit(
     return None
 
 
+@task_app.command("run")
+def task_run(
+    solver: str = typer.Option(..., "--solver", help="Command that reads a task input on stdin and prints the answer. "
+                               "Input and output are passed whole, not streamed"),
+    task_type: Optional[str] = typer.Option(None, "--type", "-t", help="Task type to claim"),
+    parallel: int = typer.Option(1, "--parallel", "-p", help="Tasks in flight at once"),
+    count: Optional[int] = typer.Option(None, "--count", "-n", help="Stop after claiming this many tasks"),
+    solver_timeout: float = typer.Option(60.0, "--timeout", help="Seconds the solver may run per task"),
+    json: bool = json_output_option
+) -> None:
+    """Claim tasks, solve them with the solver command and submit the answers.
+
+    The solver gets the task input on stdin and CHALLENGE_TASK_ID, CHALLENGE_TASK_TYPE and
+    CHALLENGE_STATEMENT_VERSION in its environment. Runs until the dashboard has no tasks left,
+    --count tasks are claimed, the server stops giving out tasks or rejects the API key; 429 responses
+    slow the runner down. A submission rejected for its task only is counted and the runner moves on.
+    """
+    ensure_logged_in()
+    from cli.solver_runner import SolverRunner
+
+    def report(task: Task, result: str) -> None:
+        if not json:
+            console.print(f"Task {task.id} ({task.type}): {result}")
+
+    runner = SolverRunner(api_client, solver, task_type=task_type, parallel=parallel, count=count,
+                          solver_timeout=solver_timeout, on_result=report)
+    stats = runner.run()
+
+    if json:
+        return print_as_json(stats.as_dict())
+
+    console.print(f"[bold]Claimed:[/bold] {stats.claimed}, [green]accepted: {stats.accepted}[/green], "
+                  f"[red]rejected: {stats.rejected}[/red], solver failed: {stats.solver_failed}, "
+                  f"submit failed: {stats.submit_failed}, throttled: {stats.throttled}")
+    console.print(f"Stopped: {stats.stop_reason}")
+
+    return None
+
+
 @task_app.command("show-answer")
 def task_show_answer(submit_id: str, json: bool = json_output_option) -> None:
     """Show raw submitted answer."""
@@ -155,11 +197,25 @@ def task_list(
     round_id: Optional[int] = typer.Option(None, "--round", "-r", help="Filter by round ID"),
     since: Optional[str] = typer.Option(None, "--since", help="Show tasks since specified time"),
     watch: bool = typer.Option(False, "--watch", help="Watch for updates"),
+    output_format: str = typer.Option("table", "--format", "-f",
+                                      help="table (last tasks), or ndjson / csv streaming all matching tasks"),
     json: bool = json_output_option
 ) -> None:
     """List tasks."""
     ensure_logged_in()
 
+    if output_format in ("ndjson", "csv"):
+        # Pages are printed as they arrive, so exporting thousands of tasks takes constant memory
+        tasks_iter = api_client.iter_tasks(status=status, task_type=task_type, round_id=round_id, since=since)
+        if output_format == "ndjson":
+            print_ndjson(tasks_iter)
+        else:
+            print_csv(tasks_iter, TASK_CSV_COLUMNS)
+        return None
+    if output_format != "table":
+        console.print(f"[red]Unknown format: {output_format}, expected table, ndjson or csv[/red]")
+        raise typer.Exit(1)
+
     # Fetch tasks with optional filters
     tasks = api_client.list_tasks(
         status=status,
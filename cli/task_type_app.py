@@ -3,7 +3,7 @@ from cli.app_deps import api_client, json_output_option, console, ensure_logged_
 from typing import Optional
 from rich.table import Table
 from cli.formatter import print_as_json
-from api_models import RoundTaskTypeCreateRequest, RoundTaskType
+from api_models import RoundTaskTypeCreateRequest, RoundTaskTypeUpdateRequest, RoundTaskType
 
 task_type_app = typer.Typer(help="Task type management")
 
@@ -20,6 +20,7 @@ def display_task_type_details(task_type: RoundTaskType, success_message: str, js
         f"{task_type.max_tasks_per_team if task_type.max_tasks_per_team is not None else 'N/A'}"
     )
     console.print(f"[bold]Time to Solve:[/bold] {task_type.time_to_solve} minutes")
+    console.print(f"[bold]Cache Verdicts:[/bold] {task_type.cache_verdicts}")
     console.print(f"[bold]Generator URL:[/bold] {task_type.generator_url}")
 
     return None
@@ -79,6 +80,7 @@ def task_type_show(
         f"{task_type.max_tasks_per_team if task_type.max_tasks_per_team is not None else 'N/A'}"
     )
     console.print(f"[bold]Time[/bold] {task_type.time_to_solve} minutes")
+    console.print(f"[bold]Cache Verdicts[/bold] {task_type.cache_verdicts}")
     return None
 
 
@@ -91,6 +93,8 @@ def task_type_create(
     generator_secret: str = typer.Option(..., "--generator-secret", help="Generator secret"),
     max_tasks_per_team: Optional[int] = typer.Option(None, "--max-tasks", "-m", help="Maximum tasks per team"),
     time_to_solve: int = typer.Option(60, "--time-to-solve", help="Time limit to solve the task in min (def: 60)"),
+    cache_verdicts: bool = typer.Option(False, "--cache-verdicts",
+                                        help="Reuse the verdict of a repeated answer (checker must not depend on time)"),
     json: bool = json_output_option
 ) -> None:
     """Create a new task type."""
@@ -103,7 +107,8 @@ def task_type_create(
         generator_settings=generator_settings,
         generator_secret=generator_secret,
         max_tasks_per_team=max_tasks_per_team,
-        time_to_solve=time_to_solve
+        time_to_solve=time_to_solve,
+        cache_verdicts=cache_verdicts
     )
 
     task_type = api_client.create_round_task_type(task_type_data)
@@ -126,6 +131,7 @@ def task_type_update(
     generator_secret: Optional[str] = typer.Option(None, "--generator-secret", help="Generator secret"),
     max_tasks_per_team: Optional[int] = typer.Option(None, "--max-tasks", "-m", help="Maximum tasks per team"),
     time_to_solve: Optional[int] = typer.Option(None, "--time-to-solve", help="Time limit to solve the task in min"),
+    cache_verdicts: Optional[str] = typer.Option(None, "--cache-verdicts", help="Reuse the verdict of a repeated answer"),
     json: bool = json_output_option
 ) -> None:
     """Update an existing task type."""
@@ -133,14 +139,16 @@ def task_type_update(
 
     current_task_type = api_client.get_round_task_type(task_type_id)
 
-    task_type_data = RoundTaskTypeCreateRequest(
+    task_type_data = RoundTaskTypeUpdateRequest(
         round_id=current_task_type.round_id,
         type=type_name if type_name is not None else current_task_type.type,
         generator_url=generator_url if generator_url is not None else current_task_type.generator_url,
         generator_settings=generator_settings if generator_settings is not None else current_task_type.generator_settings,
         generator_secret=generator_secret if generator_secret is not None else current_task_type.generator_secret,
         max_tasks_per_team=max_tasks_per_team if max_tasks_per_team is not None else current_task_type.max_tasks_per_team,
-        time_to_solve=time_to_solve if time_to_solve is not None else current_task_type.time_to_solve
+        time_to_solve=time_to_solve if time_to_solve is not None else current_task_type.time_to_solve,
+        # Unchanged unless given
+        cache_verdicts=cache_verdicts.lower() in ["true", "1", "yes", "y"] if cache_verdicts is not None else None
     )
 
     task_type = api_client.update_round_task_type(task_type_id, task_type_data)
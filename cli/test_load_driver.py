@@ -0,0 +1,19 @@
+from cli.load_driver import EndpointStats, parse_type_mix
+
+
+def test_parse_type_mix() -> None:
+    assert parse_type_mix("a_plus_b=3, right_time") == {"a_plus_b": 3, "right_time": 1}
+    assert parse_type_mix("") == {}
+
+
+def test_endpoint_stats_summary() -> None:
+    stats = EndpointStats(latencies_ms=[float(ms) for ms in range(1, 101)], errors=5, throttled=2)
+    summary = stats.summary()
+    assert summary["requests"] == 100
+    assert summary["error_rate"] == 0.05
+    assert summary["throttled"] == 2
+    assert round(summary["p50_ms"]) == 50
+    assert round(summary["p99_ms"]) == 99
+    assert summary["histogram"]["<=5"] == 5
+    assert summary["histogram"]["<=100"] == 50
+    assert sum(summary["histogram"].values()) == 100
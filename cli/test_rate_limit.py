@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
+import json
 import os
 import sys
 import time
 import subprocess
+from pathlib import Path
 from typing import Iterator
 
 import pytest
@@ -88,3 +90,124 @@ def test_rate_limit_window_resets(rate_limited_server: None) -> None:
     for i in range(3):
         resp = requests.get(BASE_URL + "/", allow_redirects=False, timeout=2)
         assert resp.status_code != 429, f"Unexpected 429 on request {i+1} after window reset"
+
+
+TEAM_RATE_LIMIT_PORT = 8921
+TEAM_BASE_URL = f"http://127.0.0.1:{TEAM_RATE_LIMIT_PORT}"
+
+
+@pytest.fixture()
+def team_rate_limited_server() -> Iterator[None]:
+    env = os.environ.copy()
+    env["CHALLENGE_TEAM_RATE_LIMIT"] = "4/minute"
+    env["CHALLENGE_IP_RATE_LIMIT"] = "8/minute"
+
+    proc = subprocess.Popen([
+        "uvicorn", "back.main:app", "--port", str(TEAM_RATE_LIMIT_PORT)
+    ], cwd="..", env=env)
+
+    try:
+        _wait_endpoint_up(TEAM_BASE_URL, timeout=10.0)
+        yield
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:  # pragma: no cover
+            proc.kill()
+
+
+def test_team_rate_limit_per_key_and_route_class(team_rate_limited_server: None) -> None:
+    def get_auth(api_key: str) -> Response:
+        return requests.get(TEAM_BASE_URL + "/auth", headers={"X-API-Key": api_key}, timeout=2)
+
+    # Reads cost 1 token of 4
+    responses = [get_auth("team1") for _ in range(5)]
+    assert all(resp.status_code == 200 for resp in responses[:4])
+    assert responses[4].status_code == 429
+    assert int(responses[4].headers["Retry-After"]) > 0
+
+    # Other teams have their own buckets
+    assert get_auth("team2").status_code == 200
+
+    # Claims cost 2 tokens and don't share the bucket with reads
+    claims = [requests.post(TEAM_BASE_URL + "/tasks", headers={"X-API-Key": "team1"}, timeout=5) for _ in range(3)]
+    assert all(resp.status_code != 429 for resp in claims[:2])
+    assert claims[2].status_code == 429
+
+
+def test_rotating_keys_share_the_ip_bucket(team_rate_limited_server: None) -> None:
+    # A new unknown key with every request gets a fresh key bucket, but the client IP runs out after 8 reads,
+    # one of which went to the startup check on /docs
+    responses = [requests.get(TEAM_BASE_URL + "/auth", headers={"X-API-Key": f"guess-{i}"}, timeout=2)
+                 for i in range(8)]
+    assert all(resp.status_code == 401 for resp in responses[:7])
+    assert responses[7].status_code == 429
+
+
+class FakeSession:
+    """Answers claims with `throttled` 429 responses before giving out tasks 1, 2, ..., submissions are accepted
+    except for the tasks in `too_late`."""
+
+    def __init__(self, throttled: int, remaining: int = 1, too_late: tuple[int, ...] = ()):
+        self.throttled = throttled
+        self.remaining = remaining
+        self.too_late = too_late
+        self.claims = 0
+        self.tasks = 0
+
+    def request(self, method: str, url: str, **kwargs: object) -> Response:
+        if url.endswith("/dashboard"):
+            return _json_response(200, {"round_id": 1, "stats": {"a_plus_b": {
+                "pending": 0, "ac": 0, "wa": 0, "remaining": self.remaining}}})
+        if method == "POST" and url.endswith("/tasks"):
+            self.claims += 1
+            if self.claims <= self.throttled:
+                return _json_response(429, {"detail": "Too many requests"}, {"Retry-After": "0"})
+            self.tasks += 1
+            return _json_response(200, {"id": self.tasks, "title": "Task", "type": "a_plus_b", "score": 100,
+                                        "input": "1 2"})
+        task_id = int(url.split("/")[-2])
+        if task_id in self.too_late:
+            return _json_response(400, {"detail": "Time limit exceeded"})
+        return _json_response(200, {"id": task_id, "status": "ac", "submitted_at": "2025-01-01T00:00:00Z"})
+
+
+def _json_response(status_code: int, data: object, headers: dict[str, str] | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode()
+    response.headers.update(headers or {})
+    return response
+
+
+def test_solver_runner_sees_every_429(tmp_path: Path) -> None:
+    from cli.api_client import ApiClient
+    from cli.cache import LocalCache
+    from cli.config_manager import ConfigManager
+    from cli.solver_runner import SolverRunner
+
+    client = ApiClient(ConfigManager(tmp_path / "config.json"), LocalCache(tmp_path / "cache.sqlite"))
+    session = FakeSession(throttled=2)
+    client._session = session  # type: ignore[assignment]
+    runner = SolverRunner(client, f"{sys.executable} -c \"print(3)\"", count=1)
+    stats = runner.run()
+
+    # Every 429 reaches the runner's shared backoff instead of being retried inside the client
+    assert (stats.claimed, stats.accepted, stats.throttled) == (1, 1, 2)
+    assert session.claims == 3
+
+
+def test_solver_runner_moves_on_after_a_rejected_submission(tmp_path: Path) -> None:
+    from cli.api_client import ApiClient
+    from cli.cache import LocalCache
+    from cli.config_manager import ConfigManager
+    from cli.solver_runner import SolverRunner
+
+    client = ApiClient(ConfigManager(tmp_path / "config.json"), LocalCache(tmp_path / "cache.sqlite"))
+    client._session = FakeSession(throttled=0, remaining=3, too_late=(1,))  # type: ignore[assignment]
+    stats = SolverRunner(client, f"{sys.executable} -c \"print(3)\"").run()
+
+    # The first task was submitted too late, the other two are still solved
+    assert (stats.claimed, stats.submit_failed, stats.accepted) == (3, 1, 2)
+    assert stats.stop_reason == "done"
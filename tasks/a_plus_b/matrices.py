@@ -0,0 +1,81 @@
+"""Matrices of the a_plus_b task, generated, formatted, summed and compared as NumPy arrays,
+so that a 500x500 matrix takes milliseconds instead of a Python loop per cell."""
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from tasks.seeding import ensure_rng
+
+Matrix = npt.NDArray[np.int64]
+
+MIN_SIZE = 2
+# Largest matrix size per level, matrices first appear at level 5
+MAX_SIZE_BY_LEVEL = {5: 5, 6: 20, 7: 100, 8: 500}
+MAX_CELL = 10
+
+# Text of every value a cell of a generated matrix or of a sum of two can have, formatting looks cells up here
+_CELL_TEXT = np.array([str(value) for value in range(2 * MAX_CELL + 1)], dtype=object)
+
+# Brackets, commas and semicolons of "[[1, 2], [3, 4]]" or "1,2;3,4" answers are read as separators
+_SEPARATORS = str.maketrans("[](),;", "      ")
+
+
+def matrix_size(level: int, rng: Optional[random.Random] = None) -> int:
+    max_size = MAX_SIZE_BY_LEVEL.get(min(level, max(MAX_SIZE_BY_LEVEL)), MIN_SIZE)
+    return ensure_rng(rng).randint(MIN_SIZE, max(MIN_SIZE, max_size))
+
+
+def gen_matrix(size: int, rng: Optional[random.Random] = None) -> Matrix:
+    """Square matrix of integers from 0 to MAX_CELL, drawn in one call from a NumPy generator seeded by `rng`."""
+    numpy_rng = np.random.default_rng(ensure_rng(rng).getrandbits(64))
+    return numpy_rng.integers(0, MAX_CELL, size=(size, size), endpoint=True, dtype=np.int64)
+
+
+def format_matrix(matrix: Matrix) -> str:
+    """One row per line, cells separated by spaces."""
+    if matrix.size and 0 <= matrix.min() and matrix.max() < len(_CELL_TEXT):
+        rows = _CELL_TEXT[matrix].tolist()
+    else:
+        rows = [map(str, row) for row in matrix.tolist()]
+    return "\n".join(" ".join(row) for row in rows)
+
+
+def parse_matrix(text: str, shape: Optional[Tuple[int, ...]] = None) -> Optional[Matrix]:
+    """Matrix from rows of numbers, a nested list or any other layout of whitespace, commas and brackets.
+    Without `shape` every inner list or else every non-empty line is a row.
+    Returns None if the text is not a matrix of that shape."""
+    lines = [line for line in text.translate(_SEPARATORS).splitlines() if line.strip()]
+    try:
+        cells = np.array(" ".join(lines).split(), dtype=np.int64)
+    except (ValueError, OverflowError):
+        return None
+    if shape is None:
+        rows = text.count("[") - 1 if text.lstrip().startswith("[[") else len(lines)
+        if rows <= 0:
+            return None
+        shape = (rows, cells.size // rows)
+    if cells.size != int(np.prod(shape)):
+        return None
+    return cells.reshape(shape)
+
+
+def is_matrix_hint(hint: str) -> bool:
+    # Hints of tasks generated before the switch to NumPy are nested lists
+    return "\n" in hint.strip() or hint.lstrip().startswith("[[")
+
+
+def check_matrix(answer: str, hint: str) -> Optional[str]:
+    """Error message if the answer is not the expected matrix, None if it is."""
+    expected = parse_matrix(hint)
+    if expected is None:
+        raise ValueError("Checker hint is not a matrix")
+    actual = parse_matrix(answer, expected.shape)
+    if actual is None:
+        return f"Expected a {expected.shape[0]}x{expected.shape[1]} matrix of integers"
+    wrong = np.argwhere(actual != expected)
+    if wrong.size:
+        row, column = wrong[0]
+        return f"{len(wrong)} wrong cells, the first one at row {row + 1}, column {column + 1}"
+    return None
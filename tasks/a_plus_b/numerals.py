@@ -0,0 +1,205 @@
+"""Numeral systems of the a_plus_b task: Fibonacci (Zeckendorf), Roman and English words, in both directions.
+
+Tables are built once at import and conversions are cached, so that a level 8 task, or a batch of them,
+doesn't rebuild Fibonacci lists or call num2words per number. `python -m tasks.a_plus_b.numerals` prints
+the cost of every conversion.
+"""
+import bisect
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+
+def _fibonacci(count: int) -> Tuple[int, ...]:
+    numbers = [1, 2]
+    while len(numbers) < count:
+        numbers.append(numbers[-1] + numbers[-2])
+    return tuple(numbers)
+
+
+# Values of the Zeckendorf digits from the right: 1, 2, 3, 5, 8, ... far past the largest generated number
+FIBONACCI = _fibonacci(200)
+FIBONACCI_SUFFIX = "_F"
+
+ROMAN_NUMERALS = (
+    (1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'), (90, 'XC'),
+    (50, 'L'), (40, 'XL'), (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')
+)
+ROMAN_VALUES = {symbol: value for value, symbol in ROMAN_NUMERALS if len(symbol) == 1}
+MAX_ROMAN = 4999
+
+ONES = ("zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen sixteen "
+        "seventeen eighteen nineteen").split()
+TENS = "_ _ twenty thirty forty fifty sixty seventy eighty ninety".split()
+SCALES = "_ thousand million billion trillion quadrillion quintillion sextillion septillion octillion nonillion " \
+         "decillion".split()
+WORD_VALUES: Dict[str, int] = {
+    **{word: value for value, word in enumerate(ONES)},
+    **{word: value * 10 for value, word in enumerate(TENS) if value >= 2},
+}
+SCALE_VALUES = {word: 1000 ** power for power, word in enumerate(SCALES) if power}
+
+Number = Union[int, complex]
+
+
+def to_fibonacci(n: int) -> str:
+    """Zeckendorf representation, e.g. 4 -> "101" (3 + 1)."""
+    if n < 0:
+        raise ValueError("Only non-negative numbers have a Fibonacci representation")
+    if n == 0:
+        return "0"
+    position = bisect.bisect_right(FIBONACCI, n) - 1
+    digits = []
+    for f in reversed(FIBONACCI[:position + 1]):
+        if n >= f:
+            digits.append("1")
+            n -= f
+        else:
+            digits.append("0")
+    return "".join(digits)
+
+
+def from_fibonacci(text: str) -> int:
+    digits = text.strip().removesuffix(FIBONACCI_SUFFIX).removesuffix("F")
+    if not digits or set(digits) - {"0", "1"} or len(digits) > len(FIBONACCI):
+        raise ValueError(f"Not a Fibonacci numeral: '{text}'")
+    return sum(f for f, digit in zip(FIBONACCI, reversed(digits)) if digit == "1")
+
+
+@lru_cache(maxsize=None)
+def to_roman(n: int) -> str:
+    if not 1 <= n <= MAX_ROMAN:
+        raise ValueError(f"Roman numerals are from 1 to {MAX_ROMAN}")
+    symbols = []
+    for value, symbol in ROMAN_NUMERALS:
+        count, n = divmod(n, value)
+        symbols.append(symbol * count)
+    return "".join(symbols)
+
+
+@lru_cache(maxsize=4096)
+def from_roman(text: str) -> int:
+    numeral = text.strip().upper()
+    if not numeral or set(numeral) - ROMAN_VALUES.keys():
+        raise ValueError(f"Not a Roman numeral: '{text}'")
+    values = [ROMAN_VALUES[symbol] for symbol in numeral]
+    n = sum(-v if v < next_v else v for v, next_v in zip(values, values[1:] + [0]))
+    # Only the canonical spelling is accepted, "IIII" or "IM" are not numerals
+    if not 1 <= n <= MAX_ROMAN or to_roman(n) != numeral:
+        raise ValueError(f"Not a Roman numeral: '{text}'")
+    return n
+
+
+def _below_thousand(n: int) -> List[str]:
+    words = []
+    hundreds, n = divmod(n, 100)
+    if hundreds:
+        words += [ONES[hundreds], "hundred"]
+    if n >= 20:
+        tens, ones = divmod(n, 10)
+        words.append(TENS[tens] + (f"-{ONES[ones]}" if ones else ""))
+    elif n:
+        words.append(ONES[n])
+    return words
+
+
+def to_words(n: int) -> str:
+    """English words in the format of `num2words(n).replace(" and ", " ")`, e.g. 1234567 ->
+    "one million, two hundred thirty-four thousand, five hundred sixty-seven"."""
+    if n < 0:
+        return "minus " + to_words(-n)
+    if n == 0:
+        return ONES[0]
+    groups = []
+    power = 0
+    while n:
+        n, group = divmod(n, 1000)
+        groups.append((power, group))
+        power += 1
+    if power > len(SCALES):
+        raise ValueError(f"Numbers in words are below 1000^{len(SCALES)}")
+    text = ""
+    for power, group in reversed(groups):
+        if not group:
+            continue
+        words = " ".join(_below_thousand(group) + ([SCALES[power]] if power else []))
+        # num2words puts "and" instead of a comma before the last group if it has no hundreds
+        separator = " " if power == 0 and group < 100 else ", "
+        text = f"{text}{separator}{words}" if text else words
+    return text
+
+
+def from_words(text: str) -> int:
+    tokens = re.split(r"[\s,-]+", text.strip().lower())
+    sign = 1
+    if tokens and tokens[0] in ("minus", "negative"):
+        sign = -1
+        tokens = tokens[1:]
+    total = group = 0
+    seen = False
+    for token in tokens:
+        if token in ("", "and"):
+            continue
+        seen = True
+        if token in WORD_VALUES:
+            group += WORD_VALUES[token]
+        elif token == "hundred":
+            group = max(group, 1) * 100
+        elif token in SCALE_VALUES:
+            total += max(group, 1) * SCALE_VALUES[token]
+            group = 0
+        else:
+            raise ValueError(f"Not a number in words: '{text}'")
+    if not seen:
+        raise ValueError(f"Not a number in words: '{text}'")
+    return sign * (total + group)
+
+
+def parse_decimal(text: str) -> Number:
+    """Integer or complex number written in decimal, "(4+6j)" and "4+6j" alike."""
+    cleaned = text.strip()
+    try:
+        return int(cleaned)
+    except ValueError:
+        return complex(cleaned.replace(" ", ""))
+
+
+def decode(text: str) -> Number:
+    """Value of a number in any of the numeral systems of the task, except for bases other than 10
+    which can't be told apart without the base."""
+    cleaned = text.strip()
+    if cleaned.endswith("F") and set(cleaned.removesuffix(FIBONACCI_SUFFIX).removesuffix("F")) <= {"0", "1"}:
+        return from_fibonacci(cleaned)
+    if cleaned and set(cleaned) <= ROMAN_VALUES.keys():
+        return from_roman(cleaned)
+    if re.search(r"[a-ik-z]", cleaned, re.IGNORECASE):
+        return from_words(cleaned)
+    return parse_decimal(cleaned)
+
+
+def _benchmark() -> None:
+    import random
+    import timeit
+
+    from num2words import num2words  # type: ignore[import-untyped]
+
+    rng = random.Random(0)
+    numbers = [rng.randint(1, 10 ** 12) for _ in range(1000)]
+    small = [rng.randint(1, MAX_ROMAN) for _ in range(1000)]
+    fib, roman, words = [to_fibonacci(n) for n in numbers], [to_roman(n) for n in small], [to_words(n) for n in numbers]
+    cases = {
+        "to_fibonacci": lambda: [to_fibonacci(n) for n in numbers],
+        "from_fibonacci": lambda: [from_fibonacci(s) for s in fib],
+        "to_roman": lambda: [to_roman(n) for n in small],
+        "from_roman": lambda: [from_roman(s) for s in roman],
+        "to_words": lambda: [to_words(n) for n in numbers],
+        "from_words": lambda: [from_words(s) for s in words],
+        "num2words": lambda: [num2words(n) for n in numbers],
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=5))
+        print(f"{name:<15} {seconds * 1000:8.3f} us per conversion")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,65 @@
+import asyncio
+import random
+import unittest
+
+import numpy as np
+
+from api_models import CheckRequest, CheckStatus, GenRequest, TaskProgress
+from tasks.a_plus_b.matrices import check_matrix, format_matrix, gen_matrix, matrix_size, parse_matrix
+from tasks.a_plus_b.router import check_answer, generate_task
+
+
+class TestMatrices(unittest.TestCase):
+
+    def test_gen_matrix(self) -> None:
+        matrix = gen_matrix(500, random.Random(1))
+        self.assertEqual(matrix.shape, (500, 500))
+        self.assertTrue(((matrix >= 0) & (matrix <= 10)).all())
+        np.testing.assert_array_equal(matrix, gen_matrix(500, random.Random(1)))
+
+    def test_matrix_size(self) -> None:
+        rng = random.Random(1)
+        self.assertTrue(all(2 <= matrix_size(5, rng) <= 5 for _ in range(100)))
+        self.assertTrue(all(2 <= matrix_size(8, rng) <= 500 for _ in range(100)))
+
+    def test_format_and_parse(self) -> None:
+        matrix = np.array([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(format_matrix(matrix), "1 2 3\n4 5 6")
+        np.testing.assert_array_equal(parse_matrix("1 2 3\n4 5 6\n"), matrix)
+        np.testing.assert_array_equal(parse_matrix("[[1, 2, 3], [4, 5, 6]]"), matrix)
+        np.testing.assert_array_equal(parse_matrix("1,2,3;4,5,6", (2, 3)), matrix)
+        self.assertIsNone(parse_matrix("1 2\nx 4"))
+        self.assertIsNone(parse_matrix("1 2 3", (2, 2)))
+
+    def test_check_matrix(self) -> None:
+        hint = "1 2\n3 4"
+        self.assertIsNone(check_matrix("1 2\n3 4", hint))
+        self.assertIsNone(check_matrix("  [[1, 2],\n [3, 4]]  ", hint))
+        self.assertIsNone(check_matrix("1 2 3 4", hint))
+        self.assertEqual(check_matrix("1 2\n3 5", hint), "1 wrong cells, the first one at row 2, column 2")
+        self.assertEqual(check_matrix("1 2\n3", hint), "Expected a 2x2 matrix of integers")
+        # Hints of older tasks
+        self.assertIsNone(check_matrix("1 2\n3 4", "[[1, 2], [3, 4]]"))
+
+    def test_matrix_task(self) -> None:
+        for task_id in range(200):
+            request = GenRequest(challenge="1", team="2", round="3", task_id=str(task_id),
+                                 task_settings="complication8:0",
+                                 progress=TaskProgress(task_index=0, task_count=10, elapsed_time=0, total_time=600))
+            task = asyncio.run(generate_task(request))
+            if "\n" not in task.checker_hint:
+                continue
+            lines = task.input.splitlines()
+            a = parse_matrix("\n".join(lines[:len(lines) // 2]))
+            b = parse_matrix("\n".join(lines[len(lines) // 2:]))
+            assert a is not None and b is not None
+            answer = format_matrix(a + b)
+            result = asyncio.run(check_answer(CheckRequest(input=task.input, checker_hint=task.checker_hint,
+                                                           answer=answer)))
+            self.assertEqual(result.status, CheckStatus.ACCEPTED)
+            return
+        self.fail("No matrix task generated")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import random
+import unittest
+
+from num2words import num2words  # type: ignore[import-untyped]
+
+from api_models import CheckRequest, CheckStatus
+from tasks.a_plus_b.numerals import decode, from_fibonacci, from_roman, from_words, parse_decimal, to_fibonacci, \
+    to_roman, to_words
+from tasks.a_plus_b.router import check_answer
+
+
+class TestNumerals(unittest.TestCase):
+
+    def test_fibonacci(self) -> None:
+        for n, fib in [(0, "0"), (1, "1"), (2, "10"), (3, "100"), (4, "101"), (7, "1010"), (20, "101010")]:
+            with self.subTest(n=n):
+                self.assertEqual(to_fibonacci(n), fib)
+                self.assertEqual(from_fibonacci(fib + "_F"), n)
+        rng = random.Random(1)
+        for n in (rng.randint(0, 10 ** 30) for _ in range(1000)):
+            self.assertEqual(from_fibonacci(to_fibonacci(n)), n)
+        with self.assertRaises(ValueError):
+            from_fibonacci("102_F")
+
+    def test_roman(self) -> None:
+        for n, roman in [(1, "I"), (4, "IV"), (9, "IX"), (40, "XL"), (444, "CDXLIV"), (1990, "MCMXC"),
+                         (3999, "MMMCMXCIX"), (4999, "MMMMCMXCIX")]:
+            with self.subTest(n=n):
+                self.assertEqual(to_roman(n), roman)
+                self.assertEqual(from_roman(roman), n)
+        self.assertEqual([from_roman(to_roman(n)) for n in range(1, 5000)], list(range(1, 5000)))
+        for invalid in ["IIII", "IM", "ABC", "", "MMMMM"]:
+            with self.subTest(invalid=invalid):
+                with self.assertRaises(ValueError):
+                    from_roman(invalid)
+        with self.assertRaises(ValueError):
+            to_roman(0)
+
+    def test_words_match_num2words(self) -> None:
+        rng = random.Random(1)
+        numbers = [0, 1, 100, 101, 1100, 1001, 1000000001, 1002003, 10 ** 12]
+        numbers += [rng.randint(1, 10 ** rng.randint(1, 15)) for _ in range(2000)]
+        for n in numbers:
+            with self.subTest(n=n):
+                words = to_words(n)
+                self.assertEqual(words, num2words(n).replace(" and ", " "))
+                self.assertEqual(from_words(words), n)
+                self.assertEqual(from_words(num2words(n)), n)
+        self.assertEqual(from_words("minus twenty-one"), -21)
+        with self.assertRaises(ValueError):
+            from_words("twenty apples")
+
+    def test_decode(self) -> None:
+        self.assertEqual(decode("1010_F"), 7)
+        self.assertEqual(decode("XLII"), 42)
+        self.assertEqual(decode("forty-two"), 42)
+        self.assertEqual(decode(" 42 "), 42)
+        self.assertEqual(decode("(4+6j)"), 4 + 6j)
+        self.assertEqual(parse_decimal("10000000000000000000000000001"), 10 ** 28 + 1)
+
+    def test_check_compares_values(self) -> None:
+        def check(answer: str, hint: str) -> CheckStatus:
+            result = asyncio.run(check_answer(CheckRequest(input="", checker_hint=hint, answer=answer)))
+            return result.status
+
+        self.assertEqual(check("42", "42"), CheckStatus.ACCEPTED)
+        self.assertEqual(check("042\n", "42"), CheckStatus.ACCEPTED)
+        self.assertEqual(check("4+6j", "(4+6j)"), CheckStatus.ACCEPTED)
+        self.assertEqual(check("43", "42"), CheckStatus.WRONG_ANSWER)
+        self.assertEqual(check("forty-two", "42"), CheckStatus.WRONG_ANSWER)
+
+
+if __name__ == "__main__":
+    unittest.main()
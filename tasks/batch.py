@@ -0,0 +1,45 @@
+from typing import Awaitable, Callable, List, Optional, Union
+
+from fastapi import APIRouter, HTTPException
+
+from api_models import GenRequest, GenResponse, CheckRequest, CheckResult, GeneratorCapabilities
+
+# Upper bound for a single /gen/batch or /check/batch call, keeps one Lambda invocation within its timeout
+MAX_BATCH_SIZE = 100
+
+GenHandler = Callable[[GenRequest], Awaitable[GenResponse]]
+GenBatchHandler = Callable[[List[GenRequest]], Awaitable[List[GenResponse]]]
+CheckHandler = Callable[[CheckRequest], Awaitable[Union[CheckResult, List[CheckResult]]]]
+
+
+def ensure_batch_size(size: int) -> None:
+    if size > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch is too large: {size} > {MAX_BATCH_SIZE}")
+
+
+def add_batch_routes(router: APIRouter, gen: GenHandler, check: CheckHandler,
+                     gen_batch: Optional[GenBatchHandler] = None) -> None:
+    """Register /capabilities, /gen/batch and /check/batch on top of the generator's single-task handlers.
+    `gen_batch` replaces the loop over `gen`, e.g. to store the state of all generated tasks in one write."""
+
+    @router.get("/capabilities", response_model=GeneratorCapabilities)
+    async def get_capabilities() -> GeneratorCapabilities:
+        return GeneratorCapabilities(batch=True, max_batch_size=MAX_BATCH_SIZE)
+
+    @router.post("/gen/batch", response_model=List[GenResponse])
+    async def generate_batch(requests: List[GenRequest]) -> List[GenResponse]:
+        """Generate several tasks in one call. Responses are in the same order as requests."""
+        ensure_batch_size(len(requests))
+        if gen_batch is not None:
+            return await gen_batch(requests)
+        return [await gen(request) for request in requests]
+
+    @router.post("/check/batch", response_model=List[List[CheckResult]])
+    async def check_batch(requests: List[CheckRequest]) -> List[List[CheckResult]]:
+        """Check several answers in one call. Each item is the same list of results /check would return."""
+        ensure_batch_size(len(requests))
+        responses: List[List[CheckResult]] = []
+        for request in requests:
+            result = await check(request)
+            responses.append(result if isinstance(result, list) else [result])
+        return responses
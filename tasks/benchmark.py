@@ -0,0 +1,269 @@
+"""Throughput and latency of the task generators, per difficulty level.
+
+Calls the `/gen` and `/check` handlers of every generator package in-process, without HTTP, so the numbers
+show the generator code alone, the part that decides the Lambda memory size in template.yaml.
+The slowest level of every generator is profiled again with cProfile and its stats are written next to the
+report, and p99 latencies are compared with a committed baseline to catch regressions before deploy.
+
+    python -m tasks.benchmark --iterations 500 --profile-dir /tmp/gen-profiles
+    python -m tasks.benchmark --update-baseline
+"""
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import importlib
+import io
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+
+from api_models import CheckRequest, GenRequest, GenResponse, TaskProgress
+
+LEVELS = range(1, 9)
+ITERATIONS = int(os.getenv("CHALLENGE_GEN_BENCH_ITERATIONS", "200"))
+# A level fails if its p99 is slower than the baseline p99 times this factor, the same default as back/benchmarks
+TOLERANCE = float(os.getenv("CHALLENGE_BENCH_TOLERANCE", "1.5"))
+# Plus this many milliseconds, most handlers take well under a millisecond and their p99 is mostly noise
+SLACK_MS = float(os.getenv("CHALLENGE_GEN_BENCH_SLACK_MS", "1.0"))
+# Calls made before measuring a level, they fill lazy caches and imports
+WARMUP = 10
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+@dataclass
+class LevelResult:
+    generator: str
+    level: int
+    gen_per_second: float
+    gen_p50_ms: float
+    gen_p99_ms: float
+    check_per_second: float
+    check_p50_ms: float
+    check_p99_ms: float
+    errors: int
+    first_error: str = ""
+
+    @property
+    def key(self) -> str:
+        return f"{self.generator}/{self.level}"
+
+
+def discover_generators() -> Dict[str, APIRouter]:
+    """Generator packages under tasks/ whose router module defines a `router`, registered in main or not."""
+    routers = {}
+    for path in sorted(Path(__file__).parent.glob("*/router.py")):
+        # Work-in-progress generators may print samples on import
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = importlib.import_module(f"tasks.{path.parent.name}.router")
+        if isinstance(getattr(module, "router", None), APIRouter):
+            routers[path.parent.name] = module.router
+    return routers
+
+
+def find_handler(router: APIRouter, path: str) -> Handler:
+    for route in router.routes:
+        if isinstance(route, APIRoute) and route.path == path and "POST" in (route.methods or ()):
+            handler: Handler = route.endpoint
+            return handler
+    raise LookupError(f"Router has no POST {path}")
+
+
+def gen_request(level: int, index: int) -> GenRequest:
+    # Every complication is reached from the first task, so the generator runs at exactly `level`.
+    # Generation is seeded by the request, so every run benchmarks the same tasks
+    return GenRequest(
+        challenge="benchmark",
+        team="benchmark",
+        round="benchmark",
+        task_id=str(index),
+        progress=TaskProgress(task_index=index, task_count=ITERATIONS, elapsed_time=0, total_time=3600),
+        task_settings=f"complication{level}:0",
+    )
+
+
+class GeneratorBenchmark:
+    """Runs one generator's handlers in a private event loop, the way they run inside the Lambda."""
+
+    def __init__(self, name: str, router: APIRouter):
+        self.name = name
+        self.gen = find_handler(router, "/gen")
+        self.check = find_handler(router, "/check")
+        self.loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self.loop.close()
+
+    def run_level(self, level: int, iterations: int) -> Tuple[List[float], List[float], List[str]]:
+        """Seconds per /gen and per /check call, and the errors of the calls that raised."""
+        gen_times: List[float] = []
+        check_times: List[float] = []
+        errors: List[str] = []
+        for index in range(iterations):
+            start = time.perf_counter()
+            try:
+                task: GenResponse = self.loop.run_until_complete(self.gen(gen_request(level, index)))
+            except Exception as e:
+                errors.append(f"/gen: {e!r}")
+                continue
+            gen_times.append(time.perf_counter() - start)
+
+            # The hint is the expected answer of most generators, it's good enough to exercise the checker
+            check = CheckRequest(input=task.input, checker_hint=task.checker_hint, answer=task.checker_hint,
+                                 task_id=str(index))
+            start = time.perf_counter()
+            try:
+                self.loop.run_until_complete(self.check(check))
+            except Exception as e:
+                errors.append(f"/check: {e!r}")
+                continue
+            check_times.append(time.perf_counter() - start)
+        return gen_times, check_times, errors
+
+    def measure(self, level: int, iterations: int) -> LevelResult:
+        self.run_level(level, WARMUP)
+        gen_times, check_times, errors = self.run_level(level, iterations)
+        gen_p50, gen_p99 = percentiles(gen_times)
+        check_p50, check_p99 = percentiles(check_times)
+        return LevelResult(
+            generator=self.name,
+            level=level,
+            gen_per_second=throughput(gen_times),
+            gen_p50_ms=gen_p50,
+            gen_p99_ms=gen_p99,
+            check_per_second=throughput(check_times),
+            check_p50_ms=check_p50,
+            check_p99_ms=check_p99,
+            errors=len(errors),
+            first_error=errors[0] if errors else "",
+        )
+
+    def profile(self, level: int, iterations: int, path: Path) -> None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            self.run_level(level, iterations)
+        finally:
+            profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+
+
+def percentiles(data: List[float]) -> Tuple[float, float]:
+    """p50 and p99 in milliseconds from call times in seconds."""
+    if len(data) < 2:
+        value = data[0] * 1000 if data else 0.0
+        return value, value
+    cuts = statistics.quantiles(data, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+def throughput(data: List[float]) -> float:
+    total = sum(data)
+    return len(data) / total if total > 0 else 0.0
+
+
+def slowest_level(results: List[LevelResult]) -> LevelResult:
+    return max(results, key=lambda r: r.gen_p99_ms + r.check_p99_ms)
+
+
+def regressions(results: List[LevelResult], baseline: Dict[str, Dict[str, float]]) -> List[str]:
+    failures = []
+    for result in results:
+        expected = baseline.get(result.key)
+        if expected is None:
+            continue
+        for metric in ("gen_p99_ms", "check_p99_ms"):
+            allowed = expected[metric] * TOLERANCE + SLACK_MS
+            measured = getattr(result, metric)
+            if measured > allowed:
+                failures.append(f"{result.key}: {metric} regressed to {measured:.3f} ms "
+                                f"(baseline {expected[metric]:.3f} ms)")
+    return failures
+
+
+def peak_memory_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux, the platform of the Lambda
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def print_table(results: List[LevelResult]) -> None:
+    print(f"{'generator':<12} {'level':>5} {'gen/s':>9} {'gen p99 ms':>11} {'check/s':>9} {'check p99 ms':>13} "
+          f"{'errors':>6}")
+    for r in results:
+        print(f"{r.generator:<12} {r.level:>5} {r.gen_per_second:>9.0f} {r.gen_p99_ms:>11.3f} "
+              f"{r.check_per_second:>9.0f} {r.check_p99_ms:>13.3f} {r.errors:>6}")
+    for r in results:
+        if r.first_error:
+            print(f"{r.key}: {r.errors} failed calls, first: {r.first_error.splitlines()[0][:200]}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the /gen and /check handlers of the task generators.")
+    parser.add_argument("--generator", action="append", help="Generator to run, repeatable (default: all)")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS, help="Tasks generated and checked per level")
+    parser.add_argument("--profile-dir", type=Path, default=Path(tempfile.gettempdir()) / "generator-profiles",
+                        help="Where the cProfile stats of the slowest level of every generator are written")
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="p99 baseline to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    args = parser.parse_args(argv)
+
+    routers = discover_generators()
+    names = args.generator or list(routers)
+    unknown = [name for name in names if name not in routers]
+    if unknown:
+        parser.error(f"Unknown generator(s): {', '.join(unknown)}, expected one of: {', '.join(routers)}")
+
+    results: List[LevelResult] = []
+    profiles: Dict[str, str] = {}
+    for name in names:
+        benchmark = GeneratorBenchmark(name, routers[name])
+        try:
+            level_results = [benchmark.measure(level, args.iterations) for level in LEVELS]
+            slowest = slowest_level(level_results)
+            profile_path = args.profile_dir / f"{name}-level{slowest.level}.pstats"
+            benchmark.profile(slowest.level, args.iterations, profile_path)
+        finally:
+            benchmark.close()
+        results.extend(level_results)
+        profiles[name] = str(profile_path)
+
+    print_table(results)
+    memory = peak_memory_mb()
+    print(f"Peak memory: {memory:.1f} MB")
+    for name, path in profiles.items():
+        print(f"Profile of the slowest {name} level: {path}")
+
+    if args.json:
+        report = {"results": [asdict(r) for r in results], "profiles": profiles, "peak_memory_mb": memory}
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline: Dict[str, Dict[str, float]] = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update_baseline:
+        # Levels where every call failed have no latency to hold the next runs to
+        for r in (r for r in results if r.gen_per_second > 0):
+            baseline[r.key] = {"gen_p99_ms": round(r.gen_p99_ms, 3), "check_p99_ms": round(r.check_p99_ms, 3)}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        return 0
+
+    failures = regressions(results, baseline)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
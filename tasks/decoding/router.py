@@ -1,12 +1,16 @@
 from math import gcd
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 import random
 import heapq
 from collections import Counter
+from pathlib import Path
 
 from fastapi import APIRouter
 
-from api_models import GenRequest, GenResponse, CheckRequest, CheckResult
+from api_models import GenRequest, GenResponse, CheckRequest, CheckResult, CheckStatus
+from tasks.batch import add_batch_routes
+from tasks.seeding import ensure_rng, task_rng
+from tasks.settings import get_difficulty
 
 router = APIRouter()
 STATEMENTS = {
@@ -34,10 +38,13 @@ MORSE_CODE = {
 }
 
 
-def get_random_sentence():
-    with open("sentences.txt", "r", encoding="utf-8") as f:
+SENTENCES_PATH = Path(__file__).with_name("sentences.txt")
+
+
+def get_random_sentence(rng: Optional[random.Random] = None):
+    with open(SENTENCES_PATH, "r", encoding="utf-8") as f:
         sentences = [line.strip() for line in f if line.strip()]
-    return random.choice(sentences)
+    return ensure_rng(rng).choice(sentences)
 
 
 def generate_caesar_cipher(sentence: str, shift: int = 1) -> str:
@@ -66,10 +73,11 @@ def generate_reversed_swapped_sentence(sentence: str) -> str:
     return ''.join(reversed_sentence)
 
 
-def generate_affine_cipher(sentence: str) -> Tuple[str, str]:
+def generate_affine_cipher(sentence: str, rng: Optional[random.Random] = None) -> Tuple[str, str]:
+    rng = ensure_rng(rng)
     coprimes = [n for n in range(1, 26, 2) if gcd(n, 26) == 1]
-    a = random.choice(coprimes)
-    b = random.randint(0, 1000)
+    a = rng.choice(coprimes)
+    b = rng.randint(0, 1000)
     result = ''.join([chr(((a * (ord(ch) - ord('a')) + b) % 26) + ord('a')) if ch.isalpha() else ch for ch in sentence])
     return result, f"f(x) = ({a} * x + {b}) mod 26"
 
@@ -166,41 +174,15 @@ def check_student_answer_huffman(minimal_bits_number: int, student_answer: str)
     return True, "Code is binary, prefix-free, and optimal"
 
 
-def get_difficulty(request: GenRequest) -> int:
-    """Determine the difficulty level based on task settings and progress"""
-    task_settings = request.task_settings
-    progress = request.progress
-
-    # Default to level 1
-    level = 1
-
-    # Parse task settings if available
-    if task_settings:
-        settings = {}
-        for setting in task_settings.split(','):
-            if ':' in setting:
-                key, value = setting.split(':', 1)
-                settings[key.strip()] = int(value.strip())
-
-        # Check if we should increase difficulty based on task index
-        task_index = progress.task_index
-        for complication, threshold in sorted(settings.items()):
-            if complication.startswith('complication') and task_index >= threshold:
-                level_num = int(complication.replace('complication', ''))
-                level = max(level, level_num)
-
-    # Cap at maximum level 8
-    return min(level, 8)
-
-
 # TODO: Huffman looks strange in this task. It is not deciphering, but encoding.
-def generate_input(level: int, sentence: str):
+def generate_input(level: int, sentence: str, rng: Optional[random.Random] = None):
+    rng = ensure_rng(rng)
     if level == 1:
         return generate_caesar_cipher(sentence, 1), sentence
     elif level == 2:
-        return generate_caesar_cipher(sentence, random.randint(0, 26)), sentence
+        return generate_caesar_cipher(sentence, rng.randint(0, 26)), sentence
     elif level == 3:
-        return '\n'.join(generate_affine_cipher(sentence)), sentence
+        return '\n'.join(generate_affine_cipher(sentence, rng)), sentence
     elif level == 4:
         sentence = add_hint_sentence(sentence)
         return generate_morse_code(sentence), sentence
@@ -208,9 +190,9 @@ def generate_input(level: int, sentence: str):
         sentence = ''.join(sentence.split())
         return generate_reversed_swapped_sentence(sentence), sentence
     elif level == 6:
-        return generate_affine_cipher(sentence)[0], sentence
+        return generate_affine_cipher(sentence, rng)[0], sentence
     elif level == 7:
-        return generate_morse_code(generate_affine_cipher(sentence)[0]), sentence
+        return generate_morse_code(generate_affine_cipher(sentence, rng)[0]), sentence
     elif level == 8:
         sentence = ''.join(sentence.split())
         return sentence, huffman_bit_length(sentence)
@@ -219,11 +201,12 @@ def generate_input(level: int, sentence: str):
 @router.post("/gen", response_model=GenResponse)
 async def generate_task(request: GenRequest):
     """Generate a new task"""
-    level = get_difficulty(request)
+    rng = task_rng(request)
+    level = get_difficulty(request, rng)
     if level != 4:
-        level = random.randint(1, level)
+        level = rng.randint(1, level)
 
-    input_data, hint_data = generate_input(level, get_random_sentence())
+    input_data, hint_data = generate_input(level, get_random_sentence(rng), rng)
 
     # Get statement based on highest complexity type
     statement_key = f"v{level}"
@@ -250,19 +233,22 @@ async def check_answer(request: CheckRequest) -> CheckResult:
     if expected_answer.isnumeric():
         answer_data, error_data = check_student_answer_huffman(int(expected_answer), request.answer.strip())
         if answer_data:
-            return CheckResult(status="AC", score=1.0)  # TODO: Use Enums for status
+            return CheckResult(status=CheckStatus.ACCEPTED, score=1.0)
         else:
             return CheckResult(
-                status="WA",
+                status=CheckStatus.WRONG_ANSWER,
                 score=0.0,
                 error=error_data
             )
     else:
         if request.answer.strip() == expected_answer:
-            return CheckResult(status="AC", score=1.0)
+            return CheckResult(status=CheckStatus.ACCEPTED, score=1.0)
         else:
             return CheckResult(
-                status="WA",
+                status=CheckStatus.WRONG_ANSWER,
                 score=0.0,
                 error=f"Expected {expected_answer}, got {request.answer.strip()}"
             )
+
+
+add_batch_routes(router, generate_task, check_answer)
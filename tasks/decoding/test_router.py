@@ -1,9 +1,12 @@
+import asyncio
 import unittest
 from unittest.mock import patch, mock_open
 from math import gcd
 from collections import Counter
 
-from decoding.router import (
+from api_models import GenRequest, TaskProgress
+from tasks.decoding.router import (
+    generate_task,
     get_random_sentence,
     generate_caesar_cipher,
     generate_morse_code,
@@ -14,11 +17,11 @@ from decoding.router import (
     huffman_bit_length,
     add_hint_sentence,
     check_student_answer_huffman,
-    get_difficulty,
     generate_input,
     STATEMENTS,
     MORSE_CODE
 )
+from tasks.settings import get_difficulty
 
 
 class TestDecodingFunctions(unittest.TestCase):
@@ -117,6 +120,16 @@ class TestDecodingFunctions(unittest.TestCase):
         self.assertEqual(result, "testsentence")
         self.assertEqual(bit_length, huffman_bit_length("testsentence"))
 
+    def test_generate_task_is_deterministic(self):
+        def request(task_id: str) -> GenRequest:
+            return GenRequest(challenge="1", team="2", round="3", task_id=task_id, task_settings="complication7:0",
+                              progress=TaskProgress(task_index=0, task_count=10, elapsed_time=0, total_time=600))
+
+        first = [asyncio.run(generate_task(request(str(i)))) for i in range(10)]
+        again = [asyncio.run(generate_task(request(str(i)))) for i in range(10)]
+        self.assertEqual(first, again)
+        self.assertGreater(len({task.input for task in first}), 1)
+
     def test_statements(self):
         self.assertIn("v1", STATEMENTS)
         self.assertIn("v8", STATEMENTS)
@@ -0,0 +1,92 @@
+import json
+import uuid
+from typing import Dict, List, Tuple
+
+from fastapi import APIRouter
+
+from api_models import GenRequest, GenResponse, CheckRequest, CheckResult, CheckStatus, CollaborativeScore
+from tasks.batch import add_batch_routes
+from tasks.storage import Item, KeyValueStore, get_store
+
+router = APIRouter()
+
+STATEMENTS = {
+    "v1": "The input is your team's flag. Get a flag of another team that nobody has submitted yet and submit it as "
+          "the answer. You get half of the task score for it, and the full score once another team submits your "
+          "flag.",
+}
+
+# Share of the task score for submitting a flag of another team, the rest comes when the own flag is submitted
+SUBMITTER_SCORE = 0.5
+
+INVALID_FLAG = "Is not a valid flag"
+OWN_FLAG = "Cannot submit your own flag"
+ALREADY_SUBMITTED = "This flag was already submitted earlier"
+
+
+def flag_store() -> KeyValueStore:
+    # Resolved per call, so that tests can point CHALLENGE_GENERATOR_STORE elsewhere
+    return get_store("flags")
+
+
+def new_flag(request: GenRequest) -> Tuple[str, Item, GenResponse]:
+    # Flags must not be guessable, so unlike other generators they don't come from the seeded task rng
+    flag = str(uuid.uuid4())
+    owner = {"team": request.team, "challenge": request.challenge, "round": request.round}
+    item = {**owner, "task_id": request.task_id, "submitted": False}
+    return flag, item, GenResponse(
+        statement_version="v1",
+        statement=STATEMENTS["v1"],
+        input=flag,
+        # The submitting team, challenge and round, so that /check can tell whose task the answer is for
+        checker_hint=json.dumps(owner)
+    )
+
+
+@router.post("/gen", response_model=GenResponse)
+async def generate_task(request: GenRequest) -> GenResponse:
+    """Issue a new flag to the team"""
+    flag, item, response = new_flag(request)
+    flag_store().put(flag, item)
+    return response
+
+
+async def generate_tasks(requests: List[GenRequest]) -> List[GenResponse]:
+    """Issue flags for a batch of tasks with one write to the store"""
+    flags = [new_flag(request) for request in requests]
+    flag_store().put_many({flag: item for flag, item, _ in flags})
+    return [response for _, _, response in flags]
+
+
+@router.get("/statements", response_model=Dict[str, str])
+async def get_statements() -> Dict[str, str]:
+    return STATEMENTS
+
+
+def wrong_answer(error: str) -> CheckResult:
+    return CheckResult(status=CheckStatus.WRONG_ANSWER, score=0.0, error=error)
+
+
+@router.post("/check", response_model=CheckResult)
+async def check_answer(request: CheckRequest) -> CheckResult:
+    """Accept a flag of another team once, and give the full score to the task the flag was issued for"""
+    flag = request.answer.strip()
+    store = flag_store()
+    item = store.get(flag)
+    submitter = json.loads(request.checker_hint)
+    # A flag of another challenge or round is not valid here, even if it exists in a shared store
+    if item is None or (item["challenge"], item["round"]) != (submitter["challenge"], submitter["round"]):
+        return wrong_answer(INVALID_FLAG)
+    if item["team"] == submitter["team"]:
+        return wrong_answer(OWN_FLAG)
+    # Two teams may submit the same flag at once, only one of them marks it as submitted
+    if not store.compare_and_set(flag, "submitted", False, True):
+        return wrong_answer(ALREADY_SUBMITTED)
+    return CheckResult(
+        status=CheckStatus.ACCEPTED,
+        score=SUBMITTER_SCORE,
+        collaborative_scores=[CollaborativeScore(task_id=str(item["task_id"]), score=1.0)]
+    )
+
+
+add_batch_routes(router, generate_task, check_answer, generate_tasks)
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+
+from api_models import GenRequest, CheckRequest, CheckResult, CheckStatus, TaskProgress
+from tasks.flags.router import generate_task, generate_tasks, check_answer, INVALID_FLAG, OWN_FLAG, \
+    ALREADY_SUBMITTED, SUBMITTER_SCORE
+from tasks.storage import KeyValueStore, MemoryStore, SQLiteStore, DynamoDBStore, get_store, open_store
+
+
+def gen_request(team: str, task_id: str, game_round: str = "r1") -> GenRequest:
+    return GenRequest(challenge="c1", team=team, task_id=task_id, round=game_round,
+                      progress=TaskProgress(task_index=0, task_count=1, elapsed_time=0, total_time=600))
+
+
+def check(flag: str, team: str, game_round: str = "r1") -> CheckResult:
+    # The checker hint of a task issued to `team`
+    hint = asyncio.run(generate_task(gen_request(team, f"task-of-{team}", game_round))).checker_hint
+    return asyncio.run(check_answer(CheckRequest(input="", checker_hint=hint, answer=flag)))
+
+
+class TestFlags(unittest.TestCase):
+
+    def setUp(self) -> None:
+        open_store.cache_clear()
+        self.addCleanup(open_store.cache_clear)
+
+    def test_flag_of_another_team_is_accepted_once(self) -> None:
+        flag = asyncio.run(generate_task(gen_request("team-a", "task-1"))).input
+        result = check(flag, "team-b")
+        self.assertEqual(result.status, CheckStatus.ACCEPTED)
+        self.assertEqual(result.score, SUBMITTER_SCORE)
+        self.assertEqual([(s.task_id, s.score) for s in result.collaborative_scores or []], [("task-1", 1.0)])
+
+        again = check(flag, "team-c")
+        self.assertEqual((again.status, again.error), (CheckStatus.WRONG_ANSWER, ALREADY_SUBMITTED))
+
+    def test_rejected_flags(self) -> None:
+        response = asyncio.run(generate_task(gen_request("team-a", "task-1")))
+        self.assertEqual(json.loads(response.checker_hint), {"team": "team-a", "challenge": "c1", "round": "r1"})
+        self.assertEqual(check(response.input, "team-a").error, OWN_FLAG)
+        self.assertEqual(check(str(uuid.uuid4()), "team-b").error, INVALID_FLAG)
+        # Flags are valid in the round they were issued in only
+        self.assertEqual(check(response.input, "team-b", game_round="r2").error, INVALID_FLAG)
+        # A rejected own submission doesn't use the flag up
+        self.assertEqual(check(f" {response.input}\n", "team-b").status, CheckStatus.ACCEPTED)
+
+    def test_batch_writes_once(self) -> None:
+        requests = [gen_request(f"team-{i}", f"task-{i}") for i in range(50)]
+        store = get_store("flags")
+        with mock.patch.object(type(store), "put_many", autospec=True, side_effect=type(store).put_many) as put_many:
+            responses = asyncio.run(generate_tasks(requests))
+        self.assertEqual(put_many.call_count, 1)
+        self.assertEqual(len({response.input for response in responses}), 50)
+        result = check(responses[7].input, "team-8")
+        self.assertEqual(result.collaborative_scores[0].task_id if result.collaborative_scores else None, "task-7")
+
+    def test_store_from_environment(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'flags.db')}"
+            with mock.patch.dict(os.environ, {"CHALLENGE_GENERATOR_STORE": url}):
+                self.assertIsInstance(get_store("flags"), SQLiteStore)
+                flag = asyncio.run(generate_task(gen_request("team-a", "task-1"))).input
+                self.assertEqual(check(flag, "team-b").status, CheckStatus.ACCEPTED)
+            with mock.patch.dict(os.environ, {"CHALLENGE_GENERATOR_STORE": "ftp://nowhere"}):
+                with self.assertRaises(ValueError):
+                    get_store("flags")
+
+
+class Backend:
+    # Nested, so that unittest doesn't run the shared tests without a store
+
+    class StoreTests(unittest.TestCase):
+        """Behaviour every backend shares, run against each of them below."""
+
+        store: KeyValueStore
+        batch_size = 20000
+
+        def test_put_and_get(self) -> None:
+            self.store.put("a", {"team": "t", "submitted": False})
+            self.assertEqual(self.store.get("a"), {"team": "t", "submitted": False})
+            self.assertIsNone(self.store.get("b"))
+
+        def test_compare_and_set(self) -> None:
+            self.store.put("a", {"submitted": False})
+            self.assertTrue(self.store.compare_and_set("a", "submitted", False, True))
+            self.assertFalse(self.store.compare_and_set("a", "submitted", False, True))
+            self.assertFalse(self.store.compare_and_set("missing", "submitted", False, True))
+            self.assertEqual(self.store.get("a"), {"submitted": True})
+
+        def test_put_many(self) -> None:
+            items = {f"key-{i}": {"n": i} for i in range(self.batch_size)}
+            self.store.put_many(items)
+            self.assertEqual(self.store.get("key-0"), {"n": 0})
+            self.assertEqual(self.store.get(f"key-{self.batch_size - 1}"), {"n": self.batch_size - 1})
+
+
+class TestMemoryStore(Backend.StoreTests):
+
+    def setUp(self) -> None:
+        self.store = MemoryStore(uuid.uuid4().hex)
+
+
+class TestSQLiteStore(Backend.StoreTests):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "store.db")
+        self.store = SQLiteStore("flags", self.path)
+
+    def test_namespaces_are_separate(self) -> None:
+        self.store.put("a", {"n": 1})
+        self.assertIsNone(SQLiteStore("other", self.path).get("a"))
+        self.assertEqual(SQLiteStore("flags", self.path).get("a"), {"n": 1})
+
+
+@unittest.skipUnless(os.getenv("CHALLENGE_DYNAMODB_ENDPOINT"), "Set CHALLENGE_DYNAMODB_ENDPOINT to a DynamoDB Local")
+class TestDynamoDBStore(Backend.StoreTests):
+    """Needs DynamoDB Local, e.g. `docker run -p 8001:8000 amazon/dynamodb-local` and
+    CHALLENGE_DYNAMODB_ENDPOINT=http://localhost:8001 (with any AWS credentials)."""
+
+    batch_size = 500
+
+    def setUp(self) -> None:
+        store = DynamoDBStore(uuid.uuid4().hex, "generator-state-test")
+        client = store._table.meta.client
+        if "generator-state-test" not in client.list_tables()["TableNames"]:
+            client.create_table(
+                TableName="generator-state-test",
+                KeySchema=[{"AttributeName": "key", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "key", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            client.get_waiter("table_exists").wait(TableName="generator-state-test")
+        self.store = store
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,25 +11,25 @@ LOOP_VARIABLES = []
 VARIABLES = []
 
 
-def rnum(lo=0, hi=10):
-    return str(random.randint(lo, hi))
+def rnum(rng, lo=0, hi=10):
+    return str(rng.randint(lo, hi))
 
 
-def arith_op():
+def arith_op(rng):
     # prefer + and * for variety; include -, %, and / (safe-div ensured)
-    return random.choices(["+", "-", "*", "%", "/"], weights=[3, 2, 3, 1, 1])[0]
+    return rng.choices(["+", "-", "*", "%", "/"], weights=[3, 2, 3, 1, 1])[0]
 
 
-def cmp_op():
-    return random.choice(["<", "<=", ">", ">=", "==", "!="])
+def cmp_op(rng):
+    return rng.choice(["<", "<=", ">", ">=", "==", "!="])
 
 
-def logic_op():
-    return random.choice(["und", "oder"])
+def logic_op(rng):
+    return rng.choice(["und", "oder"])
 
 
-def maybe_not(expr):
-    return expr if random.random() < 0.5 else f"nicht {expr}"
+def maybe_not(rng, expr):
+    return expr if rng.random() < 0.5 else f"nicht {expr}"
 
 
 def brace(expr):
@@ -37,92 +37,92 @@ def brace(expr):
     return "{" + expr + "}"
 
 
-def rand_term():
+def rand_term(rng):
     """Either a number or a variable (usually initialized by each generator)."""
-    if random.random() < 0.5 or not VARIABLES:
-        return rnum(0, 100)
-    return random.choice(VARIABLES)
+    if rng.random() < 0.5 or not VARIABLES:
+        return rnum(rng, 0, 100)
+    return rng.choice(VARIABLES)
 
 
-def rand_arith(depth=0, max_depth=2):
+def rand_arith(rng, depth=0, max_depth=2):
     """Build a random arithmetic expression that your grammar accepts."""
-    if depth >= max_depth or random.random() < 0.35:
+    if depth >= max_depth or rng.random() < 0.35:
         # base: unary or atom
-        if random.random() < 0.2:
-            return rand_arith(depth + 1, max_depth)
-        return rand_term()
+        if rng.random() < 0.2:
+            return rand_arith(rng, depth + 1, max_depth)
+        return rand_term(rng)
 
     # binary
-    op = arith_op()
-    left = rand_arith(depth + 1, max_depth)
+    op = arith_op(rng)
+    left = rand_arith(rng, depth + 1, max_depth)
     if op == "/" or op == "%":
-        right = rnum(1, 9)
+        right = rnum(rng, 1, 9)
     else:
-        right = rand_arith(depth + 1, max_depth)
+        right = rand_arith(rng, depth + 1, max_depth)
 
     # occasionally wrap with braces for grouping
-    if op != '-' and random.random() < 0.1:
+    if op != '-' and rng.random() < 0.1:
         expr = f"{left} {op} {brace('-' + right)}"
     else:
         expr = f"{left} {op} {right}"
-    return expr if random.random() < 0.6 else brace(expr)
+    return expr if rng.random() < 0.6 else brace(expr)
 
 
-def rassign():
-    variable = random.choice(POOL)
-    answer = f"{variable} = {rand_arith(max_depth=random.randint(1, 3))}"
+def rassign(rng):
+    variable = rng.choice(POOL)
+    answer = f"{variable} = {rand_arith(rng, max_depth=rng.randint(1, 3))}"
     VARIABLES.append(variable)
     return answer
 
 
-def rand_cmp():
-    return f"{brace(rand_arith())} {cmp_op()} {brace(rand_arith())}"
+def rand_cmp(rng):
+    return f"{brace(rand_arith(rng))} {cmp_op(rng)} {brace(rand_arith(rng))}"
 
 
-def rand_bool(depth=0, max_depth=3):
+def rand_bool(rng, depth=0, max_depth=3):
     """Boolean/logic expression: comparisons + und/oder + optional nicht."""
     # Base: a comparison
-    node = rand_cmp()
+    node = rand_cmp(rng)
     # Optionally chain with logic ops
-    while depth < max_depth and random.random() < 0.5:
-        node = f"{node} {logic_op()} {rand_cmp()}"
+    while depth < max_depth and rng.random() < 0.5:
+        node = f"{node} {logic_op(rng)} {rand_cmp(rng)}"
         depth += 1
-        if random.random() < 0.3:
+        if rng.random() < 0.3:
             node = brace(node)
     # Optional leading 'nicht'
-    if random.random() < 0.4:
+    if rng.random() < 0.4:
         node = f"nicht {brace(node)}"
     return node
 
 
-def generate_script(length=5, allow_cmp=False, allow_bool=False):
+def generate_script(rng, length=5, allow_cmp=False, allow_bool=False):
     code = []
     for _ in range(length - 1):
-        choice = random.random()
+        choice = rng.random()
         if choice < 0.6:  # mostly assignments
-            code.append(rassign())
+            code.append(rassign(rng))
         elif choice < 0.8:  # arithmetic expression print
-            code.append(f"ausgeben{{{rand_arith(max_depth=random.randint(1, 3))}}}")
+            code.append(f"ausgeben{{{rand_arith(rng, max_depth=rng.randint(1, 3))}}}")
         else:  # comparisons / booleans if allowed
             if allow_bool:
-                code.append(f"ausgeben{{{rand_bool()}}}")
+                code.append(f"ausgeben{{{rand_bool(rng)}}}")
             elif allow_cmp:
-                code.append(f"ausgeben{{{rand_cmp()}}}")
+                code.append(f"ausgeben{{{rand_cmp(rng)}}}")
             else:
-                code.append(f"ausgeben{{{rand_arith(max_depth=random.randint(1, 3))}}}")
+                code.append(f"ausgeben{{{rand_arith(rng, max_depth=rng.randint(1, 3))}}}")
 
     # last line always a print (arith / cmp / bool)
     if allow_bool:
-        printer = rand_bool() if random.random() < 0.5 else rand_arith(max_depth=random.randint(1, 3))
+        printer = rand_bool(rng) if rng.random() < 0.5 else rand_arith(rng, max_depth=rng.randint(1, 3))
     elif allow_cmp:
-        printer = rand_cmp() if random.random() < 0.5 else rand_arith(max_depth=random.randint(1, 3))
+        printer = rand_cmp(rng) if rng.random() < 0.5 else rand_arith(rng, max_depth=rng.randint(1, 3))
     else:
-        printer = rand_arith(max_depth=random.randint(1, 3))
+        printer = rand_arith(rng, max_depth=rng.randint(1, 3))
     code.append(f"ausgeben{{{printer}}}")
     return code
 
 
-def generate_if_else(depth=2, max_code_len=3):
+def generate_if_else(rng, depth=2, max_code_len=3):
     """
     Generate a nested if/else block.
     depth: remaining nesting depth
@@ -131,45 +131,45 @@ def generate_if_else(depth=2, max_code_len=3):
     global VARIABLES
     code = []
 
-    if random.random() < 0.5:
-        code.extend(generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True))
+    if rng.random() < 0.5:
+        code.extend(generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True))
 
-    code.append(f"wenn {rand_bool()}")
+    code.append(f"wenn {rand_bool(rng)}")
     variables_holder = VARIABLES.copy()
-    num_statements = random.randint(1, max_code_len)
+    num_statements = rng.randint(1, max_code_len)
     for _ in range(num_statements):
-        choice = random.random()
+        choice = rng.random()
         if depth > 1 and choice < 0.4:
             # nested if
-            code.extend(["    " + line for line in generate_if_else(depth - 1, max_code_len)])
+            code.extend(["    " + line for line in generate_if_else(rng, depth - 1, max_code_len)])
         else:
             # normal code
             code.extend(
-                ["    " + line for line in generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True)])
+                ["    " + line for line in generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True)])
     VARIABLES = variables_holder.copy()
 
     # --- optional else ---
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         code.append("sonst")
         variables_holder = VARIABLES.copy()
-        num_statements = random.randint(1, max_code_len)
+        num_statements = rng.randint(1, max_code_len)
         for _ in range(num_statements):
-            choice = random.random()
+            choice = rng.random()
             if depth > 1 and choice < 0.5:
-                code.extend(["    " + line for line in generate_if_else(depth - 1, max_code_len)])
+                code.extend(["    " + line for line in generate_if_else(rng, depth - 1, max_code_len)])
             else:
                 code.extend(
-                    ["    " + line for line in generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True)])
+                    ["    " + line for line in generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True)])
         VARIABLES = variables_holder.copy()
     code.append("ende")
 
-    if random.random() < 0.5:
-        code.extend(generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True))
+    if rng.random() < 0.5:
+        code.extend(generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True))
 
     return code
 
 
-def generate_while_safe(depth=1, max_code_len=4):
+def generate_while_safe(rng, depth=1, max_code_len=4):
     """
     Generate a solange (while) loop that depends on a single variable,
     and modifies it inside (increment/decrement) to prevent infinite loops.
@@ -180,13 +180,13 @@ def generate_while_safe(depth=1, max_code_len=4):
     # Pick a variable (use an existing one or create new if none given)
     if len(LOOP_POOL) == len(LOOP_VARIABLES):
         return ["///hm... some random comments here"]
-    var = random.choice(LOOP_POOL)
+    var = rng.choice(LOOP_POOL)
     while var in LOOP_VARIABLES:
-        var = random.choice(LOOP_POOL)
+        var = rng.choice(LOOP_POOL)
     LOOP_VARIABLES.append(var)
-    bool_op_pool = random.choice(["<", ">", "<=", ">="])
-    value = random.randint(1, 10)
-    cmp_val = random.randint(1, 10)
+    bool_op_pool = rng.choice(["<", ">", "<=", ">="])
+    value = rng.randint(1, 10)
+    cmp_val = rng.randint(1, 10)
     if bool_op_pool == "<" or bool_op_pool == "<=":
         if value > cmp_val:
             value, cmp_val = cmp_val, value
@@ -202,15 +202,15 @@ def generate_while_safe(depth=1, max_code_len=4):
         code.append(f"    {var}--")
     # Loop body
     variables_holder = VARIABLES.copy()
-    num_statements = random.randint(1, max_code_len)
+    num_statements = rng.randint(1, max_code_len)
     for _ in range(num_statements):
-        choice = random.random()
+        choice = rng.random()
         if depth > 1 and choice < 0.4:
-            code.extend(["    " + line for line in generate_while_safe(depth - 1, max_code_len)])
+            code.extend(["    " + line for line in generate_while_safe(rng, depth - 1, max_code_len)])
         else:
             # normal code
             code.extend(
-                ["    " + line for line in generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True)])
+                ["    " + line for line in generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True)])
 
     VARIABLES = variables_holder.copy()
     LOOP_VARIABLES.remove(var)
@@ -219,135 +219,149 @@ def generate_while_safe(depth=1, max_code_len=4):
     return code
 
 
-def gen_level_1():
-    return generate_script(random.randint(1, 10), allow_cmp=False, allow_bool=False)
+def reset_variables() -> None:
+    """Forget the variables of the previous script, so that every script only depends on its own `rng`."""
+    VARIABLES.clear()
+    LOOP_VARIABLES.clear()
 
 
-def gen_level_2():
-    return generate_script(random.randint(1, 10), allow_cmp=True, allow_bool=False)
+def gen_level_1(rng):
+    reset_variables()
+    return generate_script(rng, rng.randint(1, 10), allow_cmp=False, allow_bool=False)
 
 
-def gen_level_3():
-    return generate_script(random.randint(1, 10), allow_cmp=True, allow_bool=True)
+def gen_level_2(rng):
+    reset_variables()
+    return generate_script(rng, rng.randint(1, 10), allow_cmp=True, allow_bool=False)
 
 
-def gen_level_4():
+def gen_level_3(rng):
+    reset_variables()
+    return generate_script(rng, rng.randint(1, 10), allow_cmp=True, allow_bool=True)
+
+
+def gen_level_4(rng):
     """
     Generate a code block with:
     - assignments
     - arithmetic prints
     - nested if/else blocks
     """
+    reset_variables()
     code = []
     # nested if
-    code.extend(generate_if_else(depth=random.randint(1, 2), max_code_len=random.randint(1, 2)))
+    code.extend(generate_if_else(rng, depth=rng.randint(1, 2), max_code_len=rng.randint(1, 2)))
 
     # always end with a print
-    code.append(f"ausgeben{{{rand_arith(max_depth=random.randint(1, 3))}}}")
+    code.append(f"ausgeben{{{rand_arith(rng, max_depth=rng.randint(1, 3))}}}")
     return code
 
 
-def gen_level_5():
+def gen_level_5(rng):
     """
     Generate code with safe solange loops.
     Condition depends on one variable, and loop body ensures variable changes.
     """
-    code = generate_while_safe(depth=random.randint(1, 2), max_code_len=random.randint(1, 6))
+    reset_variables()
+    code = generate_while_safe(rng, depth=rng.randint(1, 2), max_code_len=rng.randint(1, 6))
     return code
 
-def gen_level_6():
+def gen_level_6(rng):
     """
     Generate code with mixed:
     - if/else blocks
     - safe solange loops
     Allows nesting of both types.
     """
+    reset_variables()
     code = []
-    num_blocks = random.randint(2, 6)  # total number of top-level statements/blocks
+    num_blocks = rng.randint(2, 6)  # total number of top-level statements/blocks
 
     for _ in range(num_blocks):
-        choice = random.random()
+        choice = rng.random()
         if choice < 0.4:
             # Generate an if/else block
-            code.extend(generate_if_else(depth=random.randint(1, 2), max_code_len=random.randint(1, 3)))
+            code.extend(generate_if_else(rng, depth=rng.randint(1, 2), max_code_len=rng.randint(1, 3)))
         elif choice < 0.8:
             # Generate a safe solange loop
-            code.extend(generate_while_safe(depth=random.randint(1, 2), max_code_len=random.randint(1, 4)))
+            code.extend(generate_while_safe(rng, depth=rng.randint(1, 2), max_code_len=rng.randint(1, 4)))
         else:
             # Generate normal script statements
-            code.extend(generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True))
+            code.extend(generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True))
 
     return code
 
-def gen_level_7(depth=2, max_code_len=3):
+def gen_level_7(rng, depth=2, max_code_len=3):
     """
     Generate mixed code with nested if/else and safe solange loops.
     depth: max nesting depth
     max_code_len: number of statements in each block
     """
+    reset_variables()
     code = []
-    num_blocks = random.randint(1, max_code_len)
+    num_blocks = rng.randint(1, max_code_len)
 
     for _ in range(num_blocks):
-        choice = random.random()
+        choice = rng.random()
         if depth > 0:
             if choice < 0.35:
-                inner_code = generate_if_else(depth=random.randint(1, depth), max_code_len=max_code_len)
-                if random.random() < 0.5:
+                inner_code = generate_if_else(rng, depth=rng.randint(1, depth), max_code_len=max_code_len)
+                if rng.random() < 0.5:
                     for i in range(len(inner_code)):
                         if "ende" in inner_code[i]:
-                            inner_code[i:i] = ["    " + line for line in generate_while_safe(depth=random.randint(1, depth), max_code_len=max_code_len)]
+                            inner_code[i:i] = ["    " + line for line in generate_while_safe(rng, depth=rng.randint(1, depth), max_code_len=max_code_len)]
                             break
                 code.extend(inner_code)
             elif choice < 0.7:
-                inner_code = generate_while_safe(depth=random.randint(1, depth), max_code_len=max_code_len)
+                inner_code = generate_while_safe(rng, depth=rng.randint(1, depth), max_code_len=max_code_len)
                 for i in range(len(inner_code)):
                     if inner_code[i].startswith("    "):
-                        if random.random() < 0.5:
-                            inner_code[i:i] = ["    " + line for line in generate_if_else(depth=random.randint(1, depth-1), max_code_len=max_code_len)]
+                        if rng.random() < 0.5:
+                            inner_code[i:i] = ["    " + line for line in generate_if_else(rng, depth=rng.randint(1, depth-1), max_code_len=max_code_len)]
                             break
                 code.extend(inner_code)
             else:
                 # Normal statements
-                code.extend(generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True))
+                code.extend(generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True))
         else:
             # Depth limit reached, only normal statements
-            code.extend(generate_script(random.randint(1, 3), allow_cmp=True, allow_bool=True))
+            code.extend(generate_script(rng, rng.randint(1, 3), allow_cmp=True, allow_bool=True))
 
     return code
 
-def gen_level_8():
-    code = gen_level_7()
+def gen_level_8(rng):
+    code = gen_level_7(rng)
     new_code = []
     for line in code:
         # Randomly insert empty lines
-        if random.random() < 0.2:
+        if rng.random() < 0.2:
             new_code.append("")
 
 
-        if random.random() < 0.2:
-            comment = f"/// {''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=random.randint(5, 15)))}"
+        if rng.random() < 0.2:
+            comment = f"/// {''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=rng.randint(5, 15)))}"
             new_code.append(comment)
 
         # Randomly add leading/trailing spaces
-        spaces_before = " " * random.randint(0, 4)
-        spaces_after = " " * random.randint(0, 4)
+        spaces_before = " " * rng.randint(0, 4)
+        spaces_after = " " * rng.randint(0, 4)
         formatted_line = f"{spaces_before}{line}{spaces_after}"
-        if random.random() < 0.2:
-            comment = f"/// {''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=random.randint(5, 15)))}"
+        if rng.random() < 0.2:
+            comment = f"/// {''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=rng.randint(5, 15)))}"
             formatted_line += comment
 
         new_code.append(formatted_line)
 
         # Randomly add comment lines
-        if random.random() < 0.15:
-            comment = f"/// {''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=random.randint(5,15)))}"
+        if rng.random() < 0.15:
+            comment = f"/// {''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=rng.randint(5,15)))}"
             new_code.append(comment)
 
     # Possibly add some empty lines at the end
-    for _ in range(random.randint(0, 2)):
+    for _ in range(rng.randint(0, 2)):
         new_code.append("")
 
     return new_code
 
-print('\n'.join(gen_level_8()))
+if __name__ == "__main__":
+    print('\n'.join(gen_level_8(random.Random())))
@@ -3,8 +3,9 @@ import os
 from fastapi import FastAPI, Depends, Security
 from mangum import Mangum
 from tasks.auth import validate_api_key
+from tasks.profiling import ProfilingMiddleware, router as profiling_router, stack_sampler
 
-generators = ['right_time', 'a_plus_b']
+generators = ['right_time', 'a_plus_b', 'flags']
 
 app = FastAPI(title="Teamwork Challenge Task Generators", dependencies=[Depends(validate_api_key)])
 
@@ -16,6 +17,11 @@ def register_generators() -> None:
 
 register_generators()
 
+# On-demand profiling of single requests, and the optional background stack sampler
+app.add_middleware(ProfilingMiddleware)
+app.include_router(profiling_router, tags=["profiling"])
+stack_sampler.start()
+
 # AWS Lambda handler
 handler = Mangum(app)
 
@@ -0,0 +1,147 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse, Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tasks.auth import validate_api_key
+
+# Number of latest request profiles kept in memory
+PROFILES_KEPT = int(os.getenv("CHALLENGE_PROFILES_KEPT", "20"))
+# Interval of the background stack sampler, 0 disables it
+SAMPLE_INTERVAL_MS = float(os.getenv("CHALLENGE_PROFILE_SAMPLE_INTERVAL_MS", "0"))
+
+_profiles: "OrderedDict[str, pstats.Stats]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+class ProfilingMiddleware:
+    """Profiles a single request sent with a valid API key and an `X-Profile: 1` header or a `profile=1` query
+    parameter. Generator endpoints are async and run in the event loop thread, so the profile covers the whole
+    request. The profile is stored in memory and its ID is returned in the `X-Profile-Id` header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not await self._profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profiler.disable()
+                with _profiles_lock:
+                    _profiles[profile_id] = pstats.Stats(profiler)
+                    while len(_profiles) > PROFILES_KEPT:
+                        _profiles.popitem(last=False)
+                message.setdefault("headers", []).append((b"x-profile-id", profile_id.encode()))
+            await send(message)
+
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profiler.disable()
+
+    @staticmethod
+    async def _profile_requested(scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        query = parse_qs(scope.get("query_string", b"").decode())
+        if headers.get("x-profile") != "1" and query.get("profile") != ["1"]:
+            return False
+        try:
+            await validate_api_key(headers.get("x-api-key", ""))
+        except HTTPException:
+            return False
+        return True
+
+
+class StackSampler:
+    """Low-overhead statistical profiler: a daemon thread records the stacks of all other threads every
+    `interval_ms` and aggregates them as folded stacks, the input format of flamegraph.pl and speedscope."""
+
+    def __init__(self, interval_ms: float = SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self._stacks: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            samples = [_fold(frame) for thread_id, frame in sys._current_frames().items() if thread_id != own_id]
+            with self._lock:
+                self._stacks.update(samples)
+
+    def folded(self, reset: bool = False) -> str:
+        with self._lock:
+            stacks = self._stacks.most_common()
+            if reset:
+                self._stacks.clear()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+def _fold(frame: Any) -> str:
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+stack_sampler = StackSampler()
+
+router = APIRouter()
+
+
+@router.get("/profiles/stacks", response_class=PlainTextResponse)
+async def get_sampled_stacks(reset: bool = False) -> str:
+    """Folded stacks from the background sampler, ready for flamegraph.pl or speedscope."""
+    if not stack_sampler.running:
+        raise HTTPException(status_code=400, detail="Stack sampler is off, set CHALLENGE_PROFILE_SAMPLE_INTERVAL_MS")
+    return stack_sampler.folded(reset)
+
+
+@router.get("/profiles/{profile_id}", response_model=None)
+async def get_profile(profile_id: str, format: str = "text") -> Response:
+    """cProfile report of a request sent with `X-Profile: 1`, as text or as a `.pstats` file."""
+    with _profiles_lock:
+        stats = _profiles.get(profile_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "pstats":
+        return Response(
+            marshal.dumps(stats.stats),  # type: ignore[attr-defined]
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    stream = io.StringIO()
+    stats.stream = stream  # type: ignore[attr-defined]
+    stats.sort_stats("cumulative").print_stats(50)
+    return PlainTextResponse(stream.getvalue())
@@ -2,7 +2,7 @@ import logging
 import random
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Tuple, cast
+from typing import Dict, Optional, Tuple, cast
 from zoneinfo import ZoneInfo
 
 from dateutil import parser  # type: ignore[import-untyped]
@@ -10,6 +10,9 @@ from dateutil.relativedelta import relativedelta  # type: ignore[import-untyped]
 from fastapi import APIRouter
 
 from api_models import GenRequest, GenResponse, CheckRequest, CheckResult, CheckStatus
+from tasks.batch import add_batch_routes
+from tasks.seeding import ensure_rng, task_rng
+from tasks.settings import get_difficulty
 
 router = APIRouter()
 
@@ -71,33 +74,6 @@ def get_timezone(timezone_name: str) -> ZoneInfo:
     return ZoneInfo(TIMEZONES[timezone_name])
 
 
-def get_difficulty_level(request: GenRequest) -> int:
-    """Determine the difficulty level based on task settings and progress"""
-    task_settings = request.task_settings
-    progress = request.progress
-
-    # Default to level 1
-    level = 1
-
-    # Parse task settings if available
-    if task_settings:
-        settings = {}
-        for setting in task_settings.split(','):
-            if ':' in setting:
-                key, value = setting.split(':', 1)
-                settings[key.strip()] = int(value.strip())
-
-        # Check if we should increase difficulty based on task index
-        task_index = progress.task_index
-        for complication, threshold in sorted(settings.items()):
-            if complication.startswith('complication') and task_index >= threshold:
-                level_num = int(complication.replace('complication', ''))
-                level = max(level, level_num)
-
-    # Cap at maximum level 8
-    return min(level, 8)
-
-
 def generate_level_1() -> Tuple[datetime, str]:
     """Generate time for level 1: Time is always 1 minute in the future"""
     now = get_current_time()
@@ -106,45 +82,49 @@ def generate_level_1() -> Tuple[datetime, str]:
     return future_time, time_str
 
 
-def generate_level_2() -> Tuple[datetime, str]:
+def generate_level_2(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 2: Time is in the range of 1-20 minutes in the future"""
+    rng = ensure_rng(rng)
     now = get_current_time()
-    minutes = random.randint(1, 20)
+    minutes = rng.randint(1, 20)
     future_time = add_time_delta(now, minutes=minutes)
     time_str = format_iso_time(future_time)
     return future_time, time_str
 
 
-def generate_level_3() -> Tuple[datetime, str]:
+def generate_level_3(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 3: Time with specified timezone"""
+    rng = ensure_rng(rng)
     now = get_current_time()
-    minutes = random.randint(1, 20)
-    timezone_name = random.choice(["CEST", "CET", "MSK", "UTC"])
+    minutes = rng.randint(1, 20)
+    timezone_name = rng.choice(["CEST", "CET", "MSK", "UTC"])
     timezone = get_timezone(timezone_name)
     future_time = now.astimezone(timezone) + timedelta(minutes=minutes)
     time_str = f"{future_time.strftime('%Y-%m-%dT%H:%M:%S')} {timezone_name}"
     return future_time, time_str
 
 
-def generate_level_4() -> Tuple[datetime, str]:
+def generate_level_4(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 4: Time with strange timezones"""
+    rng = ensure_rng(rng)
     now = get_current_time()
-    minutes = random.randint(1, 120)  # 1 minute to 2 hours
+    minutes = rng.randint(1, 120)  # 1 minute to 2 hours
     strange_timezones = ["NST", "IRST", "AFT", "IST", "NPT", "MMT", "ACWST", "ACST", "LHST", "CHAST"]
-    timezone_name = random.choice(strange_timezones)
+    timezone_name = rng.choice(strange_timezones)
     timezone = get_timezone(timezone_name)
     future_time = now.astimezone(timezone) + timedelta(minutes=minutes)
     time_str = f"{future_time.strftime('%Y-%m-%dT%H:%M:%S')} {timezone_name}"
     return future_time, time_str
 
 
-def generate_level_5() -> Tuple[datetime, str]:
+def generate_level_5(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 5: Different time formats"""
+    rng = ensure_rng(rng)
     now = get_current_time()
-    minutes = random.randint(1, 120)
+    minutes = rng.randint(1, 120)
     future_time = add_time_delta(now, minutes=minutes)
 
-    format_type = random.randint(1, 4)
+    format_type = rng.randint(1, 4)
     if format_type == 1:
         # ISO 8601
         time_str = format_iso_time(future_time)
@@ -161,15 +141,16 @@ def generate_level_5() -> Tuple[datetime, str]:
     return future_time, time_str
 
 
-def generate_level_6() -> Tuple[datetime, str]:
+def generate_level_6(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 6: Summation of time and duration"""
+    rng = ensure_rng(rng)
     now = get_current_time()
-    minutes = random.randint(1, 60)
-    seconds = random.randint(0, 59)
+    minutes = rng.randint(1, 60)
+    seconds = rng.randint(0, 59)
     base_time = add_time_delta(now, minutes=minutes - 1)  # Subtract 1 minute to add it in the expression
     future_time = add_time_delta(base_time, minutes=1, seconds=seconds)
 
-    format_type = random.randint(1, 3)
+    format_type = rng.randint(1, 3)
     if format_type == 1:
         # ISO 8601
         time_str = f"{base_time.strftime('%Y-%m-%dT%H:%M:%S%z')[:-2]}:{base_time.strftime('%z')[-2:]} + PT{60+seconds}S"
@@ -183,10 +164,11 @@ def generate_level_6() -> Tuple[datetime, str]:
     return future_time, time_str
 
 
-def generate_level_7() -> Tuple[datetime, str]:
+def generate_level_7(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 7: Complex expression with summation and subtraction"""
+    rng = ensure_rng(rng)
     now = get_current_time()
-    minutes = random.randint(2, 60)
+    minutes = rng.randint(2, 60)
     base_time = add_time_delta(now, minutes=minutes - 1)
     future_time = add_time_delta(base_time, minutes=1, seconds=5)
     future_time = add_time_delta(future_time, seconds=-5)  # Subtract 5 seconds
@@ -196,22 +178,23 @@ def generate_level_7() -> Tuple[datetime, str]:
     return future_time, time_str
 
 
-def generate_level_8() -> Tuple[datetime, str]:
+def generate_level_8(rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate time for level 8: Natural language"""
+    rng = ensure_rng(rng)
     now = get_current_time()
 
     # Choose a pattern type (1-6)
-    pattern_type = random.randint(1, 6)
+    pattern_type = rng.randint(1, 6)
 
     if pattern_type == 1:
         # "{minutes} minutes from now"
-        minutes = random.randint(1, 60)
+        minutes = rng.randint(1, 60)
         future_time = add_time_delta(now, minutes=minutes)
         time_str = f"{minutes} minutes from now"
     elif pattern_type == 2:
         # "{hours} hours and {minutes} minutes from now"
-        hours = random.randint(0, 1)
-        minutes = random.randint(1, 59)
+        hours = rng.randint(0, 1)
+        minutes = rng.randint(1, 59)
         future_time = add_time_delta(now, hours=hours, minutes=minutes)
         time_str = f"{hours} hours and {minutes} minutes from now"
     elif pattern_type == 3:
@@ -251,25 +234,25 @@ def generate_level_8() -> Tuple[datetime, str]:
     return future_time, time_str
 
 
-def generate_time_for_level(level: int) -> Tuple[datetime, str]:
+def generate_time_for_level(level: int, rng: Optional[random.Random] = None) -> Tuple[datetime, str]:
     """Generate a time in the future based on the difficulty level"""
     # Call the appropriate level-specific function based on the level
     if level == 1:
         return generate_level_1()
     elif level == 2:
-        return generate_level_2()
+        return generate_level_2(rng)
     elif level == 3:
-        return generate_level_3()
+        return generate_level_3(rng)
     elif level == 4:
-        return generate_level_4()
+        return generate_level_4(rng)
     elif level == 5:
-        return generate_level_5()
+        return generate_level_5(rng)
     elif level == 6:
-        return generate_level_6()
+        return generate_level_6(rng)
     elif level == 7:
-        return generate_level_7()
+        return generate_level_7(rng)
     else:  # level == 8 or any other value
-        return generate_level_8()
+        return generate_level_8(rng)
 
 
 def parse_time_expression(time_expr: str) -> datetime:
@@ -468,11 +451,14 @@ async def get_statements() -> Dict[str, str]:
 
 @router.post("/gen", response_model=GenResponse)
 async def generate_task(request: GenRequest) -> GenResponse:
+    # Offsets and formats follow from the request, the time itself is always relative to now
+    rng = task_rng(request)
+
     # Determine the difficulty level
-    level = get_difficulty_level(request)
+    level = get_difficulty(request, rng)
 
     # Generate a time based on the difficulty level
-    future_time, time_str = generate_time_for_level(level)
+    future_time, time_str = generate_time_for_level(level, rng)
 
     # Create the input string (the time expression)
     input_data = time_str
@@ -507,3 +493,6 @@ async def check_answer(request: CheckRequest) -> list[CheckResult]:
                 error=f"Expected submission at {target_time.isoformat()}, but received at {now.isoformat()}. Time difference: {time_diff:.2f} seconds."
             )
         ]
+
+
+add_batch_routes(router, generate_task, check_answer)
@@ -2,7 +2,9 @@ import unittest
 from datetime import datetime, timedelta
 import pytz  # type: ignore[import-untyped]
 import re
-from tasks.right_time.router import generate_time_for_level
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tasks.right_time.router import generate_time_for_level, router
 
 class TestGenerateTimeForLevel(unittest.TestCase):
     """Test cases for the generate_time_for_level function."""
@@ -168,5 +170,47 @@ class TestGenerateTimeForLevel(unittest.TestCase):
         ]
         self.assertTrue(any(pattern in time_str for pattern in natural_language_patterns))
 
+
+class TestBatchEndpoints(unittest.TestCase):
+    """Test cases for the /capabilities, /gen/batch and /check/batch endpoints."""
+
+    def setUp(self) -> None:
+        app = FastAPI()
+        app.include_router(router, prefix="/right_time")
+        self.client = TestClient(app)
+
+    def test_capabilities(self) -> None:
+        response = self.client.get("/right_time/capabilities")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["batch"])
+
+    def test_gen_and_check_batch(self) -> None:
+        progress = {"task_index": 0, "task_count": 10, "elapsed_time": 0, "total_time": 60}
+        gen_requests = [
+            {"challenge": "1", "team": "t", "round": "1", "task_id": str(i), "progress": progress}
+            for i in range(3)
+        ]
+        response = self.client.post("/right_time/gen/batch", json=gen_requests)
+        self.assertEqual(response.status_code, 200)
+        tasks = response.json()
+        self.assertEqual(len(tasks), 3)
+        self.assertTrue(all(task["statement_version"] == "v1" for task in tasks))
+
+        check_requests = [
+            {"input": task["input"], "checker_hint": task["checker_hint"], "answer": ""}
+            for task in tasks
+        ]
+        response = self.client.post("/right_time/check/batch", json=check_requests)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual(len(results), 3)
+        # Answers are sent a minute too early, so each one is rejected
+        self.assertTrue(all(r[0]["status"] == "wa" for r in results))
+
+    def test_batch_too_large(self) -> None:
+        response = self.client.post("/right_time/check/batch", json=[{"input": "", "answer": ""}] * 101)
+        self.assertEqual(response.status_code, 413)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""Deterministic randomness for task generators.
+
+A generator takes every random choice from the `random.Random` returned by `task_rng`, so the same `GenRequest`
+always yields the same task: tasks can be served from a cache or a pool, generated again on demand instead of
+storing their payloads, and benchmarked reproducibly.
+"""
+import hashlib
+import json
+import random
+from typing import Optional
+
+from api_models import GenRequest
+
+# Used by generator functions called without a generator, e.g. from tests
+_unseeded = random.Random()
+
+
+def task_seed(challenge: str, round: str, team: str, task_id: Optional[str], task_settings: str) -> int:
+    key = json.dumps([challenge, round, team, task_id, task_settings])
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+
+def task_rng(request: GenRequest) -> random.Random:
+    """Random generator seeded from what identifies the task: challenge, round, team, task ID and settings."""
+    return random.Random(task_seed(request.challenge, request.round, request.team, request.task_id,
+                                   request.task_settings))
+
+
+def ensure_rng(rng: Optional[random.Random]) -> random.Random:
+    return rng if rng is not None else _unseeded
@@ -0,0 +1,88 @@
+"""Task settings shared by the generators: which difficulty level to generate a task at.
+
+`task_settings` is a comma-separated list of entries:
+
+- `complicationN:T` - level N from the task with index T on, the highest level reached wins
+  (`complication2:10,complication3:20`).
+- `A-B` or `N` - draw the level uniformly from A..B, or add level N to the draw (`1-7`, `1-3,8`).
+- `A-B*W` or `N*W` - the same with weight W per level instead of 1 (`1-7,8*3` draws level 8 three times as often).
+
+A settings string with levels to draw from ignores `complication` thresholds. Other entries are left to the generator.
+Every distinct string is parsed once, after that a level is a binary search in the compiled table.
+"""
+import bisect
+import itertools
+import random
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from api_models import GenRequest
+from tasks.seeding import ensure_rng
+
+MIN_LEVEL = 1
+MAX_LEVEL = 8
+
+_COMPLICATION = re.compile(r"complication(\d+)")
+_LEVELS = re.compile(r"(\d+)(?:-(\d+))?(?:\*(\d+(?:\.\d+)?))?")
+
+
+@dataclass(frozen=True)
+class DifficultyTable:
+    # Sorted task indexes at which the level goes up, and the level from each of them on
+    thresholds: Tuple[int, ...] = ()
+    threshold_levels: Tuple[int, ...] = ()
+    # Levels to draw from and their cumulative weights
+    levels: Tuple[int, ...] = ()
+    cumulative_weights: Tuple[float, ...] = ()
+
+    def level(self, task_index: int, rng: Optional[random.Random] = None) -> int:
+        if self.levels:
+            point = ensure_rng(rng).random() * self.cumulative_weights[-1]
+            return self.levels[bisect.bisect_right(self.cumulative_weights, point)]
+        position = bisect.bisect_right(self.thresholds, task_index)
+        return self.threshold_levels[position - 1] if position else MIN_LEVEL
+
+
+@lru_cache(maxsize=256)
+def parse_task_settings(task_settings: str, max_level: int = MAX_LEVEL) -> DifficultyTable:
+    """Compile a settings string, levels are capped at `max_level`. Raises ValueError on malformed entries."""
+    complications: dict[int, int] = {}
+    weights: dict[int, float] = {}
+    for entry in (entry.strip() for entry in task_settings.split(",")):
+        if not entry:
+            continue
+        key, _, value = entry.partition(":")
+        complication = _COMPLICATION.fullmatch(key.strip())
+        if complication:
+            threshold = int(value.strip())
+            level = min(int(complication.group(1)), max_level)
+            complications[threshold] = max(level, complications.get(threshold, MIN_LEVEL))
+            continue
+        level_range = _LEVELS.fullmatch(entry)
+        if level_range:
+            low = int(level_range.group(1))
+            high = int(level_range.group(2) or low)
+            weight = float(level_range.group(3) or 1)
+            if low > high or low < MIN_LEVEL or weight <= 0:
+                raise ValueError(f"Invalid level range in task settings: '{entry}'")
+            for level in range(low, min(high, max_level) + 1):
+                weights[level] = weights.get(level, 0.0) + weight
+        # Anything else is a setting of the generator itself
+
+    thresholds = sorted(complications)
+    # A later threshold never lowers the level reached by an earlier one
+    threshold_levels = itertools.accumulate((max(MIN_LEVEL, complications[t]) for t in thresholds), max)
+    levels = sorted(weights)
+    return DifficultyTable(
+        thresholds=tuple(thresholds),
+        threshold_levels=tuple(threshold_levels),
+        levels=tuple(levels),
+        cumulative_weights=tuple(itertools.accumulate(weights[level] for level in levels)),
+    )
+
+
+def get_difficulty(request: GenRequest, rng: Optional[random.Random] = None, max_level: int = MAX_LEVEL) -> int:
+    """Difficulty level of the task, from the task settings and the index of the task."""
+    return parse_task_settings(request.task_settings, max_level).level(request.progress.task_index, rng)
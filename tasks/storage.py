@@ -0,0 +1,188 @@
+"""Key-value storage for generators that keep state between /gen and /check, like collaborative tasks.
+
+Generators run as stateless Lambdas, so state lives in a backend chosen by `CHALLENGE_GENERATOR_STORE`:
+
+- `memory` (default) - a dict in the process, for tests and local runs; every Lambda container has its own.
+- `sqlite:///path/to/file.db` - a local file shared by the processes of one machine.
+- `dynamodb://table` - a DynamoDB table with a string partition key `key`, shared by all Lambda containers.
+  `CHALLENGE_DYNAMODB_ENDPOINT` points it to DynamoDB Local instead of AWS.
+
+Items are JSON objects stored under a string key within a namespace (one per generator). A lookup is always
+by key, the primary key of every backend, so it stays a single indexed read however many items are stored.
+"""
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
+
+import boto3
+
+Item = Dict[str, Any]
+
+DYNAMODB_ENDPOINT = os.getenv("CHALLENGE_DYNAMODB_ENDPOINT") or None
+DYNAMODB_REGION = os.getenv("AWS_REGION", "eu-north-1")
+# Rows per SQLite transaction in put_many
+SQLITE_BATCH_SIZE = 500
+
+
+class KeyValueStore(ABC):
+    """Items of one namespace. Implementations are safe to share between threads."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Item]:
+        pass
+
+    def put(self, key: str, item: Item) -> None:
+        self.put_many({key: item})
+
+    @abstractmethod
+    def put_many(self, items: Mapping[str, Item]) -> None:
+        """Write several items in as few round trips as the backend allows."""
+
+    @abstractmethod
+    def compare_and_set(self, key: str, field: str, expected: Any, value: Any) -> bool:
+        """Atomically set `field` of an existing item to `value` if it is `expected` now.
+        Returns False if the item is missing or the field has another value."""
+
+
+class MemoryStore(KeyValueStore):
+
+    def __init__(self, namespace: str):
+        super().__init__(namespace)
+        self._items: Dict[str, Item] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Item]:
+        with self._lock:
+            item = self._items.get(key)
+            return dict(item) if item is not None else None
+
+    def put_many(self, items: Mapping[str, Item]) -> None:
+        with self._lock:
+            self._items.update((key, dict(item)) for key, item in items.items())
+
+    def compare_and_set(self, key: str, field: str, expected: Any, value: Any) -> bool:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item.get(field) != expected:
+                return False
+            item[field] = value
+            return True
+
+
+class SQLiteStore(KeyValueStore):
+
+    def __init__(self, namespace: str, path: str):
+        super().__init__(namespace)
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS items (namespace TEXT NOT NULL, key TEXT NOT NULL, item TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, key: str) -> Optional[Item]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT item FROM items WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put_many(self, items: Mapping[str, Item]) -> None:
+        rows = [(self.namespace, key, json.dumps(item)) for key, item in items.items()]
+        with self._lock:
+            for start in range(0, len(rows), SQLITE_BATCH_SIZE):
+                self._connection.execute("BEGIN")
+                try:
+                    self._connection.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?)",
+                                                 rows[start:start + SQLITE_BATCH_SIZE])
+                except sqlite3.Error:
+                    self._connection.execute("ROLLBACK")
+                    raise
+                self._connection.execute("COMMIT")
+
+    def compare_and_set(self, key: str, field: str, expected: Any, value: Any) -> bool:
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so other processes can't change the item in between
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT item FROM items WHERE namespace = ? AND key = ?", (self.namespace, key)
+                ).fetchone()
+                item = json.loads(row[0]) if row is not None else None
+                if item is None or item.get(field) != expected:
+                    self._connection.execute("ROLLBACK")
+                    return False
+                item[field] = value
+                self._connection.execute("UPDATE items SET item = ? WHERE namespace = ? AND key = ?",
+                                         (json.dumps(item), self.namespace, key))
+            except sqlite3.Error:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            return True
+
+
+class DynamoDBStore(KeyValueStore):
+    """Items of all namespaces share one table, the partition key is "{namespace}#{key}"."""
+
+    def __init__(self, namespace: str, table_name: str, endpoint_url: Optional[str] = DYNAMODB_ENDPOINT):
+        super().__init__(namespace)
+        resource = boto3.resource("dynamodb", region_name=DYNAMODB_REGION, endpoint_url=endpoint_url)
+        self._table = resource.Table(table_name)
+
+    def _key(self, key: str) -> Dict[str, str]:
+        return {"key": f"{self.namespace}#{key}"}
+
+    def get(self, key: str) -> Optional[Item]:
+        response = self._table.get_item(Key=self._key(key), ConsistentRead=True)
+        if "Item" not in response:
+            return None
+        item: Item = json.loads(str(response["Item"]["item"]))
+        return item
+
+    def put_many(self, items: Mapping[str, Item]) -> None:
+        # The batch writer groups puts into BatchWriteItem calls of 25 and retries unprocessed ones
+        with self._table.batch_writer() as batch:
+            for key, item in items.items():
+                batch.put_item(Item={**self._key(key), "item": json.dumps(item)})
+
+    def compare_and_set(self, key: str, field: str, expected: Any, value: Any) -> bool:
+        # Items are stored as one JSON attribute, so the condition is on the whole previous item
+        item = self.get(key)
+        if item is None or item.get(field) != expected:
+            return False
+        previous = json.dumps(item)
+        item[field] = value
+        try:
+            self._table.put_item(
+                Item={**self._key(key), "item": json.dumps(item)},
+                ConditionExpression="#item = :previous",
+                ExpressionAttributeNames={"#item": "item"},
+                ExpressionAttributeValues={":previous": previous},
+            )
+        except self._table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+        return True
+
+
+def get_store(namespace: str) -> KeyValueStore:
+    """Store of a namespace in the backend of CHALLENGE_GENERATOR_STORE, one instance per process and backend."""
+    return open_store(namespace, os.getenv("CHALLENGE_GENERATOR_STORE", "memory"))
+
+
+@lru_cache(maxsize=None)
+def open_store(namespace: str, url: str) -> KeyValueStore:
+    if url == "memory":
+        return MemoryStore(namespace)
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(namespace, url.removeprefix("sqlite:///"))
+    if url.startswith("dynamodb://"):
+        return DynamoDBStore(namespace, url.removeprefix("dynamodb://"))
+    raise ValueError(f"Unknown generator store '{url}', expected memory, sqlite:///path or dynamodb://table")
@@ -0,0 +1,60 @@
+import random
+import unittest
+from collections import Counter
+
+from api_models import GenRequest, TaskProgress
+from tasks.settings import get_difficulty, parse_task_settings
+
+
+def request(task_settings: str, task_index: int) -> GenRequest:
+    return GenRequest(challenge="1", team="2", round="3", task_id=str(task_index), task_settings=task_settings,
+                      progress=TaskProgress(task_index=task_index, task_count=100, elapsed_time=0, total_time=600))
+
+
+class TestTaskSettings(unittest.TestCase):
+
+    def test_complication_thresholds(self) -> None:
+        settings = "complication1:20,complication3:60,complication2:50"
+        for task_index, level in [(0, 1), (19, 1), (20, 1), (49, 1), (50, 2), (59, 2), (60, 3), (1000, 3)]:
+            with self.subTest(task_index=task_index):
+                self.assertEqual(get_difficulty(request(settings, task_index)), level)
+
+    def test_lower_complication_later_keeps_level(self) -> None:
+        table = parse_task_settings("complication5:10,complication2:30")
+        self.assertEqual(table.level(40), 5)
+
+    def test_levels_capped(self) -> None:
+        self.assertEqual(get_difficulty(request("complication12:0", 0)), 8)
+        self.assertEqual(get_difficulty(request("complication12:0", 0), max_level=4), 4)
+        self.assertEqual(get_difficulty(request("", 50)), 1)
+
+    def test_range(self) -> None:
+        rng = random.Random(1)
+        levels = Counter(parse_task_settings("1-7").level(0, rng) for _ in range(7000))
+        self.assertEqual(set(levels), set(range(1, 8)))
+        self.assertTrue(all(800 < count < 1200 for count in levels.values()))
+
+    def test_weights(self) -> None:
+        rng = random.Random(1)
+        levels = Counter(parse_task_settings("1-2,8*2").level(0, rng) for _ in range(4000))
+        self.assertEqual(set(levels), {1, 2, 8})
+        self.assertAlmostEqual(levels[8] / 4000, 0.5, delta=0.05)
+
+    def test_parsed_once(self) -> None:
+        parse_task_settings.cache_clear()
+        for task_index in range(10):
+            get_difficulty(request("complication2:5", task_index))
+        self.assertEqual(parse_task_settings.cache_info().misses, 1)
+
+    def test_invalid(self) -> None:
+        for settings in ["complication2:soon", "3-1", "0-2", "2*0"]:
+            with self.subTest(settings=settings):
+                with self.assertRaises(ValueError):
+                    parse_task_settings(settings)
+
+    def test_generator_settings_ignored(self) -> None:
+        self.assertEqual(get_difficulty(request("size:big,complication2:0", 0)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()